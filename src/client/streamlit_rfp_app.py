@@ -1,8 +1,50 @@
 import streamlit as st
 import requests
+import json
 
 API_URL = "http://localhost:8000"  # Update if deploying remotely
 
+
+def iter_sse_events(url):
+    """
+    Yields the JSON payload of each Server-Sent Event from `url` (blocking, one long request).
+    """
+    with requests.get(url, stream=True, timeout=(10, None)) as response:
+        data_lines = []
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("data:"):
+                data_lines.append(line[len("data:"):].strip())
+            elif not line and data_lines:  # blank line ends an event
+                yield json.loads("\n".join(data_lines))
+                data_lines = []
+
+
+def render_job_events(job_id):
+    """
+    Renders live progress for a job: overall progress bar, current phase, ETA/tokens and a
+    criterion score table that fills in as scores arrive.
+    """
+    progress_bar = st.progress(0.0, text="Queued")
+    status_line = st.empty()
+    scores_table = st.empty()
+    scores = {}  # (vendor, criterion) -> score
+
+    for event in iter_sse_events(f"{API_URL}/jobs/{job_id}/events"):
+        kind = event["type"]
+        if kind == "progress" and event.get("scope") == "run":
+            eta = f" – ETA {event['eta_seconds']:.0f}s" if event.get("eta_seconds") is not None else ""
+            progress_bar.progress(event["completed"] / event["total"], text=f"{event['message']}{eta}")
+        elif kind == "phase_start" and event.get("phase") in ("vendor", "criterion", "summary"):
+            where = " / ".join(str(event[k]) for k in ("vendor", "criterion") if event.get(k))
+            status_line.caption(f"▶️ {event['phase'].title()}: {where or 'final summary'} · {event['tokens_used']} tokens used")
+        elif kind == "criterion_scored":
+            scores[(event.get("vendor", ""), event["criterion"])] = event["score"]
+            rows = "\n".join(f"| {vendor} | {criterion} | {score} |" for (vendor, criterion), score in sorted(scores.items()))
+            scores_table.markdown(f"| Vendor | Criterion | Score |\n|---|---|---|\n{rows}")
+        elif kind == "job_status" and event["status"] in ("succeeded", "failed"):
+            progress_bar.progress(1.0, text="Done" if event["status"] == "succeeded" else "Failed")
+            break
+
 st.set_page_config(page_title="RFP Evaluator", layout="centered")
 st.title("📄 AI-Powered RFP Evaluator")
 
@@ -23,6 +65,12 @@ if st.button("🚀 Run Evaluation"):
 
             response = requests.post(f"{API_URL}/evaluate", files=files)
 
+            # The API queues the evaluation as a background job; follow its event stream until it finishes
+            if response.status_code == 202:
+                job_id = response.json()["job_id"]
+                render_job_events(job_id)
+                response = requests.get(f"{API_URL}/jobs/{job_id}/result")
+
             if response.status_code == 200:
                 st.success("Evaluation complete! ✅")
                 result = response.json()
@@ -0,0 +1,128 @@
+# embedding_backends.py – Pluggable embedding backends (OpenAI API or local sentence-transformers)
+
+import os
+import numpy as np
+from src.utils.logging_utils import log_phase
+from src.utils.lazy_resources import register_resource
+
+# Backend used for thought dedup and tool routing: "openai" (default) or "local"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+
+
+def _sentence_transformer_resource(model_name):
+    def load():
+        from sentence_transformers import SentenceTransformer  # pulls in torch, so only on first use
+        return SentenceTransformer(model_name, device="cpu")
+    return register_resource(f"sentence_transformer:{model_name}", load, "sentence-transformers model (torch, CPU)")
+
+
+_sentence_transformer_resource(LOCAL_EMBEDDING_MODEL)  # registered up front so it can be warmed up
+
+
+def get_sentence_transformer(model_name=LOCAL_EMBEDDING_MODEL):
+    """
+    Returns a shared SentenceTransformer instance per model name (loaded once per process, on first use).
+    """
+    return _sentence_transformer_resource(model_name).get()
+
+
+class OpenAIEmbeddingBackend:
+    """
+    Embeds text with the OpenAI embeddings API (network call, batched/coalesced in openai_embeddings).
+    """
+    name = "openai"
+
+    def __init__(self, model=OPENAI_EMBEDDING_MODEL):
+        self.model = model
+
+    @property
+    def cache_id(self):
+        return f"{self.name}-{self.model}"
+
+    def embed(self, text, source=None):
+        from src.models.openai_embeddings import get_openai_embedding
+        return get_openai_embedding(text, model=self.model, source=source)
+
+    def embed_batch(self, texts, source=None):
+        from src.models.openai_embeddings import get_openai_embeddings_batch
+        return get_openai_embeddings_batch(texts, model=self.model, source=source)
+
+
+class LocalEmbeddingBackend:
+    """
+    Embeds text in-process with a sentence-transformers model (default: all-MiniLM-L6-v2) on CPU.
+
+    No network calls are made, so thought dedup and tool routing work offline. Vectors are
+    L2-normalized float32 arrays; texts are encoded in batches of `batch_size`.
+    """
+    name = "local"
+
+    def __init__(self, model=LOCAL_EMBEDDING_MODEL, batch_size=64):
+        self.model = model
+        self.batch_size = batch_size
+
+    @property
+    def cache_id(self):
+        return f"{self.name}-{self.model}"
+
+    def embed(self, text, source=None):
+        return self.embed_batch([text], source=source)[0]
+
+    def embed_batch(self, texts, source=None):
+        if not texts:
+            return []
+        vectors = get_sentence_transformer(self.model).encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return list(np.asarray(vectors, dtype=np.float32))
+
+
+EMBEDDING_BACKENDS = {
+    "openai": OpenAIEmbeddingBackend,
+    "local": LocalEmbeddingBackend,
+}
+
+_active_backend = None
+
+
+def get_embedding_backend():
+    """
+    Returns the configured backend (EMBEDDING_BACKEND env var, or set_embedding_backend()).
+    """
+    global _active_backend
+    if _active_backend is None:
+        set_embedding_backend(EMBEDDING_BACKEND)
+    return _active_backend
+
+
+def set_embedding_backend(name, **kwargs):
+    """
+    Selects the embedding backend by name ("openai" or "local"); kwargs go to its constructor.
+    Note: embeddings from different backends are not comparable, so switch before a run starts.
+    """
+    global _active_backend
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}'. Choose from: {', '.join(EMBEDDING_BACKENDS)}")
+    _active_backend = EMBEDDING_BACKENDS[name](**kwargs)
+    log_phase(f"🧭 Embedding backend: {_active_backend.cache_id}")
+    return _active_backend
+
+
+def get_embedding(text, backend=None, source=None):
+    """
+    Embeds a single text with the given (or configured) backend.
+    """
+    return (backend or get_embedding_backend()).embed(text, source=source)
+
+
+def get_embeddings_batch(texts, backend=None, source=None):
+    """
+    Embeds a list of texts with the given (or configured) backend in as few calls as possible.
+    """
+    return (backend or get_embedding_backend()).embed_batch(list(texts), source=source)
@@ -0,0 +1,97 @@
+# embedding_store.py – Persistent cross-run embedding store (float16 vectors in SQLite)
+
+import hashlib
+import os
+from pathlib import Path
+import numpy as np
+from src.utils.sqlite_cache import SQLiteLRUCache
+
+# Store settings (override via env vars or configure_embedding_store)
+EMBEDDING_STORE_ENABLED = os.getenv("EMBEDDING_STORE_ENABLED", "true").lower() not in ("0", "false", "no")
+EMBEDDING_STORE_PATH = os.getenv(
+    "EMBEDDING_STORE_PATH",
+    str(Path(os.getenv("OUTPUT_DIR", "outputs")) / "cache" / "embeddings.sqlite")
+)
+EMBEDDING_STORE_MAX_ENTRIES = int(os.getenv("EMBEDDING_STORE_MAX_ENTRIES", "200000"))
+EMBEDDING_STORE_MAX_BYTES = int(os.getenv("EMBEDDING_STORE_MAX_BYTES", str(256 * 1024 * 1024)))  # 256 MB
+
+embedding_store = SQLiteLRUCache(
+    EMBEDDING_STORE_PATH,
+    max_entries=EMBEDDING_STORE_MAX_ENTRIES,
+    max_bytes=EMBEDDING_STORE_MAX_BYTES
+)
+
+
+def configure_embedding_store(enabled=None, path=None, max_entries=None, max_bytes=None):
+    """
+    Reconfigures the embedding store at runtime (e.g. to point tests or a run at another file).
+    """
+    global EMBEDDING_STORE_ENABLED, embedding_store
+    if enabled is not None:
+        EMBEDDING_STORE_ENABLED = enabled
+    if path is not None or max_entries is not None or max_bytes is not None:
+        embedding_store.close()
+        embedding_store = SQLiteLRUCache(
+            path or embedding_store.path,
+            max_entries=max_entries if max_entries is not None else embedding_store.max_entries,
+            max_bytes=max_bytes if max_bytes is not None else embedding_store.max_bytes
+        )
+
+
+def make_embedding_key(namespace, text):
+    """
+    Key for one vector: the backend/model id (e.g. "openai-text-embedding-ada-002") + SHA-256 of the text.
+    """
+    return f"{namespace}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+def _encode(embedding):
+    # float16 halves the footprint of float32 (quarter of float64); cosine scores shift by < 1e-3
+    return np.asarray(embedding, dtype=np.float16).tobytes()
+
+
+def _decode(raw):
+    return np.frombuffer(raw, dtype=np.float16).astype(np.float32)
+
+
+def get_stored_embeddings(namespace, texts):
+    """
+    Returns {text: embedding} for the texts found in the store (misses are simply absent).
+    """
+    if not EMBEDDING_STORE_ENABLED:
+        return {}
+    found = {}
+    for text in texts:
+        raw = embedding_store.get(make_embedding_key(namespace, text))
+        if raw is not None:
+            found[text] = _decode(raw)
+    return found
+
+
+def store_embeddings(namespace, embeddings_by_text):
+    """
+    Persists {text: embedding} in one transaction.
+    """
+    if not EMBEDDING_STORE_ENABLED or not embeddings_by_text:
+        return
+    embedding_store.set_many(
+        (make_embedding_key(namespace, text), _encode(embedding))
+        for text, embedding in embeddings_by_text.items()
+    )
+
+
+def get_embedding_store_stats():
+    """
+    Returns hit/miss/write/eviction counters for the current process plus the stored entry count.
+    """
+    stats = embedding_store.stats()
+    stats["enabled"] = EMBEDDING_STORE_ENABLED
+    return stats
+
+
+def merge_embedding_store_stats(stats):
+    embedding_store.merge_stats(stats)
+
+
+def reset_embedding_store_stats():
+    embedding_store.reset_stats()
@@ -0,0 +1,105 @@
+# llm_cache.py – Persistent response cache for deterministic (temperature=0) chat completions
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from src.utils.sqlite_cache import SQLiteLRUCache
+
+# Cache settings (override via env vars or configure_llm_cache)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    str(Path(os.getenv("OUTPUT_DIR", "outputs")) / "cache" / "llm_responses.sqlite")
+)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 days
+
+llm_response_cache = SQLiteLRUCache(
+    LLM_CACHE_PATH,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS
+)
+llm_cache_savings = {"prompt_tokens_saved": 0, "completion_tokens_saved": 0}
+
+
+def configure_llm_cache(enabled=None, path=None, max_entries=None, ttl_seconds=None):
+    """
+    Reconfigures the response cache at runtime (e.g. to point tests or a run at another file).
+    """
+    global LLM_CACHE_ENABLED, llm_response_cache
+    if enabled is not None:
+        LLM_CACHE_ENABLED = enabled
+    if path is not None or max_entries is not None or ttl_seconds is not None:
+        llm_response_cache.close()
+        llm_response_cache = SQLiteLRUCache(
+            path or llm_response_cache.path,
+            max_entries=max_entries if max_entries is not None else llm_response_cache.max_entries,
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else llm_response_cache.ttl_seconds
+        )
+
+
+def is_llm_call_cacheable(temperature):
+    """
+    Only deterministic calls are cached; sampled completions must stay fresh.
+    """
+    return LLM_CACHE_ENABLED and temperature == 0
+
+
+def make_llm_cache_key(model, messages, temperature, max_tokens, stop=None, stream_until=None):
+    """
+    Content-addresses a completion request: SHA-256 over the canonical JSON of its inputs.
+
+    Stop sequences and the name of a streaming early-exit predicate change what the model returns,
+    so they are part of the key when set (keys of plain calls are unchanged).
+    """
+    request = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+    if stop:
+        request["stop"] = [stop] if isinstance(stop, str) else list(stop)
+    if stream_until:
+        request["stream_until"] = stream_until
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_llm_response(key):
+    """
+    Returns the cached completion content for `key`, or None on a miss.
+    """
+    raw = llm_response_cache.get(key)
+    if raw is None:
+        return None
+    entry = json.loads(raw.decode("utf-8"))
+    llm_cache_savings["prompt_tokens_saved"] += entry.get("prompt_tokens", 0)
+    llm_cache_savings["completion_tokens_saved"] += entry.get("completion_tokens", 0)
+    return entry["content"]
+
+
+def store_llm_response(key, content, prompt_tokens=0, completion_tokens=0):
+    entry = {"content": content, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+    llm_response_cache.set(key, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def get_llm_cache_stats():
+    """
+    Returns hit/miss counters, entry count and tokens saved for the current process.
+    """
+    stats = llm_response_cache.stats()
+    stats.update(llm_cache_savings)
+    stats["enabled"] = LLM_CACHE_ENABLED
+    return stats
+
+
+def reset_llm_cache_stats():
+    llm_response_cache.reset_stats()
+    for key in llm_cache_savings:
+        llm_cache_savings[key] = 0
+
+
+def merge_llm_cache_stats(stats):
+    """
+    Adds counters from another process's get_llm_cache_stats() into this process.
+    """
+    llm_response_cache.merge_stats(stats)
+    for key in llm_cache_savings:
+        llm_cache_savings[key] += stats.get(key, 0)
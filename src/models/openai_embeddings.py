@@ -1,30 +1,170 @@
 # Use OpenAI function for creating embeddings for tool descriptions and examples.
 
-from openai import OpenAI
 import os
 from src.utils.logging_utils import log_openai_call
+from src.models.openai_interface import get_openai_client
 import inspect
+import threading
+from concurrent.futures import Future
+
+
+def __getattr__(name):
+    # `openai_embeddings.client` is the shared (lazily created) OpenAI client
+    if name == "client":
+        return get_openai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Per-request limits for embeddings.create (inputs per call, approx. total tokens per call)
+EMBEDDING_MODEL_LIMITS = {
+    "text-embedding-ada-002": {"max_inputs": 2048, "max_tokens": 300000},
+    "text-embedding-3-small": {"max_inputs": 2048, "max_tokens": 300000},
+    "text-embedding-3-large": {"max_inputs": 2048, "max_tokens": 300000},
+}
+DEFAULT_EMBEDDING_LIMITS = {"max_inputs": 2048, "max_tokens": 300000}
+
+# How long a single-text request waits for concurrent requests to join its batch (0 disables coalescing)
+EMBEDDING_COALESCE_WINDOW_MS = float(os.getenv("EMBEDDING_COALESCE_WINDOW_MS", "5"))
+
+# Frames from these modules are plumbing, not the real caller
+_SOURCE_SKIP_PREFIXES = ("utils.logging_utils", "asyncio", "concurrent.futures", "threading")
+
+
+def _resolve_source(source):
+    # Find source of which function called the embedding API
+    if source is not None:
+        return source
+    for frame in inspect.stack()[2:]:
+        module = inspect.getmodule(frame.frame)
+        if module and module.__name__ != __name__ and not module.__name__.startswith(_SOURCE_SKIP_PREFIXES):
+            return frame.function
+    return "unknown"
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _split_into_requests(texts, model):
+    """
+    Splits texts into chunks that respect the model's per-request input and token limits.
+    """
+    limits = EMBEDDING_MODEL_LIMITS.get(model, DEFAULT_EMBEDDING_LIMITS)
+    chunk, chunk_tokens = [], 0
+    for text in texts:
+        tokens = _estimate_tokens(text)
+        if chunk and (len(chunk) >= limits["max_inputs"] or chunk_tokens + tokens > limits["max_tokens"]):
+            yield chunk
+            chunk, chunk_tokens = [], 0
+        chunk.append(text)
+        chunk_tokens += tokens
+    if chunk:
+        yield chunk
+
+
+def _embed_texts(texts, model, source):
+    embeddings = []
+    for chunk in _split_into_requests(texts, model):
+        response = get_openai_client().embeddings.create(
+            model=model,
+            input=chunk
+        )
+        log_openai_call(chunk if len(chunk) > 1 else chunk[0], response, source=source, embedding=True)
+        embeddings.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+    return embeddings
+
+
+def get_openai_embeddings_batch(texts, model="text-embedding-ada-002", source=None):
+    """
+    Get OpenAI embeddings for a list of texts using as few API calls as possible.
+
+    Texts are sent together in one embeddings.create call per chunk, where chunks respect the
+    model's maximum number of inputs and tokens per request.
+
+    Returns:
+    list: One embedding (list of floats) per input text, in the same order.
+    """
+    if not texts:
+        return []
+    source = _resolve_source(source)
+    return _embed_texts(list(texts), model, source)
+
+
+class EmbeddingCoalescer:
+    """
+    Micro-batches concurrent single-text embedding requests into one API call.
+
+    Purpose:
+    When several threads ask for embeddings at the same time (parallel criteria, ToT nodes),
+    the first request opens a batch and waits `window_ms` for others to join. The batch is sent
+    as a single embeddings.create call (up to the model's input limit) and each caller receives
+    its own vector. With a single caller this only adds the (small) window delay.
+
+    Parameters:
+    - model (str): Embedding model for every request in this coalescer.
+    - window_ms (float): How long the batch leader waits for other requests.
+    """
+
+    def __init__(self, model, window_ms=EMBEDDING_COALESCE_WINDOW_MS):
+        self.model = model
+        self.window_sec = window_ms / 1000
+        self.max_inputs = EMBEDDING_MODEL_LIMITS.get(model, DEFAULT_EMBEDDING_LIMITS)["max_inputs"]
+        self._lock = threading.Lock()
+        self._batch = None
+
+    def embed(self, text, source=None):
+        future = Future()
+        with self._lock:
+            batch = self._batch
+            is_leader = batch is None
+            if is_leader:
+                batch = {"items": [], "full": threading.Event(), "source": source}
+                self._batch = batch
+            batch["items"].append((text, future))
+            if len(batch["items"]) >= self.max_inputs:
+                self._batch = None  # close the batch so later requests start a new one
+                batch["full"].set()
+
+        if is_leader:
+            batch["full"].wait(self.window_sec)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+            self._flush(batch)
+
+        return future.result()
+
+    def _flush(self, batch):
+        texts = [text for text, _ in batch["items"]]
+        try:
+            embeddings = _embed_texts(texts, self.model, batch["source"] or "unknown")
+        except Exception as e:
+            for _, future in batch["items"]:
+                future.set_exception(e)
+            return
+        for (_, future), embedding in zip(batch["items"], embeddings):
+            future.set_result(embedding)
+
+
+_coalescers = {}
+_coalescers_lock = threading.Lock()
+
+
+def _get_coalescer(model):
+    with _coalescers_lock:
+        if model not in _coalescers:
+            _coalescers[model] = EmbeddingCoalescer(model)
+        return _coalescers[model]
 
-client = OpenAI()  # uses your environment variable OPENAI_API_KEY
 
 def get_openai_embedding(text, model="text-embedding-ada-002", source=None):
     """
     Get OpenAI embedding for a given text.
+
+    Concurrent calls are coalesced into a single batched request (see EmbeddingCoalescer);
+    set EMBEDDING_COALESCE_WINDOW_MS=0 to send each text on its own.
     """
-    response = client.embeddings.create(
-        model=model,
-        input=[text]
-    )
-
-    # Find source of which function called call_openai_with_tracking()
-    if source is None:
-        for frame in inspect.stack()[1:]:
-            module = inspect.getmodule(frame.frame)
-            if module and not module.__name__.startswith("utils.logging_utils"):
-                source = frame.function
-                break
-        else:
-            source = "unknown"
-    
-    log_openai_call(text, response, source=source, embedding=True)
-    return response.data[0].embedding
+    source = _resolve_source(source)
+    if EMBEDDING_COALESCE_WINDOW_MS <= 0:
+        return _embed_texts([text], model, source)[0]
+    return _get_coalescer(model).embed(text, source=source)
@@ -2,26 +2,380 @@
 
 import os
 from dotenv import load_dotenv
-from openai import OpenAI, OpenAIError
+from openai import OpenAI, AsyncOpenAI, OpenAIError
 from src.utils.logging_utils import log_phase, log_openai_call, log_openai_call_time
+from src.models.llm_cache import is_llm_call_cacheable, make_llm_cache_key, get_cached_llm_response, store_llm_response
+from src.utils.lazy_resources import register_resource
 import time
 import inspect
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from types import SimpleNamespace
 
 # Load the .env file
 load_dotenv()
 
-# Get the API key
-my_openai_api_key = os.getenv("OPENAI_API_KEY")
 
-# Safety check
-if not my_openai_api_key:
-    raise OpenAIError("❌ OPENAI_API_KEY not set. Please check your .env file or environment variables.")
+def _get_api_key():
+    # Checked when the first client is created (not at import), so tools and tests import without a key
+    my_openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not my_openai_api_key:
+        raise OpenAIError("❌ OPENAI_API_KEY not set. Please check your .env file or environment variables.")
+    return my_openai_api_key
 
-# Create OpenAI client
-client = OpenAI(api_key=my_openai_api_key)
 
+# OpenAI clients (sync for the main pipeline, async for concurrent fan-out), created on first use
+_client = register_resource("openai_client", lambda: OpenAI(api_key=_get_api_key()), "OpenAI sync client")
+_async_client = register_resource("openai_async_client", lambda: AsyncOpenAI(api_key=_get_api_key()), "OpenAI async client")
 
-def call_openai_with_tracking(messages, model="gpt-3.5-turbo", temperature=0.7, max_tokens=500, source=None):
+# AsyncOpenAI's connection pool is bound to the event loop that first used it, so every loop gets
+# its own client (like the limiter's semaphores); run_openai_calls_concurrently() closes it with the loop
+_loop_async_clients = weakref.WeakKeyDictionary()
+_loop_async_clients_lock = threading.Lock()
+
+
+def get_openai_client():
+    return _client.get()
+
+
+def get_async_openai_client():
+    """
+    The AsyncOpenAI client for the running event loop, created on first use in that loop.
+    Outside an event loop, returns the shared registered client.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _async_client.get()
+    with _loop_async_clients_lock:
+        if loop not in _loop_async_clients:
+            _loop_async_clients[loop] = AsyncOpenAI(api_key=_get_api_key())
+        return _loop_async_clients[loop]
+
+
+async def close_async_openai_client():
+    """
+    Closes the running loop's AsyncOpenAI client (if one was created) before the loop ends.
+    """
+    with _loop_async_clients_lock:
+        client = _loop_async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def __getattr__(name):
+    # Keeps `openai_interface.client` / `.async_client` working for callers and tests
+    if name == "client":
+        return get_openai_client()
+    if name == "async_client":
+        return get_async_openai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _parse_model_limits(raw):
+    """
+    Parses per-model concurrency limits from a string like "gpt-4=2,gpt-4-turbo=4".
+    """
+    limits = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip()] = int(value.strip())
+    return limits
+
+
+# Concurrency limits for async calls (override via env vars or configure_openai_concurrency)
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_MODEL_CONCURRENCY = {
+    "gpt-4": 2,
+    "gpt-4-turbo": 4,
+    **_parse_model_limits(os.getenv("OPENAI_MODEL_CONCURRENCY")),
+}
+
+
+class OpenAIConcurrencyLimiter:
+    """
+    Bounds the number of in-flight OpenAI calls.
+
+    A global semaphore caps total concurrency and optional per-model semaphores cap
+    calls to slower or rate-limited models (e.g. gpt-4). Async calls take slot(): its
+    semaphores are created per event loop, so the limiter is safe to reuse across separate
+    asyncio.run() calls. Sync calls made from worker threads (criteria, ToT frontier) take
+    sync_slot(), which applies the same limits with threading semaphores shared by the process.
+
+    Parameters:
+    - max_concurrency (int): Maximum number of concurrent calls across all models.
+    - per_model_limits (dict): Optional {model_name: max_concurrent_calls}.
+    """
+
+    def __init__(self, max_concurrency=8, per_model_limits=None):
+        self.max_concurrency = max_concurrency
+        self.per_model_limits = dict(per_model_limits or {})
+        self._loop_semaphores = weakref.WeakKeyDictionary()
+        self._thread_semaphores = {}
+        self._thread_semaphores_lock = threading.Lock()
+
+    def configure(self, max_concurrency=None, per_model_limits=None):
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        if per_model_limits is not None:
+            self.per_model_limits = dict(per_model_limits)
+        self._loop_semaphores = weakref.WeakKeyDictionary()  # rebuilt lazily with the new limits
+        with self._thread_semaphores_lock:
+            self._thread_semaphores = {}
+
+    def _semaphores(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_semaphores:
+            self._loop_semaphores[loop] = {"__global__": asyncio.Semaphore(max(1, self.max_concurrency))}
+        return self._loop_semaphores[loop]
+
+    @asynccontextmanager
+    async def slot(self, model):
+        semaphores = self._semaphores()
+        model_limit = self.per_model_limits.get(model)
+        if model_limit and model not in semaphores:
+            semaphores[model] = asyncio.Semaphore(max(1, model_limit))
+
+        # Wait for the model slot first so a slow model doesn't hold global slots while queued
+        if model_limit:
+            async with semaphores[model]:
+                async with semaphores["__global__"]:
+                    yield
+        else:
+            async with semaphores["__global__"]:
+                yield
+
+    def _thread_semaphore(self, key, limit):
+        with self._thread_semaphores_lock:
+            if key not in self._thread_semaphores:
+                self._thread_semaphores[key] = threading.BoundedSemaphore(max(1, limit))
+            return self._thread_semaphores[key]
+
+    @contextmanager
+    def sync_slot(self, model):
+        global_semaphore = self._thread_semaphore("__global__", self.max_concurrency)
+        model_limit = self.per_model_limits.get(model)
+        # Same order as slot(): wait for the model slot before holding a global one
+        if model_limit:
+            with self._thread_semaphore(model, model_limit), global_semaphore:
+                yield
+        else:
+            with global_semaphore:
+                yield
+
+
+openai_limiter = OpenAIConcurrencyLimiter(OPENAI_MAX_CONCURRENCY, OPENAI_MODEL_CONCURRENCY)
+
+
+def configure_openai_concurrency(max_concurrency=None, per_model_limits=None):
+    """
+    Updates the global and per-model limits used by the sync and async OpenAI calls.
+    """
+    openai_limiter.configure(max_concurrency=max_concurrency, per_model_limits=per_model_limits)
+    log_phase(
+        f"⚙️ OpenAI concurrency set to {openai_limiter.max_concurrency} "
+        f"(per-model: {openai_limiter.per_model_limits or 'none'})"
+    )
+
+
+# Frames from these modules are plumbing (event loop, executors), not the real caller
+_SOURCE_SKIP_PREFIXES = ("utils.logging_utils", "asyncio", "concurrent.futures", "threading")
+
+
+def _resolve_call_source(source):
+    # Find source of which function called call_openai_with_tracking()
+    if source is not None:
+        return source
+    for frame in inspect.stack()[2:]:
+        module = inspect.getmodule(frame.frame)
+        if module and module.__name__ != __name__ and not module.__name__.startswith(_SOURCE_SKIP_PREFIXES):
+            return frame.function
+    return "unknown"
+
+
+def _lookup_cached_response(messages, model, temperature, max_tokens, source, stop=None, stream_until=None):
+    """
+    Returns (cache_key, cached_content) for deterministic calls; (None, None) when caching doesn't apply.
+    """
+    if not is_llm_call_cacheable(temperature):
+        return None, None
+    predicate_name = _predicate_cache_name(stream_until)
+    if stream_until is not None and predicate_name is None:
+        return None, None
+    try:
+        cache_key = make_llm_cache_key(model, messages, temperature, max_tokens, stop=stop, stream_until=predicate_name)
+        cached = get_cached_llm_response(cache_key)
+    except Exception as e:
+        log_phase(f"⚠️ LLM cache lookup failed, calling API: {e}")
+        return None, None
+    if cached is not None:
+        log_phase(f"🗄️ LLM cache hit for {source}")
+    return cache_key, cached
+
+
+def _predicate_cache_name(stream_until):
+    """
+    Stable name of a stream_until predicate for the cache key. Lambdas and closures can carry state the
+    name doesn't capture, so they get None and their calls are not cached.
+    """
+    if stream_until is None:
+        return None
+    qualname = getattr(stream_until, "__qualname__", "")
+    if not qualname or "<" in qualname or getattr(stream_until, "__closure__", None):
+        return None
+    return f"{stream_until.__module__}.{qualname}"
+
+
+def _build_completion_request(messages, model, temperature, max_tokens, stop, stream_until):
+    request = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+    if stop:
+        request["stop"] = stop
+    if stream_until is not None:
+        request["stream"] = True
+        request["stream_options"] = {"include_usage": True}
+    return request
+
+
+def _estimate_tokens(text):
+    # ~4 characters per token; only used when a stream is cut before the usage chunk arrives
+    return max(1, len(text) // 4) if text else 0
+
+
+class _StreamedCompletion:
+    """
+    Completion assembled from stream chunks, shaped like a ChatCompletion for _track_openai_response()
+    and log_openai_call(). Usage comes from the final usage chunk, or is estimated when the stream
+    was ended early by a stream_until predicate.
+    """
+
+    def __init__(self, messages, content, usage, chunk_count, stopped_early):
+        if usage is None:
+            prompt_text = " ".join(str(m.get("content") or "") for m in messages)
+            prompt_tokens = _estimate_tokens(prompt_text)
+            usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=chunk_count,
+                                    total_tokens=prompt_tokens + chunk_count)
+        self.usage = usage
+        self.choices = [SimpleNamespace(message=SimpleNamespace(content=content))]
+        self.stopped_early = stopped_early
+
+    def model_dump(self):
+        return {
+            "choices": [{"message": {"role": "assistant", "content": self.choices[0].message.content}}],
+            "usage": {
+                "prompt_tokens": self.usage.prompt_tokens,
+                "completion_tokens": self.usage.completion_tokens,
+                "total_tokens": self.usage.total_tokens,
+            },
+            "stopped_early": self.stopped_early,
+        }
+
+
+class _StreamAccumulator:
+    """
+    Collects streamed deltas and reports when the caller's predicate is satisfied.
+    """
+
+    def __init__(self, stream_until):
+        self.stream_until = stream_until
+        self.text = ""
+        self.usage = None
+        self.chunk_count = 0
+
+    def add(self, chunk):
+        # Returns True once stream_until(text so far) holds
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+        if not getattr(chunk, "choices", None):
+            return False
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            return False
+        self.text += delta
+        self.chunk_count += 1
+        return bool(self.stream_until(self.text))
+
+    def completion(self, messages, stopped_early):
+        usage = None if stopped_early else self.usage
+        return _StreamedCompletion(messages, self.text, usage, self.chunk_count, stopped_early)
+
+
+def _read_stream(stream, messages, stream_until):
+    accumulator = _StreamAccumulator(stream_until)
+    stopped_early = False
+    for chunk in stream:
+        if accumulator.add(chunk):
+            stopped_early = True
+            break
+    if stopped_early and hasattr(stream, "close"):
+        stream.close()  # drops the connection so the server stops generating
+    return accumulator.completion(messages, stopped_early)
+
+
+async def _read_stream_async(stream, messages, stream_until):
+    accumulator = _StreamAccumulator(stream_until)
+    stopped_early = False
+    async for chunk in stream:
+        if accumulator.add(chunk):
+            stopped_early = True
+            break
+    if stopped_early and hasattr(stream, "close"):
+        await stream.close()
+    return accumulator.completion(messages, stopped_early)
+
+
+def _track_openai_response(messages, response, source, duration, cache_key=None):
+    """
+    Shared token/cost accounting and call logging for sync and async completions.
+    Stores the result in the response cache when a cache key is given.
+    Returns the content of the first choice.
+    """
+    prompt_tokens, completion_tokens = _track_openai_usage(messages, response, source, duration)
+
+    content = response.choices[0].message.content.strip()
+    if cache_key is not None:
+        try:
+            store_llm_response(cache_key, content, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        except Exception as e:
+            log_phase(f"⚠️ Could not write LLM cache entry: {e}")
+    return content
+
+
+def _track_openai_usage(messages, response, source, duration):
+    """
+    Token/cost accounting and call logging for one chat completion. Returns (prompt_tokens, completion_tokens).
+    """
+    global total_tokens_used, estimated_cost_usd
+
+    total_tokens_used = 0
+    estimated_cost_usd = 0.0
+    COST_PER_1K_TOKENS = 0.0015
+
+    # Extract token usage and calculate estimated cost
+    usage = response.usage
+    prompt_tokens = usage.prompt_tokens or 0
+    completion_tokens = usage.completion_tokens or 0
+    total = usage.total_tokens or (prompt_tokens + completion_tokens)
+
+    # Update tracking
+    total_tokens_used += total
+    estimated_cost_usd += (total / 1000) * COST_PER_1K_TOKENS
+
+    # Logging
+    log_openai_call(messages, response, source=source, prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens, embedding=False)
+    log_openai_call_time(duration)
+    return prompt_tokens, completion_tokens
+
+
+def call_openai_with_tracking(messages, model="gpt-3.5-turbo", temperature=0.7, max_tokens=500, source=None,
+                              stop=None, stream_until=None):
     """
     Calls OpenAI's ChatCompletion API with structured messages and tracks token usage and estimated cost.
 
@@ -31,6 +385,11 @@ def call_openai_with_tracking(messages, model="gpt-3.5-turbo", temperature=0.7,
     temperature (float): The sampling temperature to use. Higher values mean the model will take more risks. Default is 0.7.
     max_tokens (int): The maximum number of tokens to generate in the completion. Default is 500.
     source (str): The source of the function call. Default is None.
+    stop (str | list): Up to 4 stop sequences; generation ends before the first one. Default is None.
+    stream_until (callable): Optional predicate on the text received so far. When given, the completion
+        is streamed and the request is closed as soon as stream_until(text) is true, so short
+        structured answers (one ReAct action, one score) don't wait for the rest of the output.
+        Usage of an early-exited call is estimated (prompt ~4 chars/token, one token per chunk).
 
     Workflow:
     1. The function takes the input parameters and calls the OpenAI ChatCompletion API.
@@ -39,50 +398,142 @@ def call_openai_with_tracking(messages, model="gpt-3.5-turbo", temperature=0.7,
     4. It updates the total tokens used and the estimated cost in USD.
     5. It logs the prompt tokens, completion tokens, total tokens used so far, and the estimated cost.
 
+    Deterministic calls (temperature=0) are served from the persistent response cache in
+    llm_cache.py when the same model, messages, max_tokens, stop sequences and stream_until
+    predicate were seen before (calls with a lambda/closure predicate are not cached).
+    API calls wait for an openai_limiter.sync_slot(), so threads fanning out calls stay within
+    OPENAI_MAX_CONCURRENCY and the per-model limits.
+
     Returns:
     str: The content of the first choice from the API response.
     """
-    global total_tokens_used, estimated_cost_usd
+    source = _resolve_call_source(source)
+    cache_key, cached = _lookup_cached_response(messages, model, temperature, max_tokens, source,
+                                                stop=stop, stream_until=stream_until)
+    if cached is not None:
+        return cached
+
+    try:
+        with openai_limiter.sync_slot(model):
+            start = time.time()
+            response = get_openai_client().chat.completions.create(
+                **_build_completion_request(messages, model, temperature, max_tokens, stop, stream_until)
+            )
+            if stream_until is not None:
+                response = _read_stream(response, messages, stream_until)
+            duration = round(time.time() - start, 2)
+    except Exception as e:
+        return f"⚠️ Tool execution error: {str(e)}"
+
+    return _track_openai_response(messages, response, source, duration, cache_key=cache_key)
 
-    total_tokens_used = 0
-    estimated_cost_usd = 0.0
-    COST_PER_1K_TOKENS = 0.0015
+
+def call_openai_with_tools(messages, tools, model="gpt-3.5-turbo", temperature=0.7, max_tokens=500, tool_choice="required", source=None):
+    """
+    Chat completion with function calling (structured output), with the same token/cost tracking
+    as call_openai_with_tracking().
+
+    Parameters:
+    messages (list): Chat messages.
+    tools (list): OpenAI tool definitions (see tool_schemas.build_react_tool_schemas).
+    tool_choice (str | dict): "required" (default) forces a function call; "auto" lets the model answer in text.
+
+    Returns:
+    dict: {"content": str or None, "tool_calls": [{"name": str, "arguments": str (JSON)}], "error": str or None}.
+    Function-calling responses are not stored in the response cache.
+    """
+    source = _resolve_call_source(source)
+    try:
+        with openai_limiter.sync_slot(model):
+            start = time.time()
+            response = get_openai_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                tool_choice=tool_choice
+            )
+            duration = round(time.time() - start, 2)
+    except Exception as e:
+        return {"content": None, "tool_calls": [], "error": f"⚠️ Tool execution error: {str(e)}"}
+
+    _track_openai_usage(messages, response, source, duration)
+    message = response.choices[0].message
+    tool_calls = [
+        {"name": call.function.name, "arguments": call.function.arguments}
+        for call in (message.tool_calls or [])
+    ]
+    return {"content": (message.content or "").strip() or None, "tool_calls": tool_calls, "error": None}
+
+
+async def call_openai_with_tracking_async(messages, model="gpt-3.5-turbo", temperature=0.7, max_tokens=500, source=None,
+                                          stop=None, stream_until=None):
+    """
+    Async sibling of call_openai_with_tracking() built on AsyncOpenAI.
+
+    The call waits for a slot from the shared OpenAIConcurrencyLimiter (global + per-model
+    semaphores) before hitting the API, so callers can fan out many independent calls with
+    asyncio.gather() without exceeding rate limits. Token usage, cost and call logging are
+    identical to the sync path, including the temperature=0 response cache and the
+    stop / stream_until options.
+
+    Returns:
+    str: The content of the first choice from the API response.
+    """
+    source = _resolve_call_source(source)
+    cache_key, cached = _lookup_cached_response(messages, model, temperature, max_tokens, source,
+                                                stop=stop, stream_until=stream_until)
+    if cached is not None:
+        return cached
 
     try:
-        start = time.time()
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
-        duration = round(time.time() - start, 2)
+        async with openai_limiter.slot(model):
+            start = time.time()
+            response = await get_async_openai_client().chat.completions.create(
+                **_build_completion_request(messages, model, temperature, max_tokens, stop, stream_until)
+            )
+            if stream_until is not None:
+                response = await _read_stream_async(response, messages, stream_until)
+            duration = round(time.time() - start, 2)
     except Exception as e:
         return f"⚠️ Tool execution error: {str(e)}"
 
-    # Extract token usage and calculate estimated cost
-    usage = response.usage
-    prompt_tokens = usage.prompt_tokens or 0
-    completion_tokens = usage.completion_tokens or 0
-    total = usage.total_tokens or (prompt_tokens + completion_tokens)
+    return _track_openai_response(messages, response, source, duration, cache_key=cache_key)
 
-    # Update tracking
-    total_tokens_used += total
-    estimated_cost_usd += (total / 1000) * COST_PER_1K_TOKENS
 
-    # Find source of which function called call_openai_with_tracking()
-    if source is None:
-        for frame in inspect.stack()[1:]:
-            module = inspect.getmodule(frame.frame)
-            if module and not module.__name__.startswith("utils.logging_utils"):
-                source = frame.function
-                break
-        else:
-            source = "unknown"
+async def gather_openai_calls_async(calls):
+    """
+    Runs several independent completions concurrently (bounded by openai_limiter).
 
-    # Logging
-    log_openai_call(messages, response, source=source, prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens, embedding=False)
-    log_openai_call_time(duration)
+    Parameters:
+    calls (list): A list of keyword-argument dicts for call_openai_with_tracking_async(),
+                  e.g. [{"messages": [...], "temperature": 0}, ...].
+
+    Returns:
+    list: Responses in the same order as `calls`.
+    """
+    return await asyncio.gather(*(call_openai_with_tracking_async(**call) for call in calls))
+
+
+async def _run_batch(calls):
+    try:
+        return await gather_openai_calls_async(calls)
+    finally:
+        await close_async_openai_client()  # its connections belong to this batch's loop
+
+
+def run_openai_calls_concurrently(calls):
+    """
+    Sync entry point for gather_openai_calls_async() for use from the synchronous pipeline.
+    Each batch runs on a fresh event loop with its own async client, closed when the batch ends.
+    If an event loop is already running (FastAPI, Jupyter), the batch runs on a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_run_batch(calls))
 
-    return response.choices[0].message.content.strip()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # copy_context keeps the caller's RunContext for calls logged on the helper thread
+        return executor.submit(contextvars.copy_context().run, asyncio.run, _run_batch(calls)).result()
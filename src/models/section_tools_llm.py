@@ -2,7 +2,7 @@
 
 import re
 from src.models.openai_interface import call_openai_with_tracking
-from nltk.tokenize import sent_tokenize
+from src.utils.proposal_artifacts import ProposalArtifacts
 from src.utils.tools.tools_web import search_arxiv
 from src.utils.section_map import canonical_section_map
 
@@ -170,7 +170,7 @@ def upgrade_section_with_research(section_text, model="gpt-3.5-turbo"):
                  Default is "gpt-3.5-turbo".
 
     Workflow:
-    1. Splits the input text into individual sentences using `sent_tokenize`.
+    1. Splits the input text into individual sentences (spaCy, same pipeline as ProposalArtifacts but uncached).
     2. Iterates through each sentence:
        - Calls `should_cite` to determine if the sentence requires a citation.
        - If a citation is needed:
@@ -195,7 +195,8 @@ def upgrade_section_with_research(section_text, model="gpt-3.5-turbo"):
             - improved (str): The improved sentence.
             - reason (str): The reason for requiring a citation.
     """
-    sentences = sent_tokenize(section_text)
+    # Uncached: section-sized texts would evict whole proposals from the shared artifacts LRU
+    sentences = ProposalArtifacts(section_text).sentences
     enhanced_sentences = []
     log = []
     footnotes = []
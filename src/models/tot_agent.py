@@ -1,11 +1,18 @@
 # src/models/tot_agent.py
 
 from src.models.openai_interface import call_openai_with_tracking
+import contextvars
+import os
 import uuid
-from src.utils.logging_utils import log_phase, log_thought_score, log_deduplication
-from src.utils.thought_filtering import filter_redundant_thoughts
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logging_utils import log_phase, log_thought_score, log_deduplication, emit_event
+from src.utils.thought_filtering import filter_and_record_thoughts, embed_thought_groups, ThoughtIndex
 import re
 
+# Frontier nodes expanded concurrently at each depth (1 = one node at a time). Opt-in like the
+# criteria/vendor workers: it nests under both, multiplying concurrent OpenAI calls.
+TOT_EXPANSION_MAX_WORKERS = int(os.getenv("TOT_EXPANSION_MAX_WORKERS", "1"))
+
 # --- Tree Node Class ---
 class TreeNode:
     """
@@ -63,6 +70,7 @@ class SimpleToTAgent:
     - scorer (callable): A scoring function that evaluates the quality of a thought.
     - beam_width (int): The number of top thoughts to keep at each depth. Default is 2.
     - max_depth (int): The maximum depth of the reasoning tree. Default is 2.
+    - max_workers (int): Frontier nodes expanded concurrently per depth. Default is TOT_EXPANSION_MAX_WORKERS.
 
     Functions:
     - __init__: Initializes the agent with the provided LLM, scorer, beam width, and maximum depth.
@@ -75,17 +83,32 @@ class SimpleToTAgent:
     2. Generates thoughts for a given section and criterion using the LLM.
     3. Evaluates and selects the top thoughts based on their scores.
     4. Constructs a reasoning tree by iteratively expanding thoughts up to the maximum depth.
+       At each depth, thought generation and scoring run for all frontier nodes concurrently;
+       deduplication against the shared history runs in frontier order, so the result and the
+       recorded history are the same as expanding the nodes one at a time.
     5. Returns the best reasoning path and its score.
 
     Returns:
     - SimpleToTAgent: An instance of the SimpleToTAgent class capable of performing Tree of Thought reasoning.
     """
 
-    def __init__(self, llm, scorer, beam_width=2, max_depth=2):
+    def __init__(self, llm, scorer, beam_width=2, max_depth=2, max_workers=None):
         self.llm = llm
         self.scorer = scorer
         self.beam_width = beam_width
         self.max_depth = max_depth
+        self.max_workers = max_workers or TOT_EXPANSION_MAX_WORKERS
+
+    def _map_frontier(self, fn, items):
+        """
+        Applies `fn` to every item, concurrently when there are several, and returns results in item order.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+        # Each task runs in a copy of the caller's context, so its metrics land in the same RunContext
+        contexts = [contextvars.copy_context() for _ in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(lambda ctx, item: ctx.run(fn, item), contexts, items))
 
     def generate_thoughts(self, section, criterion, parent_node):
         base_prompt = f"""
@@ -126,8 +149,10 @@ class SimpleToTAgent:
     def run(self, section, criterion, seen_thoughts=None, seen_embeddings=None):
         root = TreeNode("ROOT")
         frontier = [root]
-        seen_thoughts = seen_thoughts or []
-        seen_embeddings = seen_embeddings or []
+        # `is None` (not `or`): an empty shared list/index must be kept so the caller sees new entries
+        seen_thoughts = seen_thoughts if seen_thoughts is not None else []
+        seen_embeddings = seen_embeddings if seen_embeddings is not None else ThoughtIndex()
+        emit_event("phase_start", phase="tot", max_depth=self.max_depth)
 
         for depth in range(self.max_depth):
             log_phase(
@@ -135,25 +160,35 @@ class SimpleToTAgent:
             )
             next_frontier = []
 
-            for node in frontier:
-                thoughts = self.generate_thoughts(section, criterion, node)
+            # 1. Generate thoughts for all frontier nodes at once (independent LLM calls)
+            thoughts_per_node = self._map_frontier(
+                lambda node: self.generate_thoughts(section, criterion, node), frontier
+            )
+            embeddings_per_node = embed_thought_groups(thoughts_per_node)  # one batched lookup for the whole frontier
+
+            # 2. Filter out redundant thoughts in frontier order (deterministic merge into the shared history)
+            expansions = []
+            for node, thoughts, embeddings in zip(frontier, thoughts_per_node, embeddings_per_node):
                 log_phase(f"💡 Thoughts generated from: '{node.thought}'")
                 log_phase("\n".join(f"  → {t}" for t in thoughts))
 
                 if not thoughts:
                     log_phase("⚠️ No thoughts returned. Skipping.")
                     continue
-                
-                # Filter out redundant thoughts
-                novel_thoughts, novel_embs = filter_redundant_thoughts(thoughts, seen_thoughts, seen_embeddings)
+
+                # (novel thoughts/embeddings are stored in the shared history for future new thought checks)
+                novel_thoughts, novel_embs = filter_and_record_thoughts(
+                    thoughts, seen_thoughts, seen_embeddings, new_embeddings=embeddings
+                )
                 log_deduplication(thoughts, novel_thoughts) # keep track of thought deduplication stats
-                seen_thoughts.extend(novel_thoughts) # Store non-redundant thoughts (for future new thought checks)
-                seen_embeddings.extend(novel_embs) # Store non-redundant embeddings (for future new thought checks)
                 log_phase(f"🧠 Filtering redundant thoughts. Novel thoughts: {novel_thoughts}")
+                expansions.append((node, [TreeNode(thought=t, parent=node) for t in novel_thoughts]))
 
-                child_nodes = [TreeNode(thought=t, parent=node) for t in novel_thoughts]
-                top_children = self.evaluate_and_select(child_nodes, criterion, section)
-
+            # 3. Score each node's children at once (independent LLM calls), keep the top beam_width per node
+            selections = self._map_frontier(
+                lambda expansion: self.evaluate_and_select(expansion[1], criterion, section), expansions
+            )
+            for (node, _), top_children in zip(expansions, selections):
                 for child in top_children:
                     log_phase(f"✅ Selected: {child.thought} (score: {child.score})")
 
@@ -161,6 +196,7 @@ class SimpleToTAgent:
                 next_frontier.extend(top_children)
 
             frontier = next_frontier
+            emit_event("tot_depth", depth=depth + 1, max_depth=self.max_depth, frontier_size=len(frontier))
 
             if not frontier:
                 log_phase("⚠️ No more frontier nodes. Stopping early.")
@@ -170,12 +206,14 @@ class SimpleToTAgent:
             best_leaf = max(
                 frontier, key=lambda n: n.score
             )  # Get the best leaf node based on score
+            emit_event("phase_end", phase="tot", score=best_leaf.score)
             return {
                 "criterion": criterion,
                 "score": best_leaf.score,
                 "reasoning_path": best_leaf.path()[1:],  # skip 'ROOT'
             }
         else:
+            emit_event("phase_end", phase="tot", score=0)
             return {
                 "criterion": criterion,
                 "score": 0,
@@ -191,6 +229,23 @@ def generate_thoughts_openai(prompt, model="gpt-3.5-turbo", temperature=0.3):
     return call_openai_with_tracking(messages, model=model, temperature=temperature)
 
 
+def score_complete(text):
+    """
+    stream_until predicate for single-number scores: True once a number is followed by any other character.
+    """
+    return re.match(r"\s*\d+\D", text) is not None
+
+
+def parse_leading_score(response):
+    """
+    Reads the score at the start of a reply ("8", "8/10", "8 - clear and relevant"). Raises ValueError if there is none.
+    """
+    match = re.match(r"\s*(\d+)", response)
+    if not match:
+        raise ValueError(f"No score in response: {response!r}")
+    return int(match.group(1))
+
+
 def score_thought_with_openai(thought, criterion, section, model="gpt-3.5-turbo"):
     """
     Purpose:
@@ -206,7 +261,8 @@ def score_thought_with_openai(thought, criterion, section, model="gpt-3.5-turbo"
     1. Constructs a prompt that includes the proposal section, evaluation criterion, and the thought to be scored.
     2. Sends the prompt to the OpenAI API using the `call_openai_with_tracking` function.
     3. Prints the thought being scored and the response from the LLM.
-    4. Attempts to parse the response as an integer score between 1 and 10.
+    4. Attempts to parse the leading integer of the response as the score (the call is streamed
+       only until the number is complete).
     5. If parsing fails, defaults to a fallback score of 5.
 
     Returns:
@@ -233,14 +289,14 @@ def score_thought_with_openai(thought, criterion, section, model="gpt-3.5-turbo"
     Respond with a single number only, from 1 to 10.
     """
     messages = [{"role": "user", "content": prompt}]
-    response = call_openai_with_tracking(messages, model=model, temperature=0)
+    response = call_openai_with_tracking(messages, model=model, temperature=0, stream_until=score_complete)
 
     log_phase("\n🧠 Scoring Thought:")
     log_phase(f"→ {thought}")
     log_phase(f"📩 LLM Response: {response}")
 
     try:
-        score = int(response.strip())
+        score = parse_leading_score(response)
         log_phase(f"✅ Parsed Score: {score}/10")
         log_thought_score(thought, score)
         return score
@@ -0,0 +1,283 @@
+# job_queue.py – Persistent background job queue (SQLite) with a worker thread pool
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from src.utils.logging_utils import log_phase, logger
+
+# Queue settings (override via env vars)
+JOB_DB_PATH = os.getenv(
+    "JOB_DB_PATH",
+    str(Path(os.getenv("OUTPUT_DIR", "outputs")) / "cache" / "jobs.sqlite")
+)
+# Jobs share one process: the LLM/embedding cache stats and the embedding memory cache are
+# process-wide and reset at the start of each run, so concurrent jobs would clobber each other's
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "1"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # seconds between queue checks when idle
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+JOB_TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class JobQueue:
+    """
+    A durable FIFO of jobs stored in SQLite, executed by a pool of worker threads.
+
+    Purpose:
+    Long-running work (a multi-vendor evaluation takes minutes) is submitted as a job and runs
+    in the background, so API handlers return immediately and the event loop stays free. Jobs,
+    their progress and their results live in SQLite: a restarted server still answers status
+    queries, and jobs that were queued or interrupted mid-run are picked up again on start().
+
+    Parameters:
+    - path (str | Path): Location of the SQLite file. Parent folders are created on first use.
+    - handlers (dict): {kind: fn(payload, report_progress, emit_event) -> JSON-serialisable result}.
+      `report_progress(progress, message)` takes a 0–1 fraction and a short status message;
+      `emit_event(event)` appends a structured event (dict) to the job's event log, which the
+      API streams to clients. Status changes are logged as "job_status" events automatically.
+    - max_workers (int): Number of jobs executed concurrently.
+    - poll_interval (float): Idle workers re-check the queue this often (new submissions in
+      this process wake them immediately).
+    """
+
+    def __init__(self, path, handlers=None, max_workers=JOB_MAX_WORKERS, poll_interval=JOB_POLL_INTERVAL):
+        self.path = Path(path)
+        self.handlers = dict(handlers or {})
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._conn = None
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._workers = []
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                "progress REAL NOT NULL DEFAULT 0, message TEXT, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, type TEXT NOT NULL, "
+                "data TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job_seq ON job_events(job_id, seq)")
+            self._conn.commit()
+        return self._conn
+
+    # -------------------------------
+    # Submitting and querying
+    # -------------------------------
+
+    def submit(self, kind, payload):
+        """
+        Queues a job and returns its id. The payload must be JSON-serialisable.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, message, created_at) VALUES (?, ?, 'queued', ?, 'Queued', ?)",
+                (job_id, kind, json.dumps(payload), time.time())
+            )
+            self._insert_event(conn, job_id, {"type": "job_status", "status": "queued"})
+            conn.commit()
+        self._wake.set()
+        log_phase(f"📥 Queued {kind} job {job_id}")
+        return job_id
+
+    def get(self, job_id):
+        """
+        Returns the job's status record (without payload/result), or None for an unknown id.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT id, kind, status, progress, message, error, attempts, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_result(self, job_id):
+        """
+        Returns the decoded result of a succeeded job, or None if it has no result (yet).
+        """
+        with self._lock:
+            row = self._connect().execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["result"]) if row and row["result"] is not None else None
+
+    def update_progress(self, job_id, progress, message=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                (max(0.0, min(1.0, float(progress))), message, job_id)
+            )
+            conn.commit()
+
+    def _insert_event(self, conn, job_id, event):
+        event = {"job_id": job_id, "timestamp": time.time(), **event}
+        conn.execute(
+            "INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, event.get("type", "event"), json.dumps(event, default=str), event["timestamp"])
+        )
+
+    def add_event(self, job_id, event):
+        """
+        Appends a structured event (dict with a "type") to the job's event log.
+        """
+        with self._lock:
+            conn = self._connect()
+            self._insert_event(conn, job_id, event)
+            conn.commit()
+
+    def get_events(self, job_id, after_seq=0, limit=500):
+        """
+        Returns [(seq, event)] logged for the job after `after_seq`, oldest first. seq increases
+        monotonically, so clients resume a stream by passing the last seq they saw.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT seq, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, after_seq, limit)
+            ).fetchall()
+        return [(row["seq"], json.loads(row["data"])) for row in rows]
+
+    def counts(self):
+        """
+        Returns {status: job count}, e.g. for a health check.
+        """
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    # -------------------------------
+    # Execution
+    # -------------------------------
+
+    def _claim_next(self):
+        # Select + mark running in one write transaction, so two workers (or processes) never take the same job
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.commit()
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1, message = 'Started' WHERE id = ?",
+                (time.time(), row["id"])
+            )
+            self._insert_event(conn, row["id"], {"type": "job_status", "status": "running"})
+            conn.commit()
+        return row["id"], row["kind"], json.loads(row["payload"])
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "progress = CASE WHEN ? = 'succeeded' THEN 1.0 ELSE progress END, message = ? WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result, default=str) if result is not None else None,
+                    error,
+                    time.time(),
+                    status,
+                    "Completed" if status == "succeeded" else "Failed",
+                    job_id,
+                )
+            )
+            self._insert_event(conn, job_id, {"type": "job_status", "status": status, "error": error})
+            conn.commit()
+
+    def run_next(self):
+        """
+        Claims and executes one queued job in the calling thread. Returns the job id, or None if the queue is empty.
+        """
+        claimed = self._claim_next()
+        if claimed is None:
+            return None
+        job_id, kind, payload = claimed
+        log_phase(f"⚙️ Running {kind} job {job_id}")
+        try:
+            result = self.handlers[kind](
+                payload,
+                lambda progress, message=None: self.update_progress(job_id, progress, message),
+                lambda event: self.add_event(job_id, event)
+            )
+            self._finish(job_id, "succeeded", result=result)
+            log_phase(f"✅ Job {job_id} succeeded")
+        except Exception as e:
+            logger.error(f"❌ Job {job_id} failed: {e}\n{traceback.format_exc()}")
+            self._finish(job_id, "failed", error=str(e))
+        return job_id
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            if self.run_next() is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def requeue_interrupted(self):
+        """
+        Puts jobs left 'running' by a previous (crashed or restarted) server back on the queue.
+        """
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', message = 'Requeued after restart' WHERE status = 'running'"
+            )
+            conn.commit()
+        if cursor.rowcount:
+            log_phase(f"🔁 Requeued {cursor.rowcount} interrupted job(s)")
+        return cursor.rowcount
+
+    def start(self):
+        """
+        Requeues interrupted jobs and starts the worker threads (no-op if already started).
+        """
+        if self._workers:
+            return
+        self.requeue_interrupted()
+        self._stop.clear()
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        log_phase(f"🧵 Job queue started with {self.max_workers} worker(s) at {self.path}")
+
+    def stop(self, timeout=None):
+        """
+        Stops accepting new work and waits for running jobs to finish (up to `timeout` seconds per worker).
+        Jobs still running when the process exits are requeued by the next start().
+        """
+        self._stop.set()
+        self._wake.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -6,10 +6,99 @@ from src.server.proposal_eval import evaluate_proposal
 from src.utils.export_utils import export_proposal_report, save_markdown_and_pdf
 from src.server.final_eval_summary import generate_final_comparison_summary
 from src.utils.file_loader import parse_rfp_from_file
-from src.utils.logging_utils import log_phase, log_result, reset_dedup_stats
+import logging
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.logging_utils import log_phase, log_result, logger, snapshot_stats, merge_stats, run_context, get_run_context, emit_event, event_scope
 from src.utils.logging_reports import finalize_evaluation_run
+from src.models.llm_cache import reset_llm_cache_stats, get_llm_cache_stats, merge_llm_cache_stats
+from src.utils.thought_filtering import reset_embedding_cache, snapshot_embedding_cache_stats, merge_embedding_cache_stats
+from src.utils.checkpoint_store import get_checkpoint_store
 
-def run_multi_proposal_evaluation(proposals: Dict[str, str], rfp_file: str = None, rfp_criteria: List[str] = None, model="gpt-3.5-turbo") -> dict:
+# Vendors evaluated in parallel worker processes (1 = in-process, sequential)
+VENDOR_MAX_WORKERS = int(os.getenv("VENDOR_MAX_WORKERS", "1"))
+
+
+def _evaluate_vendor(vendor_name, proposal_text, rfp_criteria, model, outputs_dir, resume=False):
+    """
+    Evaluates one vendor and exports its report. Returns (evaluation dict, report file paths).
+    Results are always checkpointed; earlier results are only reused when resume=True.
+    """
+    log_phase(f"\n🚀 Evaluating {vendor_name}...")
+    executed_tools_global = set()
+    checkpoint_store = get_checkpoint_store(outputs_dir)
+    with event_scope(vendor=vendor_name):
+        emit_event("phase_start", phase="vendor")
+        try:
+            results, overall_score, swot_summary = evaluate_proposal(
+                proposal_text, rfp_criteria, model=model, executed_tools_global=executed_tools_global,
+                checkpoint=checkpoint_store.for_vendor(vendor_name) if checkpoint_store else None,
+                resume=resume
+            )
+        finally:
+            if checkpoint_store:
+                checkpoint_store.close()
+        file_paths = export_proposal_report(
+            vendor_name, results, overall_score, swot_summary, output_dir=outputs_dir
+        )
+        emit_event("phase_end", phase="vendor", overall_score=overall_score)
+    evaluation = {
+        "vendor_name": vendor_name,
+        "results": results,
+        "overall_score": overall_score,
+        "swot_summary": swot_summary
+    }
+    return evaluation, file_paths
+
+
+def _evaluate_vendor_in_worker(vendor_name, proposal_text, rfp_criteria, model, outputs_dir, event_queue=None, resume=False):
+    """
+    Worker-process entry point: runs _evaluate_vendor in its own RunContext with a per-vendor log
+    file, then returns the stats so the parent can merge them into the run report.
+    Progress events are put on `event_queue` (a multiprocessing queue) when the parent is listening.
+    """
+    reset_llm_cache_stats()
+    reset_embedding_cache()
+
+    safe_name = re.sub(r"[^\w.-]+", "_", vendor_name)
+    log_path = Path(outputs_dir) / "vendor_logs" / f"{safe_name}.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(log_path)
+    handler.setFormatter(logging.Formatter(f"[%(asctime)s] [%(levelname)s] [{vendor_name}] %(message)s", "%H:%M:%S"))
+    logger.addHandler(handler)
+    try:
+        with run_context(vendor_name, event_sink=event_queue.put if event_queue is not None else None):
+            evaluation, file_paths = _evaluate_vendor(vendor_name, proposal_text, rfp_criteria, model, outputs_dir, resume=resume)
+            logging_stats = snapshot_stats()
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    stats = {
+        "logging": logging_stats,
+        "llm_cache": get_llm_cache_stats(),
+        "embedding_cache": snapshot_embedding_cache_stats(),
+    }
+    return evaluation, file_paths, stats
+
+
+def _forward_events(event_queue, event_sink):
+    # Relays worker-process events to the parent run's sink until the None sentinel arrives
+    for event in iter(event_queue.get, None):
+        event_sink(event)
+
+
+def _merge_worker_stats(stats):
+    merge_stats(stats["logging"])
+    merge_llm_cache_stats(stats["llm_cache"])
+    merge_embedding_cache_stats(stats["embedding_cache"])
+
+
+def run_multi_proposal_evaluation(proposals: Dict[str, str], rfp_file: str = None, rfp_criteria: List[str] = None, model="gpt-3.5-turbo", max_workers: int = None, progress_callback=None, event_sink=None, run_id: str = None, resume: bool = False) -> dict:
     """
     Run evaluations for multiple vendor proposals against RFP criteria.
     Args:
@@ -17,9 +106,108 @@ def run_multi_proposal_evaluation(proposals: Dict[str, str], rfp_file: str = Non
         rfp_file (str): Path to the RFP file.
         rfp_criteria (List[str]): List of RFP criteria.
         model (str): Model name for evaluation.
+        max_workers (int): Vendors evaluated in parallel worker processes (default: VENDOR_MAX_WORKERS).
+            Each worker has its own logging/stats state (log file under vendor_logs/); stats are
+            merged back before the final summary and analytics report.
+        progress_callback (callable): Optional fn(progress, message) called as vendors complete,
+            with progress as a 0–1 fraction (used by the background job queue).
+        event_sink (callable): Optional fn(event dict) receiving structured progress events
+            (phase start/end, criterion scores, tokens used, ETA); see logging_utils.emit_event.
+        run_id (str): Id (and output folder name) of the run. Default: a new timestamped id with a random
+            suffix, so runs started in the same second never share a folder. A given run_id must not
+            exist yet unless resume=True.
+        resume (bool): Continue an existing run, reusing its checkpointed criteria and SWOT summaries
+            (set by resume_run). Fresh runs only write checkpoints, they never read them.
     Returns:
         dict: Dictionary containing evaluations, final summary text, and file paths.
+
+    Metrics for the run are collected in their own RunContext, so concurrent runs in one
+    process (e.g. two API requests) never mix their tool/OpenAI/dedup stats.
+
+    Every completed criterion result is checkpointed under the run's output folder; if the run
+    fails, resume_run(run_id) re-evaluates only the missing (vendor, criterion) pairs.
+    """
+    run_id = run_id or new_run_id()
+    if not resume and _run_output_dir(run_id).exists():
+        raise ValueError(f"Run '{run_id}' already exists; use resume_run('{run_id}') to continue it")
+    with run_context(run_id, event_sink=event_sink):
+        try:
+            return _run_multi_proposal_evaluation(run_id, proposals, rfp_file, rfp_criteria, model, max_workers, progress_callback, resume)
+        except Exception as e:
+            logger.error(f"❌ Run {run_id} failed: {e}. Completed criteria are checkpointed; continue with resume_run('{run_id}').")
+            raise
+
+
+def new_run_id():
     """
+    Returns a fresh run id: a timestamp plus a random suffix, so runs started in the same second never
+    share a folder. Callers that may need to resume the run later (queued jobs) pick it up front.
+    """
+    return f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def can_resume_run(run_id):
+    """
+    True when `run_id` has a checkpoint with recorded inputs, i.e. resume_run(run_id) can continue it.
+    """
+    checkpoint_store = get_checkpoint_store(_run_output_dir(run_id))
+    if checkpoint_store is None or not checkpoint_store.path.exists():
+        return False
+    try:
+        return checkpoint_store.load_run_inputs() is not None
+    finally:
+        checkpoint_store.close()
+
+
+def resume_run(run_id: str, model: str = None, max_workers: int = None, progress_callback=None, event_sink=None) -> dict:
+    """
+    Resumes a failed or interrupted run from its checkpoint.
+
+    The run's proposals, criteria and model are read from the checkpoint; criteria (and SWOT
+    summaries) completed by earlier attempts are reused, so only the missing work spends tokens.
+    Reports are regenerated in the run's original output folder. Returns the same dict as
+    run_multi_proposal_evaluation.
+    """
+    checkpoint_store = get_checkpoint_store(_run_output_dir(run_id))
+    if checkpoint_store is None or not checkpoint_store.path.exists():
+        raise ValueError(f"No checkpoint found for run '{run_id}'")
+    inputs = checkpoint_store.load_run_inputs()
+    if inputs is None:
+        raise ValueError(f"Checkpoint for run '{run_id}' has no recorded inputs")
+    done = checkpoint_store.completed_criteria()
+    checkpoint_store.close()
+    log_phase(f"🔁 Resuming run {run_id}: {len(done)} criterion result(s) already checkpointed")
+    return run_multi_proposal_evaluation(
+        proposals=inputs["proposals"],
+        rfp_criteria=inputs["rfp_criteria"],
+        model=model or inputs["model"],
+        max_workers=max_workers,
+        progress_callback=progress_callback,
+        event_sink=event_sink,
+        run_id=run_id,
+        resume=True,
+    )
+
+
+def _run_output_dir(run_id):
+    base_output = os.getenv("OUTPUT_DIR", "outputs")
+    return Path(base_output) / "proposal_eval_reports" / run_id
+
+
+def _run_multi_proposal_evaluation(run_id, proposals, rfp_file, rfp_criteria, model, max_workers, progress_callback, resume=False):
+    max_workers = max_workers or VENDOR_MAX_WORKERS
+    # One step per vendor plus the final summary/report step
+    total_steps = len(proposals) + 1
+    started_at = time.time()
+
+    def report_progress(done, message):
+        elapsed = time.time() - started_at
+        eta_seconds = round(elapsed / done * (total_steps - done), 1) if done else None
+        emit_event("progress", scope="run", completed=done, total=total_steps, eta_seconds=eta_seconds, message=message)
+        if progress_callback:
+            progress_callback(done / total_steps, message)
+
+    rfp_info = {"criteria": rfp_criteria, "path": rfp_file}
     # Load RFP criteria from file if provided
     if rfp_file:
         log_phase(f"📄 Loading RFP from {rfp_file}...")
@@ -33,52 +221,95 @@ def run_multi_proposal_evaluation(proposals: Dict[str, str], rfp_file: str = Non
     assert rfp_criteria, "No RFP criteria provided or extracted."
 
     # Prepare output folders
-    run_id = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    base_output = os.getenv("OUTPUT_DIR", "outputs")
-    outputs_dir = Path(base_output) / "proposal_eval_reports" / run_id  
+    outputs_dir = _run_output_dir(run_id)
     outputs_dir.mkdir(parents=True, exist_ok=True)
 
-    all_vendor_evaluations = []
-    proposal_reports = {}
-    reset_dedup_stats()
+    # Record the inputs so a failed run can be resumed by id alone
+    checkpoint_store = get_checkpoint_store(outputs_dir)
+    if checkpoint_store:
+        checkpoint_store.save_run_inputs({"proposals": proposals, "rfp_criteria": rfp_criteria, "model": model, "rfp_file": rfp_file})
+        checkpoint_store.set_status("running")
+
+    try:
+        all_vendor_evaluations = []
+        proposal_reports = {}
+        emit_event("phase_start", phase="run", vendors=sorted(proposals), criteria=[c["name"] if isinstance(c, dict) else c for c in rfp_criteria])
+        report_progress(0, f"Evaluating {len(proposals)} proposal(s)")
+        reset_llm_cache_stats()
+        reset_embedding_cache()  # per-run memory layer; the persistent embedding store is kept
 
-    for vendor_name, proposal_text in sorted(proposals.items()):
-        log_phase(f"\n🚀 Evaluating {vendor_name}...")
-        executed_tools_global = set()
-        results, overall_score, swot_summary = evaluate_proposal(
-            proposal_text, rfp_criteria, model=model, executed_tools_global=executed_tools_global
+        vendors = sorted(proposals.items())
+        if max_workers > 1 and len(vendors) > 1:
+            log_phase(f"⚡ Evaluating {len(vendors)} vendors in {min(max_workers, len(vendors))} worker processes")
+            # "spawn" gives each worker a clean interpreter: no inherited locks, clients or stats
+            mp_context = multiprocessing.get_context("spawn")
+            event_sink = get_run_context().event_sink
+            manager = event_queue = forwarder = None
+            if event_sink is not None:  # workers can't call the sink directly; relay their events through a queue
+                manager = mp_context.Manager()
+                event_queue = manager.Queue()
+                forwarder = threading.Thread(target=_forward_events, args=(event_queue, event_sink), daemon=True)
+                forwarder.start()
+            try:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(vendors)), mp_context=mp_context) as executor:
+                    futures = [
+                        executor.submit(_evaluate_vendor_in_worker, vendor_name, proposal_text, rfp_criteria, model, outputs_dir, event_queue, resume)
+                        for vendor_name, proposal_text in vendors
+                    ]
+                    for future in futures:  # collect in vendor order
+                        evaluation, file_paths, stats = future.result()
+                        _merge_worker_stats(stats)
+                        proposal_reports[evaluation["vendor_name"]] = file_paths
+                        all_vendor_evaluations.append(evaluation)
+                        log_phase(f"✅ Merged results for {evaluation['vendor_name']}")
+                        report_progress(len(all_vendor_evaluations), f"Evaluated {evaluation['vendor_name']}")
+            finally:
+                if forwarder is not None:
+                    event_queue.put(None)
+                    forwarder.join()
+                    manager.shutdown()
+        else:
+            for vendor_name, proposal_text in vendors:
+                evaluation, file_paths = _evaluate_vendor(vendor_name, proposal_text, rfp_criteria, model, outputs_dir, resume=resume)
+                proposal_reports[vendor_name] = file_paths
+                all_vendor_evaluations.append(evaluation)
+                report_progress(len(all_vendor_evaluations), f"Evaluated {vendor_name}")
+
+        emit_event("phase_start", phase="summary")
+        final_summary_text, score_table_md = generate_final_comparison_summary(all_vendor_evaluations, model=model)
+        final_summary_paths = save_markdown_and_pdf(
+            markdown_text=final_summary_text,
+            additional_md=score_table_md,
+            filename="final_summary_report",
+            output_dir=outputs_dir
         )
-        file_paths = export_proposal_report(
-            vendor_name, results, overall_score, swot_summary, output_dir=outputs_dir
+
+        # Log analytics report
+        all_results = [r for vendor in all_vendor_evaluations for r in vendor["results"]]
+        log_report_path = finalize_evaluation_run(output_dir=outputs_dir, run_id=run_id, results=all_results)
+        emit_event("phase_end", phase="summary")
+        if checkpoint_store:
+            checkpoint_store.set_status("completed")
+        emit_event(
+            "phase_end", phase="run", elapsed_seconds=round(time.time() - started_at, 1),
+            overall_scores={e["vendor_name"]: e["overall_score"] for e in all_vendor_evaluations}
         )
-        proposal_reports[vendor_name] = file_paths
-        all_vendor_evaluations.append({
-            "vendor_name": vendor_name,
-            "results": results,
-            "overall_score": overall_score,
-            "swot_summary": swot_summary
-        })
-
-    final_summary_text, score_table_md = generate_final_comparison_summary(all_vendor_evaluations, model=model)
-    final_summary_paths = save_markdown_and_pdf(
-        markdown_text=final_summary_text,
-        additional_md=score_table_md,
-        filename="final_summary_report",
-        output_dir=outputs_dir
-    )
 
-    # Log analytics report
-    all_results = [r for vendor in all_vendor_evaluations for r in vendor["results"]]
-    log_report_path= finalize_evaluation_run(results=all_results)
-
-    return {
-        "run_id": run_id,
-        "rfp_info": rfp_info,
-        "evaluations": all_vendor_evaluations,
-        "final_summary_text": final_summary_text,
-        "file_paths": {
-            "proposal_reports": proposal_reports,
-            "final_summary": final_summary_paths,
-            "log_summary": log_report_path
+        return {
+            "run_id": run_id,
+            "rfp_info": rfp_info,
+            "evaluations": all_vendor_evaluations,
+            "final_summary_text": final_summary_text,
+            "file_paths": {
+                "proposal_reports": proposal_reports,
+                "final_summary": final_summary_paths,
+                "log_summary": log_report_path
+            }
         }
-    }
+    except Exception:
+        if checkpoint_store:
+            checkpoint_store.set_status("failed")  # resume_run() can continue it
+        raise
+    finally:
+        if checkpoint_store:
+            checkpoint_store.close()
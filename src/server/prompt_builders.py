@@ -4,6 +4,10 @@
 from src.utils.text_processing import map_section_to_canonical
 from src.utils.tools.tool_catalog import tool_catalog, tool_priority_map, global_tools, criterion_tool_map
 from src.utils.tools.tool_catalog_RFP import tool_catalog
+from src.utils.prompt_packer import TOOL_PROMPT_TOKEN_BUDGET, KEEP, SUMMARIZE, pack_prompt, segment
+from src.utils.paragraph_index import TOOL_CONTEXT_TOP_K
+from src.utils.file_loader import get_proposal_paragraph_index
+from src.utils.logging_utils import log_phase
 
 def build_review_prompt(report_text, history=[]):
     """
@@ -164,13 +168,43 @@ Respond with only the tool name and input, like:
     return [{"role": "user", "content": prompt}]
 
 
-def build_dual_context_prompt(instruction: str, agent) -> str:
-    return (
-        f"{instruction}\n\n"
-        f"--- Section (Vendor Response) ---\n{agent.section_text}\n\n"
-        f"--- Full Proposal (Context) ---\n{agent.full_proposal_text}\n\n"
-        f"Explain your reasoning based on best practices.\n"
-    )
+def _retrieve_tool_context(queries, agent):
+    """
+    The TOOL_CONTEXT_TOP_K proposal paragraphs most relevant to a tool's instructions and query
+    (per query when several checks share one prompt), or None when the full proposal should be
+    sent (short proposal, retrieval disabled or failed).
+    """
+    proposal_text = getattr(agent, "full_proposal_text", None)
+    if not TOOL_CONTEXT_TOP_K or not isinstance(proposal_text, str) or not proposal_text.strip():
+        return None
+    try:
+        index = get_proposal_paragraph_index(proposal_text)
+        if len(index) <= TOOL_CONTEXT_TOP_K:
+            return None
+        section_text = agent.section_text if isinstance(agent.section_text, str) else ""
+        return index.excerpts(queries, k=TOOL_CONTEXT_TOP_K, exclude_text=section_text)
+    except Exception as e:
+        log_phase(f"⚠️ Tool context retrieval failed, sending the full proposal: {e}")
+        return None
+
+
+def build_dual_context_prompt(instruction: str, agent, retrieval_queries=None, budget=None, label="tool prompt") -> str:
+    # Context is the proposal paragraphs retrieved for this tool call (full proposal as fallback),
+    # packed to `budget` tokens (default TOOL_PROMPT_TOKEN_BUDGET) with the context shrunk first.
+    # retrieval_queries: one query per fused check (default: the instruction itself)
+    excerpts = _retrieve_tool_context(retrieval_queries or instruction, agent)
+    if excerpts is None:
+        context = segment("full_proposal", agent.full_proposal_text, priority=0, shrink=SUMMARIZE,
+                          prefix="--- Full Proposal (Context) ---\n", suffix="\n\n")
+    else:
+        context = segment("proposal_excerpts", excerpts, priority=0,
+                          prefix="--- Relevant Proposal Excerpts (Context) ---\n", suffix="\n\n")
+    return pack_prompt([
+        segment("instruction", f"{instruction}\n\n", shrink=KEEP),
+        segment("section", agent.section_text, priority=1, prefix="--- Section (Vendor Response) ---\n", suffix="\n\n"),
+        context,
+        segment("closing", "Explain your reasoning based on best practices.\n", shrink=KEEP),
+    ], TOOL_PROMPT_TOKEN_BUDGET if budget is None else budget, label=label)
 
 
 def build_section_context_prompt(instruction: str, agent) -> str:
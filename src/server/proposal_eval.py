@@ -7,16 +7,35 @@ from src.models.openai_interface import call_openai_with_tracking
 from src.utils.tools.tool_catalog_RFP import tool_catalog
 from src.utils.tools.tool_dispatch import TOOL_FUNCTION_MAP
 import uuid
+import os
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.file_loader import preprocess_proposal_for_criteria_with_threshold
-from src.utils.logging_utils import log_phase, log_result, print_tool_stats
+from src.utils.logging_utils import log_phase, log_result, print_tool_stats, emit_event, event_scope
 import json
 from src.utils.tools.tool_analysis import get_relevant_tools
 from src.utils.tools.tools_general import extract_tool_name
-from src.utils.thought_filtering import reset_embedding_cache
+from src.utils.thought_filtering import ThoughtIndex
 
-def evaluate_proposal(proposal_text, rfp_criteria, model="gpt-3.5-turbo", executed_tools_global=None):
+# Criteria evaluated concurrently per proposal (1 = sequential). The work is network-bound (OpenAI calls).
+CRITERIA_MAX_WORKERS = int(os.getenv("CRITERIA_MAX_WORKERS", "1"))
+
+
+def evaluate_proposal(proposal_text, rfp_criteria, model="gpt-3.5-turbo", executed_tools_global=None, max_workers=None, checkpoint=None, resume=False):
+    """
+    Evaluates a proposal against every RFP criterion and summarizes it as a SWOT.
+
+    With max_workers > 1 (default: CRITERIA_MAX_WORKERS), criteria run in a thread pool. They share
+    the thought-dedup history (ThoughtIndex, locked) and executed_tools_global (claimed atomically),
+    and results are always returned in criterion order.
+
+    With a checkpoint (checkpoint_store.VendorCheckpoint), each criterion result and the SWOT are
+    saved as soon as they complete. Only with resume=True are ones saved by an earlier attempt reused.
+    """
     executed_tools_global = executed_tools_global
-    reset_embedding_cache()  # Clear cache at the beginning of each evaluation
+    max_workers = max_workers or CRITERIA_MAX_WORKERS
 
     matched_sections = preprocess_proposal_for_criteria_with_threshold(
         proposal_text=proposal_text,
@@ -25,30 +44,66 @@ def evaluate_proposal(proposal_text, rfp_criteria, model="gpt-3.5-turbo", execut
     )
     log_phase("✅ Proposal preprocessed = parse content by criteria.")
 
-    results = []
     seen_thoughts = []
-    seen_embeddings = []
+    seen_embeddings = ThoughtIndex()  # shared near-duplicate index across all criteria
+    tool_embeddings = build_tool_embeddings(tool_catalog)  # built once, shared by every criterion
+
+    started_at = time.time()
+    completed = []  # criteria finished so far (for progress/ETA events)
+    completed_lock = threading.Lock()
+    emit_event("phase_start", phase="proposal", criteria_total=len(rfp_criteria))
 
-    for criterion_dict in rfp_criteria:
+    def evaluate_criterion(criterion_dict):
         criterion = criterion_dict["name"]
         section_text = matched_sections.get(criterion, "")
-        log_phase(f"\n📌 Evaluating criterion: {criterion}")
-
-        result = evaluate_single_criterion(
-            criterion=criterion,
-            section_text=section_text,
-            proposal_text=proposal_text,
-            model=model,
-            seen_thoughts=seen_thoughts,
-            seen_embeddings=seen_embeddings,
-            executed_tools_global=executed_tools_global
-        )
+        saved = checkpoint.get(criterion) if checkpoint and resume else None
+        if saved is not None:
+            log_phase(f"\n⏭️ Reusing checkpointed result for criterion: {criterion}")
+            result = saved
+            with event_scope(criterion=criterion):
+                emit_event("criterion_scored", score=result["proposal_score"], explanation=result["proposal_explanation"], resumed=True)
+        else:
+            log_phase(f"\n📌 Evaluating criterion: {criterion}")
+            result = evaluate_single_criterion(
+                criterion=criterion,
+                section_text=section_text,
+                proposal_text=proposal_text,
+                model=model,
+                seen_thoughts=seen_thoughts,
+                seen_embeddings=seen_embeddings,
+                executed_tools_global=executed_tools_global,
+                tool_embeddings=tool_embeddings
+            )
+            if checkpoint:
+                checkpoint.save(criterion, result)
+        with completed_lock:
+            completed.append(criterion)
+            done = len(completed)
+        # Criteria take similar time, so the average so far extrapolates to the rest
+        eta_seconds = round((time.time() - started_at) / done * (len(rfp_criteria) - done), 1)
+        emit_event("progress", scope="criteria", completed=done, total=len(rfp_criteria), eta_seconds=eta_seconds, message=f"Scored {criterion}")
+        return result
 
-        results.append(result)
+    if max_workers > 1 and len(rfp_criteria) > 1:
+        log_phase(f"⚡ Evaluating {len(rfp_criteria)} criteria with {max_workers} workers")
+        # Each task runs in a copy of the caller's context, so its metrics land in the same RunContext
+        contexts = [contextvars.copy_context() for _ in rfp_criteria]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(rfp_criteria))) as executor:
+            results = list(executor.map(  # map keeps criterion order
+                lambda ctx, criterion_dict: ctx.run(evaluate_criterion, criterion_dict), contexts, rfp_criteria
+            ))
+    else:
+        results = [evaluate_criterion(criterion_dict) for criterion_dict in rfp_criteria]
 
     overall_score = round(sum(r["proposal_score"] for r in results) / len(results), 2)
     log_phase(f"\n✅ Overall score: {overall_score}/10")
 
+    saved_summary = checkpoint.get_summary() if checkpoint and resume else None
+    if saved_summary is not None:
+        log_phase("⏭️ Reusing checkpointed SWOT summary")
+        emit_event("phase_end", phase="proposal", overall_score=overall_score, elapsed_seconds=round(time.time() - started_at, 1), resumed=True)
+        return results, overall_score, saved_summary[1]
+
     eval_summary = ''.join(
         f"- {r['criterion']}: Score {r['proposal_score']}/10 – {r['proposal_explanation']}\n"
         for r in results
@@ -63,11 +118,25 @@ Generate a SWOT assessment (Strengths, Weaknesses, Opportunities, Threats) for t
 """
     messages = [{"role": "user", "content": swot_prompt}]
     swot_summary = call_openai_with_tracking(messages, model=model)
+    if checkpoint:
+        checkpoint.save_summary(overall_score, swot_summary)
+    emit_event("phase_end", phase="proposal", overall_score=overall_score, elapsed_seconds=round(time.time() - started_at, 1))
 
     return results, overall_score, swot_summary
 
 
-def evaluate_single_criterion(criterion, section_text, proposal_text, model, seen_thoughts, seen_embeddings, executed_tools_global):
+def evaluate_single_criterion(criterion, section_text, proposal_text, model, seen_thoughts, seen_embeddings, executed_tools_global, tool_embeddings=None):
+    # Events from this criterion (incl. the ToT agent's) are tagged with its name
+    with event_scope(criterion=criterion):
+        emit_event("phase_start", phase="criterion")
+        result = _evaluate_single_criterion(
+            criterion, section_text, proposal_text, model, seen_thoughts, seen_embeddings, executed_tools_global, tool_embeddings
+        )
+        emit_event("criterion_scored", score=result["proposal_score"], explanation=result["proposal_explanation"])
+    return result
+
+
+def _evaluate_single_criterion(criterion, section_text, proposal_text, model, seen_thoughts, seen_embeddings, executed_tools_global, tool_embeddings):
     # Your current block of logic for evaluating a single criterion goes here
     # Including: ToT, ReAct, auto tools, scoring, reasoning trace, etc.
 
@@ -95,7 +164,8 @@ def evaluate_single_criterion(criterion, section_text, proposal_text, model, see
     # Step 2–4: Run ReAct loop using ToT thoughts and embedding-aware tool selection
     react_agent = ReActConsultantAgent(section_name=criterion, section_text=section_text, proposal_text=proposal_text)
     report_sections = {"Proposal": proposal_text}
-    tool_embeddings = build_tool_embeddings(tool_catalog)
+    if tool_embeddings is None:
+        tool_embeddings = build_tool_embeddings(tool_catalog)
     log_phase(f"Running ReAct loop for criterion '{criterion}' with tool embeddings.")
     tool_history = run_react_loop_for_rfp_eval(
         agent=react_agent,
@@ -1,7 +1,8 @@
 # react_agent.py - Core class + reasoning loops
 
+import os
 import re
-from src.models.openai_interface import call_openai_with_tracking
+from src.models.openai_interface import call_openai_with_tracking, call_openai_with_tools
 from src.models.section_tools_llm import auto_fill_gaps_with_research, check_recommendation_alignment, check_summary_support, evaluate_smart_goals, generate_final_summary, should_cite, upgrade_section_with_research
 from src.server.prompt_builders import build_tool_hints, format_tool_catalog_for_prompt
 from src.models.scoring import summarize_and_score_section
@@ -71,6 +72,7 @@ from src.utils.tools.tools_RFP_fit import (
 )
 
 from src.utils.tools.tool_dispatch import TOOL_FUNCTION_MAP
+from src.utils.tools.tool_schemas import CONTROL_ACTIONS, build_react_tool_schemas, parse_react_tool_call, format_action
 from src.utils.logging_utils import (
     log_phase, 
     log_tool_used, 
@@ -79,10 +81,21 @@ from src.utils.logging_utils import (
     log_deduplication
 )
 import time
-from src.utils.thought_filtering import filter_redundant_thoughts
+import threading
+from src.utils.thought_filtering import filter_and_record_thoughts, ThoughtIndex
 from src.utils.tools.tool_analysis import get_relevant_tools
 from src.utils.logging_utils import log_phase, log_tool_failed, log_tool_skipped
 from src.utils.tools.tools_general import summarize_to_query, extract_tool_name
+from src.utils.tools.fused_checks import FUSED_CHECKS_ENABLED, FUSED_CHECKS_MAX_TOOLS, is_fusible_check, run_fused_checks
+from src.utils.prompt_packer import REACT_PROMPT_TOKEN_BUDGET, KEEP, SUMMARIZE, TAIL, cached_static_segment, pack_prompt, segment
+
+# ReAct steps for RFP evaluation via function calling (validated JSON) instead of "Thought:/Action:" text
+REACT_STRUCTURED_OUTPUT = os.getenv("REACT_STRUCTURED_OUTPUT", "false").lower() in ("1", "true", "yes")
+
+# Text-mode ReAct steps: cut the completion before the model invents its own observation,
+# and stream so the request ends as soon as the action line is complete (see react_step_complete)
+REACT_STOP_SEQUENCES = ["\nObservation:"]
+REACT_STREAM_EARLY_EXIT = os.getenv("REACT_STREAM_EARLY_EXIT", "true").lower() not in ("0", "false", "no")
 
 class ReActConsultantAgent:
     """
@@ -204,7 +217,7 @@ class ReActConsultantAgent:
             return [{"role": "user", "content": base_prompt}]
     
     
-    def build_react_prompt_forRFPeval(self, criterion, section_text, full_proposal_text, thoughts=None, tool_embeddings=None):
+    def build_react_prompt_forRFPeval(self, criterion, section_text, full_proposal_text, thoughts=None, tool_embeddings=None, structured=False):
         """
         Builds a ReAct-style prompt for evaluating a vendor proposal using a specific RFP criterion.
 
@@ -213,6 +226,8 @@ class ReActConsultantAgent:
             proposal_text (str): Full proposal text (or relevant excerpt).
             thoughts (list): Top thoughts generated from Tree of Thought (optional).
             tool_embeddings (dict): Cached embeddings for tool catalog (required).
+            structured (bool): Prompt for a function call (tools passed to the API) instead of
+                "Thought:/Action:" text; the tool list is then carried by the function schemas.
         """
         self.section_name = criterion
         self.section_text = section_text
@@ -229,36 +244,60 @@ class ReActConsultantAgent:
         else:
             tool_hint_text = "None. Pick from Available Tools below."
 
-        # Build the base prompt
+        # Build the prompt from prioritized segments so it stays within REACT_PROMPT_TOKEN_BUDGET
         thoughts_text = "\n".join(thoughts) if thoughts else "[Start your own reasoning]"
-        base_prompt = (
-                f"You are a technology advisor evaluating a vendor proposal against the following RFP criterion:\n"
-                f"**{criterion}**\n\n"
-                f"The client cares about cost-effectiveness, performance, security, trust, and ease of implementation.\n\n"
-                f"Based on the proposal content below, begin your evaluation with a short thought and then choose an action.\n"
-                f"Use the tool that best supports your analysis.\n\n"
-                f"💡 Thoughts to consider:\n{thoughts_text}\n\n"
-                f"🛠️ Format your response like this:\n"
-                f"Thought: <your thought>\n"
-                f"Action: <one of the tools below>\n\n"
-                f"⭐ Recommended tools for this task:\n{tool_hint_text}\n\n"
-                f"🧰 Available tools (pick one exactly as shown):\n{format_tool_catalog_for_prompt(tool_catalog)}\n\n"
-                f"⚠️ Rules:\n"
-                f"- DO NOT invent or explain actions.\n"
-                f"- ONLY choose one tool from the list above.\n"
-                f"- If no tool fits, use: `summarize`, `ask_question`, or `tool_help`.\n"
-                f"- DO NOT output anything else.\n\n"
-                f"📄 Section relevant to this criterion:\n{self.section_text}\n\n"
-                f"📄 Full Proposal Text:\n{self.full_proposal_text}\n\n"
-            )
-
-        base_prompt += "Previous Thoughts, Actions & Observations:\n"
-        for step in self.history:
-            base_prompt += f"Thought: {step['thought']}\n"
-            base_prompt += f"Action: {step['action']}\n"
-            base_prompt += f"Observation: {step['observation']}\n\n"
-
-        base_prompt += "What is your next Thought and Action?"
+        header = (
+            f"You are a technology advisor evaluating a vendor proposal against the following RFP criterion:\n"
+            f"**{criterion}**\n\n"
+            f"The client cares about cost-effectiveness, performance, security, trust, and ease of implementation.\n\n"
+        )
+        history_text = "".join(
+            f"Thought: {step['thought']}\nAction: {step['action']}\nObservation: {step['observation']}\n\n"
+            for step in self.history
+        )
+        if structured:
+            segments = [
+                segment("instructions", header + (
+                    f"Take one evaluation step: call exactly one of the provided functions, with your reasoning in its `thought` argument.\n"
+                    f"Call `summarize` when you have enough evidence.\n\n"
+                ), shrink=KEEP),
+                segment("thoughts", thoughts_text, priority=3, prefix="💡 Thoughts to consider:\n", suffix="\n\n"),
+                segment("tool_hints", tool_hint_text, priority=2, prefix="⭐ Recommended tools for this task:\n", suffix="\n\n"),
+            ]
+        else:
+            segments = [
+                segment("instructions", header + (
+                    f"Based on the proposal content below, begin your evaluation with a short thought and then choose an action.\n"
+                    f"Use the tool that best supports your analysis.\n\n"
+                ), shrink=KEEP),
+                segment("thoughts", thoughts_text, priority=3, prefix="💡 Thoughts to consider:\n", suffix="\n\n"),
+                segment("format", (
+                    f"🛠️ Format your response like this:\n"
+                    f"Thought: <your thought>\n"
+                    f"Action: <one of the tools below>\n\n"
+                ), shrink=KEEP),
+                segment("tool_hints", tool_hint_text, priority=2, prefix="⭐ Recommended tools for this task:\n", suffix="\n\n"),
+                segment(
+                    "tool_catalog",
+                    cached_static_segment("rfp_tool_catalog", lambda: format_tool_catalog_for_prompt(tool_catalog)),
+                    priority=1, prefix="🧰 Available tools (pick one exactly as shown):\n", suffix="\n\n"
+                ),
+                segment("rules", (
+                    f"⚠️ Rules:\n"
+                    f"- DO NOT invent or explain actions.\n"
+                    f"- ONLY choose one tool from the list above.\n"
+                    f"- If no tool fits, use: `summarize`, `ask_question`, or `tool_help`.\n"
+                    f"- DO NOT output anything else.\n\n"
+                ), shrink=KEEP),
+            ]
+        segments += [
+            segment("section", self.section_text, priority=5, prefix="📄 Section relevant to this criterion:\n", suffix="\n\n"),
+            segment("full_proposal", self.full_proposal_text, priority=0, shrink=SUMMARIZE,
+                    prefix="📄 Full Proposal Text:\n", suffix="\n\n"),
+            segment("history", history_text, priority=4, shrink=TAIL, prefix="Previous Thoughts, Actions & Observations:\n"),
+            segment("question", "What is your next step? Call one function." if structured else "What is your next Thought and Action?", shrink=KEEP),
+        ]
+        base_prompt = pack_prompt(segments, REACT_PROMPT_TOKEN_BUDGET, label=f"ReAct prompt ({criterion})")
 
         return [{"role": "user", "content": base_prompt}]
 
@@ -295,17 +334,16 @@ def run_react_loop_check_withTool(agent, max_steps=5, report_sections=None, exec
 
     for step_num in range(max_steps):
         messages = agent.build_react_prompt_withTools()
-        response = call_openai_with_tracking(messages, model=agent.model, temperature=agent.temperature)
+        response = call_openai_with_tracking(messages, model=agent.model, temperature=agent.temperature,
+                                             **react_step_call_options())
 
         # Parse response
         try:
-            lines = response.strip().split("\n")
-            thought = next(line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("thought"))
-            action = next(line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("action"))
+            thought, action = parse_thought_action(response)
             # Log tool usage
             if hasattr(agent, "tool_usage"):
                 agent.tool_usage[action] = agent.tool_usage.get(action, 0) + 1
-        except:
+        except ValueError:
             log_phase("⚠️ Failed to parse model response.")
             break
 
@@ -377,6 +415,27 @@ def run_single_react_step(agent, thought, action, step_num=0):
     return observation
 
 
+# Guards check-and-mark on executed_tools_global when criteria run in parallel
+_executed_tools_lock = threading.Lock()
+
+
+def claim_tool_execution(executed_tools_global, tool_name):
+    """
+    Atomically marks `tool_name` as executed. Returns False if another step already claimed it.
+    """
+    with _executed_tools_lock:
+        if tool_name in executed_tools_global:
+            return False
+        executed_tools_global.add(tool_name)
+        return True
+
+
+def release_tool_execution(executed_tools_global, tool_name):
+    # Undo a claim when the tool call failed, so a later step may retry it
+    with _executed_tools_lock:
+        executed_tools_global.discard(tool_name)
+
+
 def dispatch_tool_action(
         agent, 
         action, 
@@ -398,27 +457,53 @@ def dispatch_tool_action(
         str: Result from the tool or error message.
     """
     log_phase(f"🛠️ Tool action: {action}")
-    tool_map = tool_map or TOOL_FUNCTION_MAP
-    executed_tools_global = executed_tools_global or set()
-
-    try:
-        # Parse action string like tool_name["input string"]
-        match = re.match(r'^([a-zA-Z0-9_]+)(\["(.*)"\])?$', action)
-        if not match:
-            log_tool_failed("unknown_tool", f"Could not parse tool action: {action}")
-            return f"⚠️ Could not parse tool action: {action}"
 
-        tool_name = match.group(1)
-        input_arg = match.group(3) if match.group(2) else None
+    # Parse action string like tool_name["input string"]
+    match = re.match(r'^([a-zA-Z0-9_]+)(\["(.*)"\])?$', action)
+    if not match:
+        log_tool_failed("unknown_tool", f"Could not parse tool action: {action}")
+        return f"⚠️ Could not parse tool action: {action}"
+
+    tool_name = match.group(1)
+    input_arg = match.group(3) if match.group(2) else None
+    return dispatch_tool_call(
+        agent,
+        tool_name,
+        input_arg,
+        tool_map=tool_map,
+        raise_errors=raise_errors,
+        executed_tools_global=executed_tools_global)
+
+
+def dispatch_tool_call(
+        agent,
+        tool_name,
+        input_arg=None,
+        tool_map=None,
+        raise_errors=False,
+        executed_tools_global=None):
+    """
+    Executes a registered tool with an already-parsed argument (structured ReAct steps call this
+    directly; dispatch_tool_action() parses an action string first).
 
-        if tool_name in executed_tools_global:
-            log_tool_skipped(tool_name, f"⚠️ Tool '{tool_name}' already executed for this proposal. Skipping duplicate call.")
-            return f"⚠️ Tool '{tool_name}' already executed for this proposal. Skipping duplicate call."
+    Returns:
+        str: Result from the tool or error message.
+    """
+    tool_map = tool_map or TOOL_FUNCTION_MAP
+    executed_tools_global = executed_tools_global if executed_tools_global is not None else set()
+    claimed = False
 
+    try:
         if tool_name not in tool_map:
             log_tool_failed(tool_name, f"Tool '{tool_name}' not recognized.")
             return f"⚠️ Tool '{tool_name}' not recognized in TOOL_FUNCTION_MAP."
 
+        # Claim before running (not after) so parallel criteria never run the same tool twice
+        claimed = claim_tool_execution(executed_tools_global, tool_name)
+        if not claimed:
+            log_tool_skipped(tool_name, f"⚠️ Tool '{tool_name}' already executed for this proposal. Skipping duplicate call.")
+            return f"⚠️ Tool '{tool_name}' already executed for this proposal. Skipping duplicate call."
+
         tool_entry = tool_map[tool_name]
         tool_fn = tool_entry["fn"]
         arg_spec = tool_entry.get("args", [])
@@ -439,15 +524,66 @@ def dispatch_tool_action(
         else:
             raise ValueError(f"Unsupported arg spec for tool '{tool_name}': {arg_spec}")
 
-        executed_tools_global.add(tool_name)  # ✅ Mark as executed
-        return result
+        return result  # ✅ Already marked as executed by the claim above
     except Exception as e:
+        if claimed:
+            release_tool_execution(executed_tools_global, tool_name)
         log_tool_failed(tool_name, f"{tool_name} dispatch failed: {e}")
         if raise_errors:
             raise
         return f"⚠️ Tool execution error: {e}"
 
 
+def dispatch_fused_checks(agent, checks, tool_map=None, executed_tools_global=None):
+    """
+    Runs compatible dual-context checks (see fused_checks.dual_context_check) in groups of up to
+    FUSED_CHECKS_MAX_TOOLS, one LLM call per group, instead of one call per tool.
+
+    Parameters:
+        checks (list): [(tool_name, input_arg)] in the order the caller wants them run.
+
+    Returns:
+        dict: {tool_name: result} for the checks answered by a fused call. Those tools are claimed in
+        executed_tools_global; tools that are not fusible, were already claimed, or got no answer are
+        left for the caller to dispatch individually.
+    """
+    tool_map = tool_map or TOOL_FUNCTION_MAP
+    executed_tools_global = executed_tools_global if executed_tools_global is not None else set()
+
+    fusible = [
+        (name, input_arg) for name, input_arg in checks
+        if name in tool_map and is_fusible_check(tool_map[name]["fn"])
+    ]
+    if len(fusible) < 2:
+        return {}
+    claimed = [(name, input_arg) for name, input_arg in fusible if claim_tool_execution(executed_tools_global, name)]
+
+    results = {}
+    size = max(2, FUSED_CHECKS_MAX_TOOLS)
+    for start in range(0, len(claimed), size):
+        group = claimed[start:start + size]
+        if len(group) < 2:
+            release_tool_execution(executed_tools_global, group[0][0])  # a single check gains nothing from fusing
+            continue
+
+        names = [name for name, _ in group]
+        log_phase(f"🧩 Running fused checks in one call: {', '.join(names)}")
+        try:
+            answers = run_fused_checks(agent, [(name, tool_map[name]["fn"], input_arg) for name, input_arg in group])
+        except Exception as e:
+            log_phase(f"⚠️ Fused checks failed, running them individually: {e}")
+            answers = {}
+
+        for name, input_arg in group:
+            if name in answers:
+                log_tool_used(name)
+                log_tool_execution(name, tool_map[name]["fn"], input_arg, agent)
+                results[name] = answers[name]
+            else:
+                release_tool_execution(executed_tools_global, name)
+    return results
+
+
 def select_best_tool_with_llm(agent, criterion, top_thoughts, model="gpt-3.5-turbo"):
     messages = build_tool_selection_prompt_rfpeval(agent, criterion, top_thoughts)
     response = call_openai_with_tracking(messages, model=model, temperature=0)
@@ -467,7 +603,8 @@ def run_react_loop_for_rfp_eval(
         max_steps=4,
         seen_thoughts=None,
         seen_embeddings=None,
-        executed_tools_global=None):
+        executed_tools_global=None,
+        structured=None):
     """
     Runs a ReAct loop for RFP evaluation using the new embedding-based prompt builder.
 
@@ -478,13 +615,20 @@ def run_react_loop_for_rfp_eval(
         thoughts (list): Tree of Thought-generated reasoning paths (optional).
         tool_embeddings (dict): Cached tool embeddings.
         max_steps (int): Number of ReAct iterations to run.
+        structured (bool): Use function calling (default: REACT_STRUCTURED_OUTPUT). Each step is then
+            a validated {thought, tool, args} call built from TOOL_FUNCTION_MAP's schemas and is
+            dispatched without re-parsing an action string. An invalid call is re-asked once with the
+            validation error; if that fails too the step is skipped instead of ending the loop.
 
     Returns:
         list of step dictionaries with thought, action, observation.
     """
-    seen_thoughts = seen_thoughts or []
-    seen_embeddings = seen_embeddings or []
-    executed_tools_global = executed_tools_global or set()
+    # `is None` (not `or`): an empty shared list/index must be kept so the caller sees new entries
+    seen_thoughts = seen_thoughts if seen_thoughts is not None else []
+    seen_embeddings = seen_embeddings if seen_embeddings is not None else ThoughtIndex()
+    executed_tools_global = executed_tools_global if executed_tools_global is not None else set()
+    structured = REACT_STRUCTURED_OUTPUT if structured is None else structured
+    tools = build_react_tool_schemas() if structured else None
 
     for step_num in range(max_steps):
         log_phase(f"\n🔁 React Step {step_num + 1} of {max_steps}")
@@ -493,46 +637,60 @@ def run_react_loop_for_rfp_eval(
             section_text=section_text,
             full_proposal_text=full_proposal_text,
             thoughts=thoughts,
-            tool_embeddings=tool_embeddings
+            tool_embeddings=tool_embeddings,
+            structured=structured
         )
         log_phase(f"Prompt for LLM: {messages}")
 
-        # Run LLM
+        # Run LLM and parse the response
         if agent.section_text is None: raise ValueError("Section text is None.")
-        response = call_openai_with_tracking(messages, model=agent.model, temperature=agent.temperature)
-
-        log_phase(f"LLM response: {response}")
-
-        # Parse response
         try:
-            thought, action = parse_thought_action(response)
+            if structured:
+                step = request_structured_react_step(agent, messages, tools)
+                thought, action = step["thought"], format_action(step)
+            else:
+                response = call_openai_with_tracking(messages, model=agent.model, temperature=agent.temperature,
+                                                     **react_step_call_options())
+                log_phase(f"LLM response: {response}")
+                thought, action = parse_thought_action(response)
             log_phase(f"Action: {action}")
             log_phase(f"\n🔁 Step {step_num + 1}")
             log_phase(f"🧠 Thought: {thought}")
             log_phase(f"⚙️ Action: {action}")
         except Exception as e:
             log_phase(f"⚠️ Failed to parse step {step_num + 1}: {str(e)}")
+            if structured:
+                continue  # the re-ask failed too; the next step gets a fresh prompt
             break
         
         # Check if action is not redundant to previous thoughts
-        novel_thoughts, novel_embs = filter_redundant_thoughts([thought], seen_thoughts, seen_embeddings)
+        # (novel thoughts/embeddings are stored in the shared history for future new thought checks)
+        novel_thoughts, novel_embs = filter_and_record_thoughts([thought], seen_thoughts, seen_embeddings)
         log_deduplication([thought], novel_thoughts)
         if not novel_thoughts:
             log_phase(f"⚠️ Skipping redundant thought: {thought}")
             continue
 
-        seen_thoughts.extend(novel_thoughts) # Store non-redundant thoughts (for future new thought checks)
-        seen_embeddings.extend(novel_embs) # Store non-redundant embeddings (for future new thought checks)
         thought = novel_thoughts[0]  # Use cleaned one
 
         # Run tool
         try:
-            observation = dispatch_tool_action(
-                agent, 
-                action, 
-                report_sections=report_sections, 
-                executed_tools_global=executed_tools_global,
-                raise_errors=True)
+            if structured and step["tool"] in CONTROL_ACTIONS:
+                observation = "Ready to summarize."
+            elif structured:
+                observation = dispatch_tool_call(
+                    agent,
+                    step["tool"],
+                    step["args"].get("input"),
+                    executed_tools_global=executed_tools_global,
+                    raise_errors=True)
+            else:
+                observation = dispatch_tool_action(
+                    agent, 
+                    action, 
+                    report_sections=report_sections, 
+                    executed_tools_global=executed_tools_global,
+                    raise_errors=True)
             log_phase(f"👀 Observation: {observation}")
             if observation is None:
                 observation = "⚠️ Tool returned no result."
@@ -586,6 +744,83 @@ def parse_thought_action(response: str):
     return thought, action
 
 
+def react_step_complete(text):
+    """
+    stream_until predicate for text-mode ReAct steps: True once a thought and a finished action line
+    have arrived (the action is followed by a newline or closes its tool["input"] bracket).
+    """
+    match = re.search(r"^\s*action:(.*)$", text, re.IGNORECASE | re.MULTILINE)
+    if not match or not re.search(r"^\s*thought:\s*\S", text, re.IGNORECASE | re.MULTILINE):
+        return False
+    action = match.group(1).strip()
+    if not action:
+        return False
+    # A bare `]` may sit inside the quoted input (tool["see [1]"), so only a closing `"]` counts
+    return text[match.end():].startswith("\n") or re.search(r'\["[^\n]*"\]$', action) is not None
+
+
+def react_step_call_options():
+    """
+    Extra call_openai_with_tracking() arguments for one text-mode ReAct step.
+    """
+    options = {"stop": REACT_STOP_SEQUENCES}
+    if REACT_STREAM_EARLY_EXIT:
+        options["stream_until"] = react_step_complete
+    return options
+
+
+def request_structured_react_step(agent, messages, tools):
+    """
+    Asks for one structured ReAct step and validates it. An invalid reply is re-asked once with
+    the validation error appended, so a single malformed call doesn't cost the step.
+
+    Returns:
+        dict: The validated step {thought, tool, args}.
+
+    Raises:
+        ValueError if the re-asked reply is invalid too.
+    """
+    reply = call_openai_with_tools(messages, tools, model=agent.model, temperature=agent.temperature)
+    log_phase(f"LLM response: {reply}")
+    try:
+        return parse_structured_react_reply(reply)
+    except ValueError as e:
+        log_phase(f"⚠️ Invalid structured step, asking again: {e}")
+        retry_messages = messages + [{
+            "role": "user",
+            "content": f"Your previous reply was invalid: {e}\nCall exactly one of the provided tools with valid arguments."
+        }]
+        reply = call_openai_with_tools(retry_messages, tools, model=agent.model, temperature=agent.temperature)
+        log_phase(f"LLM response: {reply}")
+        return parse_structured_react_reply(reply)
+
+
+def parse_structured_react_reply(reply, tool_map=None):
+    """
+    Turns a call_openai_with_tools() reply into a validated ReAct step {thought, tool, args}.
+
+    A model that answered in "Thought:/Action:" text despite the tools is still accepted; its
+    action is validated against the same schemas.
+
+    Raises:
+        ValueError if the reply holds no valid tool call.
+    """
+    if reply.get("error"):
+        raise ValueError(reply["error"])
+    if reply.get("tool_calls"):
+        return parse_react_tool_call(reply["tool_calls"][0], tool_map)
+    if reply.get("content"):
+        thought, action = parse_thought_action(reply["content"])
+        match = re.match(r'^([a-zA-Z0-9_]+)(\["(.*)"\])?$', action)
+        if not match:
+            raise ValueError(f"Could not parse tool action: {action}")
+        arguments = {"thought": thought}
+        if match.group(2):
+            arguments["input"] = match.group(3)
+        return parse_react_tool_call({"name": match.group(1), "arguments": arguments}, tool_map)
+    raise ValueError("Model returned neither a tool call nor text.")
+
+
 def run_missing_relevant_tools(
     agent,
     criterion,
@@ -611,6 +846,9 @@ def run_missing_relevant_tools(
         tool_function_map: dict of {tool_name: function}
         similarity_threshold: float (default 0.75)
 
+    Selected dual-context checks are answered together via dispatch_fused_checks() (FUSED_CHECKS_ENABLED);
+    results are returned per tool, in the same order and shape as individually dispatched tools.
+
     Returns:
         - auto_triggered: list of dicts with tool execution results
         - missing_tools: list of (tool_name, score) pairs
@@ -622,10 +860,12 @@ def run_missing_relevant_tools(
 
     auto_triggered = []
     auto_triggered_meta = []
+    query = "evaluate based on section context"
 
     log_phase("In run_missing_relevant_tools()")
     log_phase(f"tools_used: {tools_used}")
     log_phase(f"relevant_tools: {relevant_tools}")
+    selected = []
     for tool_name, score in relevant_tools:
         log_phase(f"Tool: {tool_name}, Score: {score:.3f}")
         log_phase(f"run_score_threshold: {run_score_threshold:.3f}, ")
@@ -637,22 +877,36 @@ def run_missing_relevant_tools(
             continue
         if tool_name not in tool_function_map:
             continue
+        if any(tool_name == name for name, _ in selected):
+            continue
+        selected.append((tool_name, score))
+
+    # Compatible checks share one reading of the context; the rest (and any check the fused call missed) run alone
+    fused_results = {}
+    if FUSED_CHECKS_ENABLED:
+        fused_results = dispatch_fused_checks(
+            agent,
+            [(tool_name, query) for tool_name, _ in selected],
+            tool_map=tool_function_map,
+            executed_tools_global=executed_tools_global
+        )
 
+    for tool_name, score in selected:
         try:
-            tool_fn = tool_function_map[tool_name] # resolve function name in tool_function_map
-
-            log_phase(f"⚙️ Auto-running missing relevant tool: {tool_name} (score: {score})")
-            query = "evaluate based on section context"
-            action_str = f'{tool_name}["{query}"]'
-            log_phase(f"Calling {tool_name} with query: {query}")
-            result = dispatch_tool_action(
-                agent=agent,
-                action=action_str,
-                report_sections=None,
-                tool_map=tool_function_map,
-                raise_errors=False,
-                executed_tools_global=executed_tools_global
-            )
+            if tool_name in fused_results:
+                result = fused_results[tool_name]
+            else:
+                log_phase(f"⚙️ Auto-running missing relevant tool: {tool_name} (score: {score})")
+                action_str = f'{tool_name}["{query}"]'
+                log_phase(f"Calling {tool_name} with query: {query}")
+                result = dispatch_tool_action(
+                    agent=agent,
+                    action=action_str,
+                    report_sections=None,
+                    tool_map=tool_function_map,
+                    raise_errors=False,
+                    executed_tools_global=executed_tools_global
+                )
 
             auto_triggered.append({  # store meta data
                 "tool": tool_name,
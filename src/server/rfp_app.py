@@ -1,8 +1,15 @@
 from fastapi import FastAPI, Request, UploadFile, File, Form, APIRouter
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import time
 import uuid
-from src.server.multi_agent_rfpevalrunner import run_multi_proposal_evaluation
+from src.server.multi_agent_rfpevalrunner import run_multi_proposal_evaluation, resume_run, can_resume_run, new_run_id
+from src.utils.checkpoint_store import CHECKPOINT_FILENAME
+from src.utils.lazy_resources import warm_up, parse_warmup_list, get_resource_report, WARMUP_RESOURCES
+from src.server.job_queue import JobQueue, JOB_DB_PATH, JOB_MAX_WORKERS, JOB_TERMINAL_STATUSES
 from src.utils.logging_utils import log_phase
 from pathlib import Path
 import tempfile
@@ -12,7 +19,74 @@ import os
 from src.utils.file_loader import process_uploaded_files  # if you save it as a separate helper
 from zipfile import ZipFile
 
-app = FastAPI(title="RFP Evaluation API", version="1.0")
+
+def run_evaluation_job(payload, report_progress, emit_event):
+    """
+    Job handler for "evaluate": re-materialises the uploaded RFP and runs the multi-vendor evaluation,
+    recording its progress events in the job's event log (streamed by /jobs/{job_id}/events).
+    Returns the JSON-friendly part of the run output (reports are on disk under the run_id).
+
+    The run_id is chosen at submit time and stored in the payload, so a job requeued after a restart
+    continues its interrupted run from the checkpoint instead of starting (and paying for) it again.
+    """
+    run_id = payload.get("run_id")  # jobs queued before run ids were stored in the payload have none
+    if run_id and can_resume_run(run_id):
+        log_phase(f"🔁 Job continues interrupted run {run_id}")
+        return _job_result(resume_run(run_id, progress_callback=report_progress, event_sink=emit_event))
+    with tempfile.TemporaryDirectory(prefix="rfp_job_") as job_dir:
+        rfp_path = Path(job_dir) / "rfp.txt"
+        rfp_path.write_text(payload["rfp_text"])
+        result = run_multi_proposal_evaluation(
+            proposals=payload["proposals"], rfp_file=str(rfp_path),
+            progress_callback=report_progress, event_sink=emit_event,
+            # An interrupted attempt may have created the folder before recording its inputs
+            run_id=run_id, resume=bool(run_id)
+        )
+    return _job_result(result)
+
+
+def resume_evaluation_job(payload, report_progress, emit_event):
+    """
+    Job handler for "resume": continues a failed run from its checkpoint (see resume_run).
+    """
+    result = resume_run(payload["run_id"], progress_callback=report_progress, event_sink=emit_event)
+    return _job_result(result)
+
+
+def _job_result(result):
+    return {
+        "run_id": result["run_id"],
+        "final_summary_text": result["final_summary_text"],
+        "file_paths": result["file_paths"],
+    }
+
+
+job_queue = JobQueue(
+    JOB_DB_PATH,
+    handlers={"evaluate": run_evaluation_job, "resume": resume_evaluation_job},
+    max_workers=JOB_MAX_WORKERS
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models/clients load lazily on first use; WARMUP_RESOURCES (e.g. "all" or
+    # "spacy_nlp,openai_client") loads them before the first request instead
+    names = parse_warmup_list(WARMUP_RESOURCES)
+    if names != []:
+        timings = await asyncio.to_thread(warm_up, names)
+        log_phase(f"🔥 Warm-up finished: {timings}")
+    job_queue.start()
+    yield
+    job_queue.stop(timeout=5)
+
+
+app = FastAPI(title="RFP Evaluation API", version="1.0", lifespan=lifespan)
+
+# SSE stream settings: how often to check for new events, and how often to send a keep-alive
+# comment so proxies don't close an idle connection during long LLM calls
+EVENT_POLL_SECONDS = 0.5
+EVENT_KEEPALIVE_SECONDS = 15
 
 # -------------------------------
 # Data Models
@@ -36,13 +110,95 @@ async def home():
 
 @app.post("/evaluate")
 async def evaluate(files: List[UploadFile] = File(...)):
+    """
+    Queues an evaluation and returns its job_id immediately (poll /jobs/{job_id}).
+    """
     try:
-        proposals, rfp_path = process_uploaded_files(files)
-        result = run_multi_proposal_evaluation(proposals=proposals, rfp_file=rfp_path)
-        return JSONResponse(content=result["file_paths"])
+        # Extraction (PDF parsing, OCR) and SQLite writes block; keep them off the event loop
+        proposals, rfp_path = await asyncio.to_thread(process_uploaded_files, files)
+        payload = {
+            "proposals": proposals,
+            "rfp_text": await asyncio.to_thread(Path(rfp_path).read_text),
+            "run_id": new_run_id(),
+        }
+        job_id = await asyncio.to_thread(job_queue.submit, "evaluate", payload)
+        return JSONResponse(status_code=202, content={"job_id": job_id, "run_id": payload["run_id"], "status": "queued"})
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.post("/runs/{run_id}/resume")
+async def resume(run_id: str):
+    """
+    Queues a resume of a failed run; only criteria missing from its checkpoint are re-evaluated.
+    """
+    if not (BASE_OUTPUT_DIR / run_id / CHECKPOINT_FILENAME).exists():
+        return JSONResponse(status_code=404, content={"error": f"No checkpoint for run {run_id}"})
+    job_id = await asyncio.to_thread(job_queue.submit, "resume", {"run_id": run_id})
+    return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+@app.get("/resources", response_class=HTMLResponse)
+async def resources():
+    """
+    Lists the lazily loaded models/clients and their load times (markdown table).
+    """
+    return f"<pre>{get_resource_report()}</pre>"
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    return job
+
+@app.get("/jobs/{job_id}/progress")
+async def job_progress(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    return {"job_id": job_id, "status": job["status"], "progress": job["progress"], "message": job["message"]}
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """
+    Streams the job's progress events as Server-Sent Events until the job finishes.
+    Each event has `id: <seq>`; reconnecting clients send Last-Event-ID to resume without gaps.
+    """
+    if await asyncio.to_thread(job_queue.get, job_id) is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    last_seq = int(request.headers.get("last-event-id") or 0)
+
+    async def stream():
+        nonlocal last_seq
+        last_sent = time.time()
+        while True:
+            # Status is read before the events: once it is terminal, every event is already stored
+            finished = (await asyncio.to_thread(job_queue.get, job_id))["status"] in JOB_TERMINAL_STATUSES
+            events = await asyncio.to_thread(job_queue.get_events, job_id, last_seq)
+            for seq, event in events:
+                last_seq = seq
+                yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                last_sent = time.time()
+            if not events:
+                if finished or await request.is_disconnected():
+                    break
+                if time.time() - last_sent > EVENT_KEEPALIVE_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.time()
+                await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    if job["status"] == "failed":
+        return JSONResponse(status_code=500, content={"job_id": job_id, "status": "failed", "error": job["error"]})
+    if job["status"] != "succeeded":
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": job["status"], "progress": job["progress"]})
+    return await asyncio.to_thread(job_queue.get_result, job_id)
+
 BASE_OUTPUT_DIR = Path("outputs/proposal_eval_reports")
 VALID_EXTENSIONS = {"pdf", "html", "md"}
     
@@ -0,0 +1,180 @@
+# checkpoint_store.py – Run-scoped checkpoints of completed criterion evaluations (SQLite)
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Checkpoints are written next to the run's reports; disable with CHECKPOINTS_ENABLED=false
+CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "true").lower() not in ("0", "false", "no")
+CHECKPOINT_FILENAME = "checkpoint.sqlite"
+
+
+class CheckpointStore:
+    """
+    Persists the inputs of an evaluation run and every completed (vendor, criterion) result.
+
+    Purpose:
+    A multi-vendor run can fail late (an OpenAI error, a PDF export crash). Each criterion result –
+    including its reasoning trace and triggered tools – and each vendor's SWOT summary is written
+    here as soon as it is produced, so resume_run() only re-evaluates the missing pieces instead
+    of re-spending the whole token budget.
+
+    Parameters:
+    - path (str | Path): SQLite file, normally <run output dir>/checkpoint.sqlite.
+
+    Connections are opened lazily per process and guarded by a lock, so criterion threads and
+    vendor worker processes can all write to the same run's store (WAL mode).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            self._conn = None  # never reuse a connection inherited from a parent process
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS run (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS criterion_results ("
+                "vendor TEXT NOT NULL, criterion TEXT NOT NULL, result TEXT NOT NULL, saved_at REAL NOT NULL, "
+                "PRIMARY KEY (vendor, criterion))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vendor_summaries ("
+                "vendor TEXT PRIMARY KEY, overall_score REAL NOT NULL, swot_summary TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    # -------------------------------
+    # Run inputs
+    # -------------------------------
+
+    def save_run_inputs(self, inputs):
+        """
+        Stores the run's inputs (proposals, parsed criteria, model, ...) so the run can be resumed by id.
+        """
+        self._set("inputs", inputs)
+
+    def load_run_inputs(self):
+        return self._get("inputs")
+
+    def set_status(self, status):
+        self._set("status", status)
+
+    def get_status(self):
+        return self._get("status")
+
+    def _set(self, key, value):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO run (key, value) VALUES (?, ?)", (key, json.dumps(value, default=str)))
+            conn.commit()
+
+    def _get(self, key):
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM run WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # -------------------------------
+    # Criterion results and vendor summaries
+    # -------------------------------
+
+    def save_criterion_result(self, vendor, criterion, result):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO criterion_results (vendor, criterion, result, saved_at) VALUES (?, ?, ?, ?)",
+                (vendor, criterion, json.dumps(result, default=str), time.time())
+            )
+            conn.commit()
+
+    def get_criterion_result(self, vendor, criterion):
+        """
+        Returns the saved result dict, or None if this (vendor, criterion) has not completed yet.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT result FROM criterion_results WHERE vendor = ? AND criterion = ?", (vendor, criterion)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def completed_criteria(self, vendor=None):
+        """
+        Returns the set of completed (vendor, criterion) pairs, optionally for one vendor.
+        """
+        query, params = "SELECT vendor, criterion FROM criterion_results", ()
+        if vendor is not None:
+            query, params = query + " WHERE vendor = ?", (vendor,)
+        with self._lock:
+            return set(self._connect().execute(query, params).fetchall())
+
+    def save_vendor_summary(self, vendor, overall_score, swot_summary):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO vendor_summaries (vendor, overall_score, swot_summary, saved_at) VALUES (?, ?, ?, ?)",
+                (vendor, overall_score, swot_summary, time.time())
+            )
+            conn.commit()
+
+    def get_vendor_summary(self, vendor):
+        """
+        Returns (overall_score, swot_summary) for a vendor whose SWOT was already generated, else None.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT overall_score, swot_summary FROM vendor_summaries WHERE vendor = ?", (vendor,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def for_vendor(self, vendor):
+        return VendorCheckpoint(self, vendor)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class VendorCheckpoint:
+    """
+    The slice of a CheckpointStore for one vendor, as used by evaluate_proposal.
+    """
+
+    def __init__(self, store, vendor):
+        self.store = store
+        self.vendor = vendor
+
+    def get(self, criterion):
+        return self.store.get_criterion_result(self.vendor, criterion)
+
+    def save(self, criterion, result):
+        self.store.save_criterion_result(self.vendor, criterion, result)
+
+    def get_summary(self):
+        return self.store.get_vendor_summary(self.vendor)
+
+    def save_summary(self, overall_score, swot_summary):
+        self.store.save_vendor_summary(self.vendor, overall_score, swot_summary)
+
+
+def get_checkpoint_store(outputs_dir):
+    """
+    Returns the CheckpointStore of the run whose reports are written to `outputs_dir`, or None
+    when checkpoints are disabled or the run folder does not exist.
+    """
+    if not CHECKPOINTS_ENABLED or not Path(outputs_dir).is_dir():
+        return None
+    return CheckpointStore(Path(outputs_dir) / CHECKPOINT_FILENAME)
@@ -3,9 +3,7 @@
 import os
 from src.models.openai_interface import call_openai_with_tracking
 from markdown import markdown
-from playwright.async_api import async_playwright
 from src.models.scoring import format_score_block
-from weasyprint import HTML
 from pathlib import Path
 from src.utils.report_utils import inject_html_style
 import re
@@ -224,7 +222,8 @@ async def export_report_to_markdown_and_pdf(agent, base_dir):
     with open(html_path, "w") as f:
         f.write(full_html)
 
-    # Step 3: Render to PDF
+    # Step 3: Render to PDF (playwright/weasyprint are imported at export time, not with this module)
+    from playwright.async_api import async_playwright
     try:
         async with async_playwright() as p:
             browser = await p.chromium.launch()
@@ -405,6 +404,7 @@ def convert_markdown_to_pdf(md_path):
 
     # Step 4: Convert HTML to PDF
     pdf_path = md_path.replace(".md", ".pdf")
+    from weasyprint import HTML
     HTML(html_path).write_pdf(pdf_path)
 
     return pdf_path
@@ -460,6 +460,7 @@ def save_markdown_and_pdf(markdown_text, additional_md, filename, output_dir="ou
 
     pdf_path = output_dir / f"{filename}.pdf"
     styled_pdf_html = inject_html_style(html_body, for_pdf=True)
+    from weasyprint import HTML
     HTML(string=styled_pdf_html).write_pdf(pdf_path)
 
     return {
@@ -0,0 +1,113 @@
+# extraction_cache.py – Persistent cache of text extracted from PDF/DOCX files, keyed by content hash
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from src.utils.sqlite_cache import SQLiteLRUCache
+from src.utils.logging_utils import log_phase
+
+# Cache settings (override via env vars or configure_extraction_cache)
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+EXTRACTION_CACHE_PATH = os.getenv(
+    "EXTRACTION_CACHE_PATH",
+    str(Path(os.getenv("OUTPUT_DIR", "outputs")) / "cache" / "extracted_text.sqlite")
+)
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "2000"))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 512 MB
+
+# Bump when the extraction code in file_loader changes its output for the same file
+EXTRACTION_CACHE_SCHEMA = "2"  # 2: [(page number, text)] per document
+
+extraction_cache = SQLiteLRUCache(
+    EXTRACTION_CACHE_PATH,
+    max_entries=EXTRACTION_CACHE_MAX_ENTRIES,
+    max_bytes=EXTRACTION_CACHE_MAX_BYTES
+)
+extraction_savings = {"seconds_saved": 0.0}
+
+
+def configure_extraction_cache(enabled=None, path=None, max_entries=None, max_bytes=None):
+    """
+    Reconfigures the extraction cache at runtime (e.g. to point tests or a run at another file).
+    """
+    global EXTRACTION_CACHE_ENABLED, extraction_cache
+    if enabled is not None:
+        EXTRACTION_CACHE_ENABLED = enabled
+    if path is not None or max_entries is not None or max_bytes is not None:
+        extraction_cache.close()
+        extraction_cache = SQLiteLRUCache(
+            path or extraction_cache.path,
+            max_entries=max_entries if max_entries is not None else extraction_cache.max_entries,
+            max_bytes=max_bytes if max_bytes is not None else extraction_cache.max_bytes
+        )
+
+
+def extractor_version(extractor):
+    """
+    Returns the version string of the library behind `extractor` ("pymupdf" or "docx"),
+    so upgrading a parser invalidates its cached text.
+    """
+    if extractor == "pymupdf":
+        import fitz
+        return fitz.VersionBind
+    if extractor == "docx":
+        import docx
+        return getattr(docx, "__version__", "unknown")
+    return "unknown"
+
+
+def make_extraction_key(content, extractor):
+    """
+    Key for one extraction: extractor + its version + cache schema + SHA-256 of the file bytes.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{extractor}:{extractor_version(extractor)}:{EXTRACTION_CACHE_SCHEMA}:{digest}"
+
+
+def extract_text_cached(content, extractor, extract_fn, name=None):
+    """
+    Returns the extracted content of a document, extracting it only if this exact file was not seen before.
+
+    Parameters:
+    - content (bytes): The raw file contents (the hash covers the bytes, not the filename).
+    - extractor (str): Extractor id used in the key ("pymupdf", "docx").
+    - extract_fn (callable): bytes -> JSON-serialisable content (text, or a list of pages), run on a miss.
+    - name (str): Filename for log messages.
+
+    Returns:
+    - The extracted content (tuples come back as lists after a cache hit).
+    """
+    if not EXTRACTION_CACHE_ENABLED:
+        return extract_fn(content)
+
+    key = make_extraction_key(content, extractor)
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        entry = json.loads(cached.decode("utf-8"))
+        extraction_savings["seconds_saved"] += entry["extract_seconds"]
+        log_phase(f"♻️ Reused extracted text for {name or 'document'} ({extractor}, saved {entry['extract_seconds']:.2f}s)")
+        return entry["content"]
+
+    start = time.perf_counter()
+    extracted = extract_fn(content)
+    seconds = time.perf_counter() - start
+    extraction_cache.set(key, json.dumps({"content": extracted, "extract_seconds": seconds}).encode("utf-8"))
+    log_phase(f"📄 Extracted {name or 'document'} with {extractor} in {seconds:.2f}s")
+    return extracted
+
+
+def get_extraction_cache_stats():
+    """
+    Returns hit/miss counters, entry count and extraction time saved for the current process.
+    """
+    stats = extraction_cache.stats()
+    stats.update(extraction_savings)
+    stats["enabled"] = EXTRACTION_CACHE_ENABLED
+    return stats
+
+
+def reset_extraction_cache_stats():
+    extraction_cache.reset_stats()
+    extraction_savings["seconds_saved"] = 0.0
@@ -1,38 +1,69 @@
 # file_loader.py – File input handling
 
 from pathlib import Path
+import io
 import docx # for Word documents
-import fitz # for PDFs
 import os
-from typing import Dict
-import PyPDF2
+from typing import Dict, List, Tuple
 from src.utils.rfp_extractors import extract_evaluation_criteria
 import re
 from src.utils.logging_utils import log_phase
+from src.utils.extraction_cache import extract_text_cached
+from src.utils.pdf_pages import iter_pdf_pages
 
-def load_report_text_from_file(filepath=None, file=None) -> str:
+
+def _extract_docx_pages(data: bytes) -> List[Tuple[int, str]]:
+    doc = docx.Document(io.BytesIO(data))
+    return [(1, "\n".join(p.text for p in doc.paragraphs))]  # .docx has no stored page breaks
+
+
+def _extract_pdf_pages(data: bytes) -> List[Tuple[int, str]]:
+    return list(iter_pdf_pages(data))
+
+
+def load_document_pages(filepath=None, file=None) -> List[Tuple[int, str]]:
     """
-    Loads text from a supported file format (txt, md, docx, pdf).
+    Loads a supported file (txt, md, docx, pdf) as a list of (page number, text), pages numbered from 1.
+
+    Purpose:
+    Single loader for every input path (API uploads, scenario folders, CLI). PDFs are extracted page
+    by page with PyMuPDF – in parallel worker processes for long documents (see pdf_pages) – and keep
+    their page numbers so findings can cite them. Text and Word files are returned as page 1.
+    PDF and DOCX extractions are cached by file content (see extraction_cache), so re-uploading
+    the same file is not re-parsed.
+
+    Parameters:
+    - filepath (str | Path): Path of the file, or
+    - file (UploadFile-like): Object with `.filename` and a binary `.file`.
     """
     if filepath:
         ext = Path(filepath).suffix.lower()
+        name = Path(filepath).name
     elif file:
         ext = Path(file.filename).suffix.lower()
+        name = file.filename
     else:
         raise ValueError("Must provide either 'filepath' or 'file'")
 
     if ext in [".txt", ".md"]:
-        content = file.file.read().decode("utf-8") if file else Path(filepath).read_text(encoding="utf-8")
-    elif ext == ".docx":
-        doc = docx.Document(file.file if file else filepath)
-        content = "\n".join(p.text for p in doc.paragraphs)
-    elif ext == ".pdf":
-        doc = fitz.open(stream=file.file.read(), filetype="pdf") if file else fitz.open(filepath)
-        content = "\n".join([page.get_text() for page in doc])
-    else:
+        return [(1, file.file.read().decode("utf-8") if file else Path(filepath).read_text(encoding="utf-8"))]
+    if ext not in [".docx", ".pdf"]:
         raise ValueError("Unsupported file format. Use .txt, .md, .docx, or .pdf")
-    
-    return content
+
+    data = file.file.read() if file else Path(filepath).read_bytes()
+    if ext == ".docx":
+        pages = extract_text_cached(data, "docx", _extract_docx_pages, name=name)
+    else:
+        pages = extract_text_cached(data, "pymupdf", _extract_pdf_pages, name=name)
+    return [(page_number, text) for page_number, text in pages]  # cached pages come back as lists
+
+
+def load_report_text_from_file(filepath=None, file=None) -> str:
+    """
+    Loads text from a supported file format (txt, md, docx, pdf).
+    Pages are joined with newlines; use load_document_pages() to keep page numbers.
+    """
+    return "\n".join(text for _, text in load_document_pages(filepath=filepath, file=file))
 
 
 def load_proposals_from_folder(folder_path: str) -> Dict[str, str]:
@@ -46,18 +77,8 @@ def load_proposals_from_folder(folder_path: str) -> Dict[str, str]:
     for file in folder.glob("*"):
         vendor_name = file.stem  # e.g., "Vendor A"
 
-        if file.suffix == ".txt":
-            proposals[vendor_name] = file.read_text(encoding="utf-8")
-
-        elif file.suffix == ".docx":
-            doc = docx.Document(file)
-            proposals[vendor_name] = "\n".join([para.text for para in doc.paragraphs])
-
-        elif file.suffix == ".pdf":
-            with open(file, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                text = "\n".join([page.extract_text() or "" for page in reader.pages])
-                proposals[vendor_name] = text
+        if file.suffix in (".txt", ".docx", ".pdf"):
+            proposals[vendor_name] = load_report_text_from_file(file)
 
     return proposals
 
@@ -111,9 +132,116 @@ def parse_rfp_from_file(filepath: str) -> dict:
 
 
 from typing import List, Dict, Optional
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+from src.models.embedding_backends import get_sentence_transformer
+from src.utils.paragraph_index import ProposalParagraphIndex, register_proposal_index, lookup_proposal_index
+
+CRITERIA_MATCH_MODEL = "all-MiniLM-L6-v2"
+# Chunk size bounds for criterion matching, in embedding-model tokens. MiniLM truncates at 256
+# tokens; below the minimum, PDF line fragments are merged with their neighbours.
+PARAGRAPH_CHUNK_MAX_TOKENS = int(os.getenv("PARAGRAPH_CHUNK_MAX_TOKENS", "200"))
+PARAGRAPH_CHUNK_MIN_TOKENS = int(os.getenv("PARAGRAPH_CHUNK_MIN_TOKENS", "40"))
+
+_SENTENCE_END = (".", "!", "?", ":", ";")
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def chunk_proposal_paragraphs(
+    text: str,
+    max_tokens: int = PARAGRAPH_CHUNK_MAX_TOKENS,
+    min_tokens: int = PARAGRAPH_CHUNK_MIN_TOKENS,
+    count_tokens=None
+) -> List[str]:
+    """
+    Splits proposal text into paragraph chunks sized for embedding.
+
+    Purpose:
+    PDF extraction breaks every wrapped line with a newline, so splitting on "\n" yields hundreds of
+    sentence fragments that match criteria poorly and cost one embedding each. Consecutive lines are
+    joined until the chunk holds at least `min_tokens` and ends at a sentence or paragraph break
+    (blank line); a chunk never grows past `max_tokens`, and single lines longer than that are split
+    on word boundaries.
+
+    Parameters:
+    - text (str): The proposal text.
+    - max_tokens / min_tokens (int): Chunk size bounds.
+    - count_tokens (callable): str -> token count; defaults to a ~4 characters/token estimate.
+
+    Returns:
+    - List[str]: Chunks in document order.
+    """
+    count_tokens = count_tokens or _estimate_tokens
+    chunks, current, current_tokens = [], [], 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(" ".join(current))
+        current, current_tokens = [], 0
+
+    for raw_line in text.split("\n"):
+        line = " ".join(raw_line.split())
+        if not line:
+            if current_tokens >= min_tokens:
+                flush()  # paragraph break
+            continue
+
+        tokens = count_tokens(line)
+        if tokens > max_tokens:
+            flush()
+            words = line.split()
+            step = max(1, len(words) * max_tokens // tokens)
+            chunks.extend(" ".join(words[i:i + step]) for i in range(0, len(words), step))
+            continue
+
+        if current and current_tokens + tokens > max_tokens:
+            flush()
+        current.append(line)
+        current_tokens += tokens
+        if current_tokens >= min_tokens and line.endswith(_SENTENCE_END):
+            flush()
+
+    flush()
+    return chunks
+
+
+def _model_token_counter(model):
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None or not hasattr(tokenizer, "tokenize"):
+        return None
+    return lambda text: len(tokenizer.tokenize(text))
+
+
+def _chunk_for_model(proposal_text, model):
+    max_tokens = PARAGRAPH_CHUNK_MAX_TOKENS
+    max_seq_length = getattr(model, "max_seq_length", None)
+    if isinstance(max_seq_length, int):
+        max_tokens = min(max_tokens, max_seq_length - 2)  # room for [CLS]/[SEP]
+    return chunk_proposal_paragraphs(
+        proposal_text, max_tokens=max_tokens, min_tokens=PARAGRAPH_CHUNK_MIN_TOKENS, count_tokens=_model_token_counter(model)
+    )
+
+
+def get_proposal_paragraph_index(proposal_text):
+    """
+    Returns the paragraph index of a proposal: the one registered while matching criteria, or a new
+    one (chunked and encoded once, then registered) for proposals that skipped preprocessing.
+    """
+    index = lookup_proposal_index(proposal_text)
+    if index is not None:
+        return index
+    model = get_sentence_transformer(CRITERIA_MATCH_MODEL)
+    paragraphs = _chunk_for_model(proposal_text, model)
+    embeddings = np.asarray(
+        model.encode(paragraphs, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False),
+        dtype=np.float32
+    ) if paragraphs else np.zeros((0, 0), dtype=np.float32)
+    log_phase(f"🔍 Indexed {len(paragraphs)} proposal paragraphs for tool context")
+    return register_proposal_index(proposal_text, ProposalParagraphIndex(paragraphs, embeddings, model))
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
 def preprocess_proposal_for_criteria_with_threshold(
     proposal_text: str,
@@ -124,36 +252,44 @@ def preprocess_proposal_for_criteria_with_threshold(
     """
     Matches segments of proposal text to each RFP criterion using embedding similarity,
     returning only segments above a relevance threshold.
+
+    The proposal is split with chunk_proposal_paragraphs(); paragraphs and all criterion queries
+    are each encoded in one batch and scored as a single criteria × paragraphs cosine matrix.
+    Criteria with no paragraph above the threshold fall back to their best-scoring paragraph.
+    The paragraph embeddings are registered as the proposal's ProposalParagraphIndex for tool context retrieval.
     """
-    # Split proposal into paragraphs
-    paragraphs = [p.strip() for p in proposal_text.split("\n") if p.strip()]
-    para_embeddings = model.encode(paragraphs, convert_to_tensor=True)
+    model = get_sentence_transformer(CRITERIA_MATCH_MODEL)  # same instance as the local embedding backend
+
+    criteria = [c["name"] if isinstance(c, dict) else c for c in rfp_criteria]
+    paragraphs = _chunk_for_model(proposal_text, model)
+    if not paragraphs or not criteria:
+        return {criterion: "" for criterion in criteria}
+
+    queries = [
+        rfp_criterion_descriptions.get(criterion, criterion) if rfp_criterion_descriptions else criterion
+        for criterion in criteria
+    ]
+
+    log_phase(f"🔍 Matching {len(paragraphs)} proposal paragraphs to {len(criteria)} RFP criteria...")
+    encode_kwargs = {"convert_to_numpy": True, "normalize_embeddings": True, "show_progress_bar": False}
+    para_embeddings = np.asarray(model.encode(paragraphs, **encode_kwargs), dtype=np.float32)
+    # Kept for the tools: build_dual_context_prompt() retrieves their context from this index
+    register_proposal_index(proposal_text, ProposalParagraphIndex(paragraphs, para_embeddings, model))
+    query_embeddings = np.asarray(model.encode(queries, **encode_kwargs), dtype=np.float32)
+
+    # Embeddings are L2-normalized, so the dot product is the cosine similarity
+    scores = query_embeddings @ para_embeddings.T  # (criteria, paragraphs)
+    relevant = scores >= score_threshold
+    no_match = ~relevant.any(axis=1)
+    relevant[no_match, scores[no_match].argmax(axis=1)] = True  # fall back to the top match
 
     matched_sections = {}
-
-    log_phase("🔍 Matching proposal sections to RFP criteria...")
-    for criterion in rfp_criteria:
-        criterion = criterion["name"]
-        query = rfp_criterion_descriptions.get(criterion, criterion) if rfp_criterion_descriptions else criterion
-        query_embedding = model.encode(query, convert_to_tensor=True)
-
-        # Compute similarity scores
-        cosine_scores = util.pytorch_cos_sim(query_embedding, para_embeddings)[0]
-
-        # Select all paragraphs above the threshold
-        relevant_paragraphs = [
-            para for para, score in zip(paragraphs, cosine_scores)
-            if score.item() >= score_threshold
-        ]
-        log_phase(f"🔍 Found {len(relevant_paragraphs)} relevant paragraphs for criterion '{criterion}'")
-
-        # If nothing matched, fall back to top 1 best match
-        if not relevant_paragraphs:
+    for row, criterion in enumerate(criteria):
+        if no_match[row]:
             log_phase(f"🔍 No paragraphs above threshold for '{criterion}'. Selecting top match.")
-            top_idx = cosine_scores.argmax().item()
-            relevant_paragraphs = [paragraphs[top_idx]]
-
-        matched_sections[criterion] = "\n\n".join(relevant_paragraphs)
+        else:
+            log_phase(f"🔍 Found {int(relevant[row].sum())} relevant paragraphs for criterion '{criterion}'")
+        matched_sections[criterion] = "\n\n".join(paragraphs[i] for i in np.flatnonzero(relevant[row]))
 
     return matched_sections
 
@@ -0,0 +1,163 @@
+# lazy_resources.py – Registry of heavy models/clients loaded on first use, with warm-up and import profiling
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from src.utils.logging_utils import log_phase, logger
+
+# Resources to load at API startup (comma-separated names, "all", or empty for fully lazy)
+WARMUP_RESOURCES = os.getenv("WARMUP_RESOURCES", "")
+
+
+class LazyResource:
+    """
+    A model, client or library handle that is created on first get() and then reused.
+
+    Purpose:
+    Importing a module should not pay for torch, spaCy or network clients it may never use.
+    Modules register their heavy objects here and fetch them with get() at call time; the
+    first caller pays the load (timed for the startup report), later callers get the same
+    instance. Loading is guarded by a lock, so concurrent first calls load only once.
+
+    Parameters:
+    - name (str): Registry name, used for warm-up and reports.
+    - loader (callable): Zero-argument function that creates the resource.
+    - description (str): Short note shown in reports.
+    """
+
+    def __init__(self, name, loader, description=""):
+        self.name = name
+        self.loader = loader
+        self.description = description
+        self.load_seconds = None
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    self._value = self.loader()
+                    self.load_seconds = time.perf_counter() - start
+                    self._loaded = True
+                    log_phase(f"📦 Loaded {self.name} in {self.load_seconds:.2f}s")
+        return self._value
+
+    def reset(self):
+        """
+        Drops the loaded instance (the next get() loads it again), e.g. after configuration changes.
+        """
+        with self._lock:
+            self._value = None
+            self._loaded = False
+            self.load_seconds = None
+
+
+_resources = {}
+_resources_lock = threading.Lock()
+
+
+def register_resource(name, loader, description=""):
+    """
+    Registers a lazily loaded resource and returns its LazyResource (re-registering a name returns the existing one).
+    """
+    with _resources_lock:
+        if name not in _resources:
+            _resources[name] = LazyResource(name, loader, description)
+        return _resources[name]
+
+
+def get_resource(name):
+    """
+    Loads (if needed) and returns the registered resource `name`.
+    """
+    return _resources[name].get()
+
+
+def warm_up(names=None):
+    """
+    Loads the given resources (default: all registered) now instead of on first use.
+
+    A failing resource is logged and skipped, so a missing optional model never blocks startup.
+    Returns {name: load seconds or None if it failed}.
+    """
+    names = list(_resources) if names is None else names
+    timings = {}
+    for name in names:
+        resource = _resources.get(name)
+        if resource is None:
+            logger.warning(f"⚠️ Unknown resource '{name}' in warm-up list")
+            continue
+        try:
+            resource.get()
+            timings[name] = resource.load_seconds
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up of {name} failed: {e}")
+            timings[name] = None
+    return timings
+
+
+def parse_warmup_list(raw=WARMUP_RESOURCES):
+    """
+    Turns WARMUP_RESOURCES ("all", "", or "a,b") into the names argument of warm_up().
+    """
+    raw = (raw or "").strip()
+    if not raw:
+        return []
+    if raw.lower() == "all":
+        return None
+    return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+def get_resource_report():
+    """
+    Returns a markdown table of registered resources, whether they are loaded and how long loading took.
+    """
+    lines = ["| Resource | Loaded | Load time (s) | Description |", "|---|---|---|---|"]
+    for name, resource in sorted(_resources.items()):
+        seconds = f"{resource.load_seconds:.2f}" if resource.load_seconds is not None else "-"
+        lines.append(f"| {name} | {'✅' if resource.loaded else '—'} | {seconds} | {resource.description} |")
+    return "\n".join(lines)
+
+
+def profile_imports(module="src.server.rfp_app", top=15):
+    """
+    Imports `module` in a fresh interpreter with `-X importtime` and returns the `top` slowest
+    imports as [(cumulative seconds, module name)] plus the total, for spotting eager heavy imports.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env={**os.environ, "PYTHONWARNINGS": "ignore"}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    timings = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|(\s*)(\S+)", line)
+        if match:
+            cumulative_us, indent, name = match.groups()
+            if len(indent) <= 1:  # top-level imports only; nested ones are included in their parent's time
+                timings.append((int(cumulative_us) / 1e6, name))
+    total = sum(seconds for seconds, _ in timings)
+    return sorted(timings, reverse=True)[:top], total
+
+
+def format_import_profile(module="src.server.rfp_app", top=15):
+    slowest, total = profile_imports(module, top)
+    lines = [f"Import profile for {module}: {total:.2f}s total", "| Cumulative (s) | Module |", "|---|---|"]
+    lines += [f"| {seconds:.3f} | {name} |" for seconds, name in slowest]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # python -m src.utils.lazy_resources [module]  →  import-time profile report
+    print(format_import_profile(*(sys.argv[1:2] or ["src.server.rfp_app"])))
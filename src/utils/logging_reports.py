@@ -1,27 +1,24 @@
 from pathlib import Path
 from datetime import datetime
-from matplotlib import pyplot as plt
 import shutil
 import json
-from src.utils.logging_utils import openai_call_log, thought_dedup_stats
 from src.utils.thought_filtering import get_embedding_cache_stats
+from src.models.embedding_store import get_embedding_store_stats
+from src.models.llm_cache import get_llm_cache_stats
+from src.utils.extraction_cache import get_extraction_cache_stats
 import os
 from src.utils.logging_utils import (
     log_phase,
-    tool_stats,
-    thought_score_stats,
-    tool_failure,
-    tool_failure_stats,
-    openai_call_counter,
-    openai_call_sources,
-    openai_prompt_token_usage_by_source,
-    openai_completion_token_usage_by_source,
+    get_run_context,
     calculate_token_usage_summary,
     get_openai_call_avg_time)
 from src.utils.export_utils import convert_markdown_to_html_and_pdf_rfp
 
 def finalize_evaluation_run(output_dir="../outputs/proposal_eval_reports", run_id=None, results=None):
     log_phase("📊 Generating Logging Summary Report...")
+    stats = get_run_context().snapshot()  # consistent view of this run's metrics
+    tool_stats = stats["tool_stats"]
+    thought_score_stats = stats["thought_score_stats"]
     run_id = run_id or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -53,14 +50,14 @@ def finalize_evaluation_run(output_dir="../outputs/proposal_eval_reports", run_i
 
     # --- FAILURES ---
     summary_lines.append("## ❗ Tool Failures")
-    for tool, reason in tool_failure.items():
+    for tool, reason in stats["tool_failure"].items():
         summary_lines.append(f"- {tool}: {reason}")
     summary_lines.append("\n---\n")
     
     # --- TOOL SUCCESS RATES ---
     summary_lines.append("## ✅ Tool Success Rates")
     for tool, total in tool_stats.items():
-        fail = tool_failure_stats.get(tool, 0)
+        fail = stats["tool_failure_stats"].get(tool, 0)
         success = total - fail
         rate = (success / total) * 100 if total else 0
         summary_lines.append(f"- {tool}: {success}/{total} successful ({rate:.1f}%)")
@@ -79,6 +76,14 @@ def finalize_evaluation_run(output_dir="../outputs/proposal_eval_reports", run_i
     summary_lines.append(generate_embedding_cache_md())
     summary_lines.append("\n---\n")
 
+    # --- LLM RESPONSE CACHE ---
+    summary_lines.append(generate_llm_cache_md())
+    summary_lines.append("\n---\n")
+
+    # --- DOCUMENT EXTRACTION CACHE ---
+    summary_lines.append(generate_extraction_cache_md())
+    summary_lines.append("\n---\n")
+
     # --- REASONING TRACE BY CRITERION ---
     summary_lines.append("\n## 🧠 Reasoning Chain Analysis")
     summary_lines.append(generate_reasoning_trace_md(results))
@@ -90,14 +95,14 @@ def finalize_evaluation_run(output_dir="../outputs/proposal_eval_reports", run_i
     
     # --- OPENAI CALLS ---
     summary_lines.append("## 🔄 OpenAI API Calls")
-    summary_lines.append(f"- Total Calls: {openai_call_counter}")
+    summary_lines.append(f"- Total Calls: {stats['openai_call_counter']}")
     avg_time = get_openai_call_avg_time()
     summary_lines.append(f"- Average Time: {avg_time:.2f} sec")
     summary_lines.append("\n---\n")
     summary_lines.append(f"- OpenAI Call Sources & Token Usage")
-    for src, count in openai_call_sources.items():
-        prompt_tokens = openai_prompt_token_usage_by_source.get(src, 0)
-        completion_tokens = openai_completion_token_usage_by_source.get(src, 0)
+    for src, count in stats["openai_call_sources"].items():
+        prompt_tokens = stats["openai_prompt_token_usage_by_source"].get(src, 0)
+        completion_tokens = stats["openai_completion_token_usage_by_source"].get(src, 0)
         total_tokens = prompt_tokens + completion_tokens
         summary_lines.append(
             f"- **{src}**: {count} call(s), "
@@ -133,6 +138,7 @@ def finalize_evaluation_run(output_dir="../outputs/proposal_eval_reports", run_i
 # Plot helper
 def _plot_bar(data_dict, output_file, title):
     if not data_dict: return
+    from matplotlib import pyplot as plt  # imported when a report is drawn, not at startup
     labels = list(data_dict.keys())
     values = list(data_dict.values())
     plt.figure(figsize=(8, 4))
@@ -150,7 +156,7 @@ def display_openai_call_summary(n=10):
     from pandas import DataFrame
 
     # Show call counts and token usage
-    df = DataFrame(openai_call_log)
+    df = DataFrame(get_run_context().openai_call_log)
     if df.empty:
         print("No OpenAI calls logged.")
         return
@@ -179,6 +185,7 @@ def generate_openai_call_previews_md(n=20):
     lines = []
     lines.append(f"## 📋 Sample OpenAI Calls (first {n})")
 
+    openai_call_log = get_run_context().openai_call_log
     if not openai_call_log:
         lines.append("_No OpenAI calls logged._")
         return "\n".join(lines)
@@ -338,7 +345,7 @@ def generate_reasoning_trace_md(results, plots_dir="plots"):
 
 
 def get_thought_deduplication_summary_md():
-    stats = thought_dedup_stats
+    stats = get_run_context().thought_dedup_stats
     lines = ["## 💠 Thought Deduplication Summary"]
     lines.append(f"- Total Thoughts Generated: {stats['total_generated']}")
     lines.append(f"- Unique Thoughts Retained: {stats['unique_retained']}")
@@ -354,14 +361,51 @@ def get_thought_deduplication_summary_md():
 
 def generate_embedding_cache_md():
     stats = get_embedding_cache_stats()
+    store = get_embedding_store_stats()
+    total = stats["hits"] + stats["store_hits"] + stats["misses"]
+    hit_rate = ((stats["hits"] + stats["store_hits"]) / total) * 100 if total > 0 else 0
+    store_lookups = stats["store_hits"] + stats["misses"]
+    store_hit_rate = (stats["store_hits"] / store_lookups) * 100 if store_lookups > 0 else 0
+    return f"""
+## 🧠 Embedding Cache Usage
+- In-Memory Hits: {stats['hits']}
+- Persistent Store Hits: {stats['store_hits']}
+- Misses (embedded): {stats['misses']}
+- Total Requests: {total}
+- Cache Hit Rate: **{hit_rate:.1f}%**
+- Persistent Store Hit Rate: **{store_hit_rate:.1f}%**
+- Store Entries: {store['entries']} (evicted: {store['evictions']}, enabled: {store['enabled']})
+""".strip()
+
+
+def generate_llm_cache_md():
+    stats = get_llm_cache_stats()
     total = stats["hits"] + stats["misses"]
     hit_rate = (stats["hits"] / total) * 100 if total > 0 else 0
+    tokens_saved = stats["prompt_tokens_saved"] + stats["completion_tokens_saved"]
     return f"""
-## 🧠 Embedding Cache Usage
+## 🗄️ LLM Response Cache (temperature=0 calls)
+- Enabled: {stats['enabled']}
 - Hits: {stats['hits']}
 - Misses: {stats['misses']}
-- Total Requests: {total}
 - Cache Hit Rate: **{hit_rate:.1f}%**
+- Tokens Saved: {tokens_saved} ({stats['prompt_tokens_saved']} prompt, {stats['completion_tokens_saved']} completion)
+- Entries Stored: {stats['entries']} (evicted: {stats['evictions']}, expired: {stats['expired']})
+""".strip()
+
+
+def generate_extraction_cache_md():
+    stats = get_extraction_cache_stats()
+    total = stats["hits"] + stats["misses"]
+    hit_rate = (stats["hits"] / total) * 100 if total > 0 else 0
+    return f"""
+## 📄 Document Extraction Cache (PDF/DOCX, since server start)
+- Enabled: {stats['enabled']}
+- Hits: {stats['hits']}
+- Misses (extracted): {stats['misses']}
+- Cache Hit Rate: **{hit_rate:.1f}%**
+- Extraction Time Saved: {stats['seconds_saved']:.1f}s
+- Documents Stored: {stats['entries']} (evicted: {stats['evictions']})
 """.strip()
 
 
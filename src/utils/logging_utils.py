@@ -1,4 +1,8 @@
 import logging
+import threading
+import time
+import contextvars
+from contextlib import contextmanager
 from collections import defaultdict
 import inspect
 from pathlib import Path
@@ -12,27 +16,176 @@ formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s", "%H:%
 ch.setFormatter(formatter)
 logger.addHandler(ch)
 
-# Initialize global variables / custom trackers
-tool_stats = defaultdict(int)
-tool_failure_stats = defaultdict(int)    # failed calls
-tool_failure = {}
-tool_skipped_stats = defaultdict(int)    # failed calls
-tool_skipped = {}
-thought_stats = defaultdict(int)
-thought_score_stats = defaultdict(int)
-openai_call_log = []
-openai_call_counter = 0
-openai_call_times = []
-openai_call_sources = defaultdict(int)
-openai_prompt_token_usage_by_source = defaultdict(int)
-openai_completion_token_usage_by_source = defaultdict(int)
-#tool_call_times = defaultdict(list)
-thought_dedup_stats = {
-    "total_generated": 0,
-    "unique_retained": 0,
-    "redundant_filtered": 0,
-    "filtered_examples": []
-}
+# Initialize per-run trackers
+class RunContext:
+    """
+    Owns the metrics of one evaluation run (tool, thought, OpenAI-call and dedup stats).
+
+    Purpose:
+    The active context is held in a contextvar, so concurrent runs in one process (two /evaluate
+    requests, parallel criteria) each aggregate into their own RunContext instead of shared
+    module globals. All updates go through `lock`, so threads of the same run can log safely.
+    Outside of `run_context()` the process-wide default context is used, which keeps the
+    module-level names (logging_utils.tool_stats, ...) working as before.
+
+    Parameters:
+    - run_id (str): Optional identifier, shown in logs and reports.
+    - event_sink (callable): Optional fn(event dict) receiving progress events from emit_event()
+      (e.g. the job queue, which streams them to clients over SSE).
+    """
+
+    def __init__(self, run_id=None, event_sink=None):
+        self.run_id = run_id
+        self.event_sink = event_sink
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tool_stats = defaultdict(int)
+            self.tool_failure_stats = defaultdict(int)    # failed calls
+            self.tool_failure = {}
+            self.tool_skipped_stats = defaultdict(int)    # skipped calls
+            self.tool_skipped = {}
+            self.thought_stats = defaultdict(int)
+            self.thought_score_stats = defaultdict(int)
+            self.openai_call_log = []
+            self.openai_call_counter = 0
+            self.openai_call_times = []
+            self.openai_call_sources = defaultdict(int)
+            self.openai_prompt_token_usage_by_source = defaultdict(int)
+            self.openai_completion_token_usage_by_source = defaultdict(int)
+            self.thought_dedup_stats = {
+                "total_generated": 0,
+                "unique_retained": 0,
+                "redundant_filtered": 0,
+                "filtered_examples": []
+            }
+
+    def snapshot(self):
+        """
+        Returns a picklable copy of every tracker (e.g. to send from a worker process or build a report).
+        """
+        with self.lock:
+            return {
+                "tool_stats": dict(self.tool_stats),
+                "tool_failure_stats": dict(self.tool_failure_stats),
+                "tool_failure": dict(self.tool_failure),
+                "tool_skipped_stats": dict(self.tool_skipped_stats),
+                "tool_skipped": dict(self.tool_skipped),
+                "thought_stats": dict(self.thought_stats),
+                "thought_score_stats": dict(self.thought_score_stats),
+                "openai_call_log": list(self.openai_call_log),
+                "openai_call_counter": self.openai_call_counter,
+                "openai_call_times": list(self.openai_call_times),
+                "openai_call_sources": dict(self.openai_call_sources),
+                "openai_prompt_token_usage_by_source": dict(self.openai_prompt_token_usage_by_source),
+                "openai_completion_token_usage_by_source": dict(self.openai_completion_token_usage_by_source),
+                "thought_dedup_stats": {
+                    **self.thought_dedup_stats,
+                    "filtered_examples": list(self.thought_dedup_stats["filtered_examples"])
+                },
+            }
+
+    def merge(self, snapshot):
+        """
+        Adds a snapshot() from another context or process into this one.
+        """
+        with self.lock:
+            for name in _COUNTER_TRACKERS:
+                counter = getattr(self, name)
+                for key, value in snapshot.get(name, {}).items():
+                    counter[key] += value
+            self.tool_failure.update(snapshot.get("tool_failure", {}))
+            self.tool_skipped.update(snapshot.get("tool_skipped", {}))
+            self.openai_call_log.extend(snapshot.get("openai_call_log", []))
+            self.openai_call_times.extend(snapshot.get("openai_call_times", []))
+            self.openai_call_counter += snapshot.get("openai_call_counter", 0)
+
+            dedup = snapshot.get("thought_dedup_stats", {})
+            for key in ("total_generated", "unique_retained", "redundant_filtered"):
+                self.thought_dedup_stats[key] += dedup.get(key, 0)
+            self.thought_dedup_stats["filtered_examples"].extend(dedup.get("filtered_examples", []))
+
+
+_COUNTER_TRACKERS = (
+    "tool_stats", "tool_failure_stats", "tool_skipped_stats", "thought_stats", "thought_score_stats",
+    "openai_call_sources", "openai_prompt_token_usage_by_source", "openai_completion_token_usage_by_source",
+)
+_TRACKER_NAMES = _COUNTER_TRACKERS + (
+    "tool_failure", "tool_skipped", "openai_call_log", "openai_call_counter", "openai_call_times", "thought_dedup_stats",
+)
+
+_default_run_context = RunContext("default")
+_current_run_context = contextvars.ContextVar("run_context", default=_default_run_context)
+
+
+def get_run_context():
+    """
+    Returns the RunContext of the current run (the process-wide default outside run_context()).
+    """
+    return _current_run_context.get()
+
+
+@contextmanager
+def run_context(run_id=None, context=None, event_sink=None):
+    """
+    Makes a (new or given) RunContext current for the enclosed block and anything it calls.
+
+    A new context inherits the enclosing context's event sink unless `event_sink` is given, so a
+    job can subscribe to the events of the run it starts. Threads started inside the block must be
+    submitted with contextvars.copy_context().run(...) to report into the same context.
+    """
+    context = context or RunContext(run_id, event_sink=event_sink or get_run_context().event_sink)
+    token = _current_run_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_run_context.reset(token)
+
+
+def __getattr__(name):
+    # Module-level tracker names (logging_utils.tool_stats, ...) resolve to the current run's trackers
+    if name in _TRACKER_NAMES:
+        return getattr(get_run_context(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_event_fields = contextvars.ContextVar("event_fields", default={})
+
+
+@contextmanager
+def event_scope(**fields):
+    """
+    Adds `fields` (e.g. vendor=..., criterion=...) to every event emitted inside the block.
+    """
+    token = _event_fields.set({**_event_fields.get(), **fields})
+    try:
+        yield
+    finally:
+        _event_fields.reset(token)
+
+
+def emit_event(event_type, **data):
+    """
+    Sends a structured progress event (phase start/end, criterion score, ...) to the current run's
+    event sink. Every event carries the run id, a timestamp, the tokens used so far in the run and
+    the fields of any enclosing event_scope(). No-op when nobody is listening.
+    """
+    ctx = get_run_context()
+    sink = ctx.event_sink
+    if sink is None:
+        return
+    with ctx.lock:
+        tokens_used = sum(ctx.openai_prompt_token_usage_by_source.values()) + sum(ctx.openai_completion_token_usage_by_source.values())
+    event = {
+        "type": event_type, "run_id": ctx.run_id, "timestamp": time.time(), "tokens_used": tokens_used,
+        **_event_fields.get(), **data
+    }
+    try:
+        sink(event)
+    except Exception as e:  # a broken listener must never fail the evaluation
+        logger.warning(f"⚠️ Could not emit {event_type} event: {e}")
 
 
 def log_phase(message):
@@ -42,24 +195,30 @@ def log_result(vendor, criterion, score):
     logger.info(f"✅ [{vendor}] '{criterion}' scored {score}/10")
 
 def log_tool_used(tool_name):
-    tool_stats[tool_name] += 1
-    logger.debug(f"⚙️ Tool used: {tool_name}, total calls: {tool_stats[tool_name]}")
+    ctx = get_run_context()
+    with ctx.lock:
+        ctx.tool_stats[tool_name] += 1
+    logger.debug(f"⚙️ Tool used: {tool_name}, total calls: {ctx.tool_stats[tool_name]}")
 
 def log_thought_score(thought, score):
-    thought_stats[thought] += 1
-    thought_score_stats[score] += 1
+    ctx = get_run_context()
+    with ctx.lock:
+        ctx.thought_stats[thought] += 1
+        ctx.thought_score_stats[score] += 1
     logger.debug(f"💭 Thought scored: {thought} with score {score}")
 
 def log_openai_call(prompt, response, source=None, prompt_tokens=0, completion_tokens=0, embedding=True):
-    global openai_call_counter
-    openai_call_counter += 1
+    ctx = get_run_context()
+    with ctx.lock:
+        ctx.openai_call_counter += 1
+        openai_call_counter = ctx.openai_call_counter
 
-    openai_call_sources[source] += 1
-    openai_prompt_token_usage_by_source[source] += prompt_tokens
-    openai_completion_token_usage_by_source[source] += completion_tokens
+        ctx.openai_call_sources[source] += 1
+        ctx.openai_prompt_token_usage_by_source[source] += prompt_tokens
+        ctx.openai_completion_token_usage_by_source[source] += completion_tokens
 
     if embedding:
-        openai_call_log.append({
+        ctx.openai_call_log.append({
             "source": source,
             "call_type": "embedding",
             "prompt": prompt,
@@ -72,7 +231,7 @@ def log_openai_call(prompt, response, source=None, prompt_tokens=0, completion_t
             f"Embedding call, no response logged and no token usage stats. "
         )
     else:
-        openai_call_log.append({
+        ctx.openai_call_log.append({
             "source": source,
             "call_type": "chat.completion",
             "prompt": prompt,
@@ -90,13 +249,13 @@ def log_openai_call(prompt, response, source=None, prompt_tokens=0, completion_t
 
 def print_tool_stats():
     logger.info("📊 Tool usage summary:")
-    for tool, count in tool_stats.items():
+    for tool, count in get_run_context().tool_stats.items():
         logger.info(f"   {tool}: {count} time(s)")
 
 def print_thought_stats():
     logger.info("📊 Thought generation summary:")
     score_distribution = defaultdict(int)
-    for score, count in thought_score_stats.items():
+    for score, count in get_run_context().thought_score_stats.items():
         score_distribution[score] += count
     for score, count in sorted(score_distribution.items(), reverse=True):
         logger.info(f"   Thought score {score}: {count} time(s)")
@@ -111,25 +270,32 @@ def log_tool_execution(tool_name, tool_fn, input_arg=None, agent=None):
         log_phase(f"📄 Section: {agent.section_name}")
 
 def log_tool_failed(tool_name, error_message):
-    tool_failure[tool_name] = error_message
-    tool_failure_stats[tool_name] += 1
+    ctx = get_run_context()
+    with ctx.lock:
+        ctx.tool_failure[tool_name] = error_message
+        ctx.tool_failure_stats[tool_name] += 1
     logger.error(f"❌ Tool '{tool_name}' failed: {error_message}")
 
 def log_tool_skipped(tool_name, error_message):
-    tool_skipped[tool_name] = error_message
-    tool_skipped_stats[tool_name] += 1
+    ctx = get_run_context()
+    with ctx.lock:
+        ctx.tool_skipped[tool_name] = error_message
+        ctx.tool_skipped_stats[tool_name] += 1
     logger.error(f"❌ Tool '{tool_name}' skipped: {error_message}")
 
 def log_openai_call_time(duration_sec):
-    openai_call_times.append(duration_sec)
+    ctx = get_run_context()
+    with ctx.lock:
+        ctx.openai_call_times.append(duration_sec)
 
 def get_openai_call_avg_time():
+    openai_call_times = get_run_context().openai_call_times
     total = len(openai_call_times)
     avg = sum(openai_call_times) / total if total > 0 else 0
     return avg
 
 def print_openai_call_stats():
-    total = len(openai_call_times)
+    total = len(get_run_context().openai_call_times)
     avg = get_openai_call_avg_time()
     logger.info(f"🔄 Total OpenAI calls: {total}, Avg time: {round(avg, 2)} sec")
 
@@ -172,8 +338,9 @@ def display_log(log_file="logs/eval_notebook_run.log"):
 
 def print_tool_success_rates():
     logger.info("📊 Tool Success Rates:")
-    for tool, total_calls in tool_stats.items():
-        failures = tool_failure_stats.get(tool, 0)
+    ctx = get_run_context()
+    for tool, total_calls in ctx.tool_stats.items():
+        failures = ctx.tool_failure_stats.get(tool, 0)
         success = total_calls - failures
         rate = (success / total_calls) * 100 if total_calls > 0 else 0
         logger.info(f"   {tool}: {success}/{total_calls} successful ({rate:.1f}%)")
@@ -181,13 +348,14 @@ def print_tool_success_rates():
 
 def print_openai_call_sources():
     logger.info("📍 OpenAI Calls by Source:")
-    for src, count in openai_call_sources.items():
+    for src, count in get_run_context().openai_call_sources.items():
         logger.info(f"   {src}: {count} call(s)")
 
 
 def calculate_token_usage_summary(model="gpt-3.5-turbo"):
-    total_prompt_tokens = sum(openai_prompt_token_usage_by_source.values())
-    total_completion_tokens = sum(openai_completion_token_usage_by_source.values())
+    ctx = get_run_context()
+    total_prompt_tokens = sum(ctx.openai_prompt_token_usage_by_source.values())
+    total_completion_tokens = sum(ctx.openai_completion_token_usage_by_source.values())
     total_tokens = total_prompt_tokens + total_completion_tokens
 
     # Pricing (update if you switch models)
@@ -238,15 +406,40 @@ def get_log_issues(log_file_path=None, levels=("ERROR", "WARNING", "CRITICAL"),
 
 def log_deduplication(thoughts, unique_thoughts):
     deduped = [t for t in thoughts if t not in unique_thoughts]
-    thought_dedup_stats["total_generated"] += len(thoughts)
-    thought_dedup_stats["unique_retained"] += len(unique_thoughts)
-    thought_dedup_stats["redundant_filtered"] += len(deduped)
-    thought_dedup_stats["filtered_examples"].extend(deduped[:3])  # limit to 3 for brevity
+    ctx = get_run_context()
+    with ctx.lock:
+        thought_dedup_stats = ctx.thought_dedup_stats
+        thought_dedup_stats["total_generated"] += len(thoughts)
+        thought_dedup_stats["unique_retained"] += len(unique_thoughts)
+        thought_dedup_stats["redundant_filtered"] += len(deduped)
+        thought_dedup_stats["filtered_examples"].extend(deduped[:3])  # limit to 3 for brevity
 
 def reset_dedup_stats():
-    thought_dedup_stats.update({
+    get_run_context().thought_dedup_stats.update({
         "total_generated": 0,
         "unique_retained": 0,
         "redundant_filtered": 0,
         "filtered_examples": []
-    })
\ No newline at end of file
+    })
+
+# --- Stats snapshots (used to merge results from worker processes) ---
+
+def snapshot_stats():
+    """
+    Returns a picklable copy of the current run's trackers (tool, thought, OpenAI and dedup stats).
+    """
+    return get_run_context().snapshot()
+
+
+def merge_stats(snapshot):
+    """
+    Adds a snapshot from snapshot_stats() (e.g. returned by a worker process) into the current run.
+    """
+    get_run_context().merge(snapshot)
+
+
+def reset_stats():
+    """
+    Clears every tracker of the current run.
+    """
+    get_run_context().reset()
@@ -0,0 +1,104 @@
+# paragraph_index.py – Per-proposal paragraph embeddings for retrieving tool context (top-k excerpts instead of the full proposal)
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Paragraphs sent to each tool in place of the full proposal (0 disables retrieval)
+TOOL_CONTEXT_TOP_K = int(os.getenv("TOOL_CONTEXT_TOP_K", "6"))
+# Indexes kept in memory (one per proposal text; a run evaluates a handful of vendors)
+PARAGRAPH_INDEX_MAX_PROPOSALS = int(os.getenv("PARAGRAPH_INDEX_MAX_PROPOSALS", "16"))
+
+
+class ProposalParagraphIndex:
+    """
+    Paragraphs of one proposal with their L2-normalized embeddings.
+
+    Purpose:
+    preprocess_proposal_for_criteria_with_threshold() already chunks and encodes the proposal to
+    match criteria. Keeping those vectors lets every tool call retrieve the few paragraphs relevant
+    to its own instructions and query (one short encode + one matrix-vector product) instead of
+    pasting the whole proposal into the prompt.
+
+    Parameters:
+    - paragraphs (list): Paragraph texts in document order.
+    - embeddings (array): (len(paragraphs), dim) normalized embeddings.
+    - model: Encoder used for the paragraphs (queries must use the same one).
+    """
+
+    def __init__(self, paragraphs, embeddings, model):
+        self.paragraphs = list(paragraphs)
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.model = model
+
+    def __len__(self):
+        return len(self.paragraphs)
+
+    def search(self, query, k=TOOL_CONTEXT_TOP_K):
+        """
+        Returns [(paragraph_position, score)] for the k best paragraphs, best first.
+        """
+        if not self.paragraphs or not query:
+            return []
+        query_embedding = np.asarray(
+            self.model.encode([query], convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False),
+            dtype=np.float32
+        )[0]
+        scores = self.embeddings @ query_embedding
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def excerpts(self, query, k=TOOL_CONTEXT_TOP_K, exclude_text=""):
+        """
+        The k paragraphs most relevant to `query`, in document order, joined by blank lines.
+        Paragraphs already contained in `exclude_text` (e.g. the section shown to the tool) are skipped.
+        A list of queries (fused checks) gets the union of each query's k paragraphs.
+        """
+        queries = query if isinstance(query, (list, tuple)) else [query]
+        chosen = set()
+        for q in queries:
+            candidates = [i for i, _ in self.search(q, k=k + 8)]
+            chosen.update([i for i in candidates if self.paragraphs[i] not in (exclude_text or "")][:k])
+        return "\n\n".join(self.paragraphs[i] for i in sorted(chosen))
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def proposal_key(proposal_text):
+    return hashlib.sha256(proposal_text.encode("utf-8")).hexdigest()
+
+
+def register_proposal_index(proposal_text, index):
+    """
+    Stores the index for `proposal_text` (LRU, at most PARAGRAPH_INDEX_MAX_PROPOSALS proposals).
+    """
+    key = proposal_key(proposal_text)
+    with _indexes_lock:
+        _indexes[key] = index
+        _indexes.move_to_end(key)
+        while len(_indexes) > max(1, PARAGRAPH_INDEX_MAX_PROPOSALS):
+            _indexes.popitem(last=False)
+    return index
+
+
+def lookup_proposal_index(proposal_text):
+    """
+    Returns the registered index for `proposal_text`, or None.
+    """
+    key = proposal_key(proposal_text)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+        return index
+
+
+def clear_proposal_indexes():
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,76 @@
+# pdf_pages.py – Page-level PDF text extraction (PyMuPDF), parallel across worker processes for long documents
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+# PyMuPDF (fitz) is imported inside the functions: importing the API must not load it, and
+# spawned workers still import just this module before opening their document
+
+# Extraction settings (override via env vars)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))  # shorter PDFs are not worth a process pool
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "16"))
+
+_worker_doc = None  # the document opened once per worker process
+
+
+def _init_worker(data):
+    global _worker_doc
+    import fitz
+    _worker_doc = fitz.open(stream=data, filetype="pdf")
+
+
+def _extract_page_range(start, end):
+    return [(index + 1, _worker_doc[index].get_text()) for index in range(start, end)]
+
+
+def count_pdf_pages(data):
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def iter_pdf_pages(data, max_workers=None, pages_per_task=None, min_parallel_pages=None):
+    """
+    Yields (page number, text) for every page of a PDF, in page order, starting at page 1.
+
+    Purpose:
+    Proposals of several hundred pages are slow to extract in one thread. Documents with at least
+    `min_parallel_pages` pages are split into ranges of `pages_per_task` pages and extracted by a
+    pool of `max_workers` processes; each worker receives the PDF bytes once and opens it once.
+    Pages are yielded as soon as their range (and every earlier one) is done, so callers can
+    consume a long document without waiting for the last page. Shorter documents are extracted
+    in-process.
+
+    Parameters:
+    - data (bytes): The PDF file contents.
+    - max_workers (int): Worker processes (default: PDF_EXTRACT_WORKERS; 1 = no pool).
+    - pages_per_task (int): Pages per task (default: PDF_PAGES_PER_TASK).
+    - min_parallel_pages (int): Page count from which the pool is used (default: PDF_PARALLEL_MIN_PAGES).
+    """
+    max_workers = max_workers or PDF_EXTRACT_WORKERS
+    pages_per_task = pages_per_task or PDF_PAGES_PER_TASK
+    min_parallel_pages = PDF_PARALLEL_MIN_PAGES if min_parallel_pages is None else min_parallel_pages
+
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if max_workers <= 1 or page_count < min_parallel_pages:
+            for index, page in enumerate(doc):
+                yield index + 1, page.get_text()
+            return
+
+    starts = list(range(0, page_count, pages_per_task))
+    ends = [min(start + pages_per_task, page_count) for start in starts]
+    executor = ProcessPoolExecutor(
+        max_workers=min(max_workers, len(starts)),
+        mp_context=multiprocessing.get_context("spawn"),  # safe under the API's threads
+        initializer=_init_worker,
+        initargs=(data,)
+    )
+    try:
+        for pages in executor.map(_extract_page_range, starts, ends):
+            yield from pages
+    finally:
+        # A consumer that stops early does not wait for the remaining ranges
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,156 @@
+# prompt_packer.py – Token-budgeted prompt assembly: prioritized segments, truncation/compression, cached static parts
+
+import os
+import re
+from functools import lru_cache
+from src.utils.lazy_resources import register_resource
+from src.utils.logging_utils import log_phase
+
+# Token budgets per prompt family (override via env vars)
+REACT_PROMPT_TOKEN_BUDGET = int(os.getenv("REACT_PROMPT_TOKEN_BUDGET", "6000"))
+TOOL_PROMPT_TOKEN_BUDGET = int(os.getenv("TOOL_PROMPT_TOKEN_BUDGET", "3500"))
+PROMPT_TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "cl100k_base")
+
+# Segments that would keep fewer tokens than this are dropped instead of truncated
+MIN_SEGMENT_TOKENS = 32
+CHARS_PER_TOKEN = 4  # fallback estimate when the tiktoken encoding can't be loaded (e.g. offline)
+
+# Shrink strategies for segments over budget
+KEEP = "keep"            # never shortened
+TRUNCATE = "truncate"    # keep the beginning
+TAIL = "tail"            # keep the end (history: most recent steps matter most)
+SUMMARIZE = "summarize"  # extractive: lead sentence of each paragraph, then truncate
+
+
+def _load_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(PROMPT_TOKENIZER_ENCODING)
+    except Exception as e:
+        log_phase(f"⚠️ tiktoken encoding '{PROMPT_TOKENIZER_ENCODING}' unavailable ({e}); estimating ~{CHARS_PER_TOKEN} chars/token")
+        return None
+
+
+_encoding = register_resource("tiktoken_encoding", _load_encoding, "tiktoken BPE for prompt budgets")
+
+
+@lru_cache(maxsize=512)
+def count_tokens(text):
+    """
+    Number of tokens in `text` (tiktoken, or a character estimate). Cached: the same proposal
+    and catalog text is counted on every ReAct step and tool call.
+    """
+    if not text:
+        return 0
+    encoding = _encoding.get()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=512)
+def truncate_to_tokens(text, max_tokens, from_end=False):
+    """
+    Cuts `text` to at most `max_tokens` tokens, keeping the start (or the end when from_end=True)
+    and marking the cut.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    marker = "\n[...truncated...]\n"
+    keep = max(0, max_tokens - count_tokens(marker))
+    encoding = _encoding.get()
+    if encoding is None:
+        chars = keep * CHARS_PER_TOKEN
+        kept = text[-chars:] if from_end and chars else text[:chars]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        kept = encoding.decode(tokens[-keep:] if from_end and keep else tokens[:keep])
+    return marker.lstrip("\n") + kept if from_end else kept + marker.rstrip("\n")
+
+
+@lru_cache(maxsize=128)
+def compress_to_tokens(text, max_tokens):
+    """
+    Extractive compression for long context: keeps the first sentence of every paragraph (so every
+    part of the document stays represented), then truncates if that is still over budget.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    leads = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if paragraph:
+            leads.append(re.split(r"(?<=[.!?])\s+", paragraph, maxsplit=1)[0])
+    compressed = "\n".join(leads)
+    return truncate_to_tokens(compressed, max_tokens)
+
+
+_static_segments = {}
+
+
+def cached_static_segment(key, render_fn):
+    """
+    Renders a static prompt part (e.g. the tool catalog) once per process and reuses the text;
+    its token count is cached by count_tokens() on first use.
+    """
+    if key not in _static_segments:
+        _static_segments[key] = render_fn()
+    return _static_segments[key]
+
+
+def segment(name, text, priority=0, shrink=TRUNCATE, prefix="", suffix=""):
+    """
+    One part of a prompt. Only `text` is shortened; prefix/suffix (headings, separators) stay as is.
+    Higher priority segments are shrunk last.
+    """
+    return {"name": name, "text": "" if text is None else str(text), "priority": priority, "shrink": shrink, "prefix": prefix, "suffix": suffix}
+
+
+def _shrink(seg, max_tokens):
+    if seg["shrink"] == SUMMARIZE:
+        return compress_to_tokens(seg["text"], max_tokens)
+    return truncate_to_tokens(seg["text"], max_tokens, from_end=seg["shrink"] == TAIL)
+
+
+def pack_prompt(segments, budget, label="prompt"):
+    """
+    Joins segments in order, shrinking the lowest-priority ones first until the prompt fits `budget` tokens.
+
+    Parameters:
+    - segments (list): Dicts from segment(), in the order they appear in the prompt.
+    - budget (int): Maximum prompt tokens. 0 or None disables packing.
+    - label (str): Name used in the log line when something had to be shortened.
+
+    Returns:
+    - str: The rendered prompt. Under budget it is exactly the concatenation of all segments.
+    """
+    if not budget:
+        return "".join(s["prefix"] + s["text"] + s["suffix"] for s in segments)
+
+    texts = [s["text"] for s in segments]
+    sizes = [count_tokens(s["prefix"] + s["text"] + s["suffix"]) for s in segments]
+    total = sum(sizes)
+    shrunk = []
+
+    order = sorted(
+        (i for i, s in enumerate(segments) if s["shrink"] != KEEP and s["text"]),
+        key=lambda i: segments[i]["priority"]
+    )
+    for i in order:
+        if total <= budget:
+            break
+        seg = segments[i]
+        frame = count_tokens(seg["prefix"] + seg["suffix"])
+        allowed = sizes[i] - (total - budget) - frame
+        if allowed < MIN_SEGMENT_TOKENS:
+            texts[i] = "[omitted for length]"
+        else:
+            texts[i] = _shrink(seg, allowed)
+        new_size = count_tokens(seg["prefix"] + texts[i] + seg["suffix"])
+        total -= sizes[i] - new_size
+        sizes[i] = new_size
+        shrunk.append(seg["name"])
+
+    if shrunk:
+        log_phase(f"✂️ Packed {label} to ~{total}/{budget} tokens (shortened: {', '.join(shrunk)})")
+    return "".join(s["prefix"] + t + s["suffix"] for s, t in zip(segments, texts))
@@ -0,0 +1,133 @@
+# proposal_artifacts.py – NLP analysis of a proposal, computed once and shared by all NLP tools
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from src.utils.lazy_resources import register_resource
+
+# Proposals whose artifacts are kept in memory (a run touches each proposal for every criterion)
+PROPOSAL_ARTIFACTS_CACHE_SIZE = int(os.getenv("PROPOSAL_ARTIFACTS_CACHE_SIZE", "8"))
+
+SPACY_MODEL = "en_core_web_sm"
+# Only tokenization, the parser (sentence boundaries) and NER are used by the tools
+SPACY_DISABLED_PIPES = ["tagger", "attribute_ruler", "lemmatizer"]
+
+
+def _load_nlp():
+    import spacy
+    nlp = spacy.load(SPACY_MODEL, disable=SPACY_DISABLED_PIPES)
+    nlp.max_length = max(nlp.max_length, 2_000_000)  # long proposals
+    return nlp
+
+
+_nlp = register_resource("spacy_nlp", _load_nlp, f"spaCy {SPACY_MODEL} (tokenizer, parser, NER)")
+
+
+def get_nlp():
+    """
+    Returns the shared spaCy pipeline, loaded on first use with the unneeded pipes disabled.
+    """
+    return _nlp.get()
+
+
+class ProposalArtifacts:
+    """
+    Lazily computed, memoized NLP views of one text (normally a full proposal).
+
+    Purpose:
+    The NLP tools (entities, readability, tone, sentence-level rewrites) run once per criterion
+    per vendor, but always over the same proposal text. Each expensive pass – the spaCy pipeline,
+    textstat and TextBlob – runs at most once per text; tools read the results from here.
+
+    Parameters:
+    - text (str): The text to analyse.
+
+    Each artifact is computed on first access under a lock, so criteria evaluated in parallel
+    threads share one computation.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.text_hash = text_hash(self.text)
+        self._lock = threading.RLock()
+        self._values = {}
+
+    def _compute_once(self, name, compute):
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = compute()
+            return self._values[name]
+
+    @property
+    def doc(self):
+        """The spaCy Doc (tokens, sentence boundaries, entities)."""
+        return self._compute_once("doc", lambda: get_nlp()(self.text))
+
+    @property
+    def sentences(self):
+        """Sentence strings, in order."""
+        return self._compute_once("sentences", lambda: [s.text.strip() for s in self.doc.sents if s.text.strip()])
+
+    @property
+    def entities(self):
+        """{entity label: unique entity texts in order of first appearance}."""
+        def compute():
+            by_label = {}
+            for ent in self.doc.ents:
+                values = by_label.setdefault(ent.label_, [])
+                if ent.text not in values:
+                    values.append(ent.text)
+            return by_label
+        return self._compute_once("entities", compute)
+
+    @property
+    def readability(self):
+        """textstat scores: flesch_reading_ease, text_standard, difficult_words."""
+        def compute():
+            from textstat.textstat import textstat
+            return {
+                "flesch_reading_ease": textstat.flesch_reading_ease(self.text),
+                "text_standard": textstat.text_standard(self.text),
+                "difficult_words": textstat.difficult_words(self.text),
+            }
+        return self._compute_once("readability", compute)
+
+    @property
+    def sentiment(self):
+        """TextBlob sentiment: {"polarity", "subjectivity"}."""
+        def compute():
+            from textblob import TextBlob
+            sentiment = TextBlob(self.text).sentiment
+            return {"polarity": sentiment.polarity, "subjectivity": sentiment.subjectivity}
+        return self._compute_once("sentiment", compute)
+
+
+def text_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+_artifacts_cache = OrderedDict()
+_artifacts_lock = threading.Lock()
+
+
+def get_proposal_artifacts(text):
+    """
+    Returns the ProposalArtifacts for `text`, memoized by text hash (LRU, PROPOSAL_ARTIFACTS_CACHE_SIZE entries).
+    """
+    key = text_hash(text)
+    with _artifacts_lock:
+        artifacts = _artifacts_cache.get(key)
+        if artifacts is not None:
+            _artifacts_cache.move_to_end(key)
+            return artifacts
+        artifacts = ProposalArtifacts(text)
+        _artifacts_cache[key] = artifacts
+        while len(_artifacts_cache) > PROPOSAL_ARTIFACTS_CACHE_SIZE:
+            _artifacts_cache.popitem(last=False)
+        return artifacts
+
+
+def clear_proposal_artifacts():
+    with _artifacts_lock:
+        _artifacts_cache.clear()
@@ -0,0 +1,171 @@
+# sqlite_cache.py – Small persistent key/value cache with LRU eviction and TTL
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class SQLiteLRUCache:
+    """
+    A persistent, size-bounded key/value store backed by a single SQLite file.
+
+    Purpose:
+    Shared building block for on-disk caches (LLM responses, embeddings). Values are raw bytes;
+    callers decide how to encode them. Entries are evicted least-recently-used first once the
+    cache exceeds `max_entries` or `max_bytes`, and entries older than `ttl_seconds` are treated
+    as misses and removed on read.
+
+    Parameters:
+    - path (str | Path): Location of the SQLite file. Parent folders are created on first use.
+    - max_entries (int): Maximum number of rows to keep. None disables the limit.
+    - max_bytes (int): Maximum total size of stored values. None disables the limit.
+    - ttl_seconds (float): Time-to-live for entries. None keeps entries until evicted.
+
+    The connection is opened lazily and guarded by a lock, so one instance can be shared across
+    threads. WAL mode lets several processes read and write the same file.
+    """
+
+    def __init__(self, path, max_entries=10000, max_bytes=None, ttl_seconds=None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0}
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            self._conn = None  # never reuse a connection inherited from a parent process
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access)")
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        """
+        Returns the stored bytes for `key`, or None on a miss or expired entry.
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                conn.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self._stats["hits"] += 1
+            return bytes(value)
+
+    def set(self, key, value):
+        """
+        Stores `value` (bytes) under `key`, then evicts least-recently-used entries if over budget.
+        """
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), now, now)
+            )
+            self._stats["writes"] += 1
+            self._evict(conn)
+            conn.commit()
+
+    def set_many(self, items):
+        """
+        Stores several (key, bytes) pairs in one transaction, then evicts once.
+        """
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            rows = [(key, sqlite3.Binary(value), len(value), now, now) for key, value in items]
+            if not rows:
+                return
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._stats["writes"] += len(rows)
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+
+        excess_rows = count - self.max_entries if self.max_entries is not None else 0
+        if excess_rows > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                (excess_rows,)
+            )
+            self._stats["evictions"] += excess_rows
+            count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+
+        if self.max_bytes is not None and total_size > self.max_bytes:
+            to_delete = []
+            for key, size in conn.execute("SELECT key, size FROM cache ORDER BY last_access ASC"):
+                if total_size <= self.max_bytes:
+                    break
+                to_delete.append((key,))
+                total_size -= size
+            conn.executemany("DELETE FROM cache WHERE key = ?", to_delete)
+            self._stats["evictions"] += len(to_delete)
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self):
+        """
+        Returns hit/miss/write/eviction counters for this process plus the current entry count.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = len(self)
+        return stats
+
+    def merge_stats(self, stats):
+        """
+        Adds counters from another process's stats() into this instance (entry count is read live).
+        """
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] += stats.get(key, 0)
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
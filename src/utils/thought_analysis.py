@@ -1,6 +1,5 @@
 # src/utils/thought_analysis.py
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from src.models.embedding_backends import get_sentence_transformer
 from collections import defaultdict
 
 def cluster_thoughts_by_similarity(thoughts, threshold=0.85):
@@ -12,7 +11,8 @@ def cluster_thoughts_by_similarity(thoughts, threshold=0.85):
     if not thoughts:
         return []
 
-    model = SentenceTransformer("all-MiniLM-L6-v2")
+    from sklearn.metrics.pairwise import cosine_similarity
+    model = get_sentence_transformer("all-MiniLM-L6-v2")  # shared instance, loaded once per process
     embeddings = model.encode(thoughts)
     similarity_matrix = cosine_similarity(embeddings) # 2D matrix of shape (n, n) of similarity between all pairs of thoughts
 
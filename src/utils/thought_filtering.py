@@ -1,61 +1,278 @@
 # src/utils/thought_filtering.py
 
 from typing import List, Tuple
-from sklearn.metrics.pairwise import cosine_similarity
-from src.models.openai_embeddings import get_openai_embedding
+import threading
+import numpy as np
+from src.models.embedding_backends import get_embeddings_batch, get_embedding_backend
+from src.models.embedding_store import get_stored_embeddings, store_embeddings, reset_embedding_store_stats, merge_embedding_store_stats, get_embedding_store_stats
 from src.utils.logging_utils import log_phase
 
+
+class ThoughtIndex:
+    """
+    Growable, pre-normalized embedding matrix of previously seen thoughts.
+
+    Purpose:
+    Drop-in replacement for the `seen_embeddings` list shared across ToT nodes and ReAct steps.
+    Vectors are L2-normalized once on insert into a float32 buffer that doubles in capacity when
+    full (amortized O(1) append), so a redundancy check is a single matrix-vector product instead
+    of rebuilding a 2-D array from the whole list on every call.
+
+    Parameters:
+    - embeddings (list): Optional initial embeddings.
+    - initial_capacity (int): Rows allocated up front.
+
+    `lock` (re-entrant) guards reads and appends, so one index can be shared by criteria
+    evaluated in parallel; hold it to make a check-then-record sequence atomic.
+    """
+
+    def __init__(self, embeddings=None, initial_capacity=64):
+        self.lock = threading.RLock()
+        self._matrix = None
+        self._size = 0
+        self._initial_capacity = initial_capacity
+        if embeddings is not None and len(embeddings):
+            self.extend(embeddings)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def dimensions(self):
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    @property
+    def matrix(self):
+        """
+        Normalized embeddings currently in the index (a view, shape (len, dimensions)).
+        """
+        if self._matrix is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, rows, dimensions):
+        if self._matrix is None:
+            capacity = max(self._initial_capacity, rows)
+            self._matrix = np.empty((capacity, dimensions), dtype=np.float32)
+        elif self._size + rows > self._matrix.shape[0]:
+            capacity = max(self._matrix.shape[0] * 2, self._size + rows)
+            grown = np.empty((capacity, dimensions), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+    def extend(self, embeddings):
+        if embeddings is None or len(embeddings) == 0:
+            return
+        vectors = self._normalize(embeddings)
+        with self.lock:
+            self._reserve(len(vectors), vectors.shape[1])
+            self._matrix[self._size:self._size + len(vectors)] = vectors
+            self._size += len(vectors)
+
+    def append(self, embedding):
+        self.extend([embedding])
+
+    def max_similarity_batch(self, embeddings):
+        """
+        Highest cosine similarity of each query against the index (0.0 when the index is empty).
+        """
+        if len(embeddings) == 0:
+            return np.zeros(0, dtype=np.float32)
+        queries = self._normalize(embeddings)
+        with self.lock:
+            if self._size == 0:
+                return np.zeros(len(embeddings), dtype=np.float32)
+            return (queries @ self.matrix.T).max(axis=1)
+
+    def max_similarity(self, embedding):
+        return float(self.max_similarity_batch([embedding])[0])
+
+
 def filter_redundant_thoughts(
     new_thoughts: List[str],
     prev_thoughts: List[str],
-    prev_embeddings: List[List[float]],
-    threshold: float = 0.85
+    prev_embeddings: "ThoughtIndex | List[List[float]]",
+    threshold: float = 0.85,
+    new_embeddings: "List[List[float]] | None" = None
 ) -> Tuple[List[str], List[List[float]]]:
     """
     Filters out redundant thoughts based on similarity to previous thoughts.
-    
+
+    `prev_embeddings` should be a ThoughtIndex shared across calls; a plain list is still accepted
+    (and indexed on the fly). All new thoughts are checked against it in one batched query.
+    `new_embeddings` (aligned with `new_thoughts`) skips the embedding lookup when the caller has them.
+
     Returns only novel thoughts and their embeddings.
     """
-    if not prev_thoughts:
-        new_embeddings = [get_openai_embedding(t) for t in new_thoughts]
-        return new_thoughts, new_embeddings
+    if not new_thoughts:
+        return [], []
+
+    if not isinstance(prev_embeddings, ThoughtIndex):
+        prev_embeddings = ThoughtIndex(prev_embeddings)
+
+    if new_embeddings is None:
+        new_embeddings = get_cached_embeddings(new_thoughts, get_embeddings_batch)
+    if len(prev_embeddings) == 0:
+        return list(new_thoughts), new_embeddings
+
+    max_sims = prev_embeddings.max_similarity_batch(new_embeddings)
+    novel = [i for i, sim in enumerate(max_sims) if sim < threshold]
+    return [new_thoughts[i] for i in novel], [new_embeddings[i] for i in novel]
+
 
-    novel_thoughts = []
-    novel_embeddings = []
+# Guards histories passed as plain lists instead of a ThoughtIndex
+_plain_history_lock = threading.RLock()
 
-    for t in new_thoughts:
-        emb = get_cached_embedding(t, get_openai_embedding)
-        sims = cosine_similarity([emb], prev_embeddings)[0]
-        if max(sims, default=0) < threshold:
-            novel_thoughts.append(t)
-            novel_embeddings.append(emb)
 
+def filter_and_record_thoughts(
+    new_thoughts: List[str],
+    seen_thoughts: List[str],
+    seen_embeddings: "ThoughtIndex | List[List[float]]",
+    threshold: float = 0.85,
+    new_embeddings: "List[List[float]] | None" = None
+) -> Tuple[List[str], List[List[float]]]:
+    """
+    Filters `new_thoughts` against the shared history and records the novel ones in it.
+
+    Embeddings are fetched once, outside the lock (network call), unless the caller passes
+    `new_embeddings`; the redundancy check and the append to `seen_thoughts`/`seen_embeddings` then
+    happen atomically under the index lock, so two criteria running in parallel can never both
+    accept the same thought.
+    """
+    if not new_thoughts:
+        return [], []
+    if new_embeddings is None:
+        new_embeddings = get_cached_embeddings(new_thoughts, get_embeddings_batch)
+    lock = seen_embeddings.lock if isinstance(seen_embeddings, ThoughtIndex) else _plain_history_lock
+    with lock:
+        novel_thoughts, novel_embeddings = filter_redundant_thoughts(
+            new_thoughts, seen_thoughts, seen_embeddings, threshold, new_embeddings=new_embeddings
+        )
+        seen_thoughts.extend(novel_thoughts)
+        seen_embeddings.extend(novel_embeddings)
     return novel_thoughts, novel_embeddings
 
 
+def embed_thought_groups(groups: List[List[str]]) -> List[List[List[float]]]:
+    """
+    Embeds several groups of thoughts (e.g. one per ToT frontier node) with one batched call
+    (cache misses only) and returns the embeddings per group, to pass to
+    filter_and_record_thoughts(new_embeddings=...) without a second lookup.
+    """
+    flat = [t for group in groups for t in group]
+    embeddings = get_cached_embeddings(flat, get_embeddings_batch) if flat else []
+    per_group, start = [], 0
+    for group in groups:
+        per_group.append(embeddings[start:start + len(group)])
+        start += len(group)
+    return per_group
+
+
+# In-process layer in front of the persistent embedding store, keyed by (backend id, text)
 embedding_cache = {}
 embedding_cache_stats = {
     "hits": 0,
+    "store_hits": 0,
     "misses": 0
 }
+# Guards the cache and its counters (criteria and ToT threads embed concurrently); never held
+# during store reads or embedding calls
+_embedding_cache_lock = threading.Lock()
 
-def get_cached_embedding(text, get_embedding_fn):
-    global embedding_cache
-    if text in embedding_cache:
-        embedding_cache_stats["hits"] += 1
+def _embedding_namespace(namespace):
+    return namespace or get_embedding_backend().cache_id
+
+def get_cached_embedding(text, get_embedding_fn, namespace=None):
+    """
+    Returns the embedding for `text`: from memory, then the persistent store, else `get_embedding_fn`.
+    `namespace` identifies the backend/model that `get_embedding_fn` uses (defaults to the configured backend).
+    """
+    namespace = _embedding_namespace(namespace)
+    key = (namespace, text)
+    with _embedding_cache_lock:
+        embedding = embedding_cache.get(key)
+        if embedding is not None:
+            embedding_cache_stats["hits"] += 1
+    if embedding is not None:
         log_phase(f"🧠 Embedding cache hit: {text}")
-        return embedding_cache[text]
-    embedding = get_embedding_fn(text)
-    embedding_cache[text] = embedding
-    embedding_cache_stats["misses"] += 1
-    log_phase(f"🧠 Embedding cache miss: {text}")
+        return embedding
+    stored = get_stored_embeddings(namespace, [text])
+    if text in stored:
+        counter = "store_hits"
+        log_phase(f"🧠 Embedding store hit: {text}")
+        embedding = stored[text]
+    else:
+        counter = "misses"
+        embedding = get_embedding_fn(text)
+        store_embeddings(namespace, {text: embedding})
+        log_phase(f"🧠 Embedding cache miss: {text}")
+    with _embedding_cache_lock:
+        embedding_cache[key] = embedding
+        embedding_cache_stats[counter] += 1
     return embedding
 
+def get_cached_embeddings(texts, get_embeddings_batch_fn, namespace=None):
+    """
+    Batch version of get_cached_embedding(): serves texts from memory or the persistent store
+    and fetches all remaining misses with a single call to `get_embeddings_batch_fn`.
+    """
+    namespace = _embedding_namespace(namespace)
+    unique = list(dict.fromkeys(texts))
+    with _embedding_cache_lock:
+        found = {t: embedding_cache[(namespace, t)] for t in unique if (namespace, t) in embedding_cache}
+        not_in_memory = [t for t in unique if t not in found]
+        embedding_cache_stats["hits"] += len(texts) - len(not_in_memory)
+
+    stored = get_stored_embeddings(namespace, not_in_memory)
+    misses = [t for t in not_in_memory if t not in stored]
+    fresh = {}
+    if misses:
+        fresh = dict(zip(misses, get_embeddings_batch_fn(misses)))
+        store_embeddings(namespace, fresh)
+        log_phase(f"🧠 Embedding cache miss for {len(misses)} of {len(texts)} text(s) ({len(stored)} from store)")
+
+    found.update(stored)
+    found.update(fresh)
+    with _embedding_cache_lock:
+        for text in not_in_memory:
+            embedding_cache[(namespace, text)] = found[text]
+        embedding_cache_stats["store_hits"] += len(stored)
+        embedding_cache_stats["misses"] += len(misses)
+    return [found[t] for t in texts]
+
 def reset_embedding_cache():
-    global embedding_cache
-    embedding_cache.clear()
-    embedding_cache_stats["hits"] = 0
-    embedding_cache_stats["misses"] = 0
+    """
+    Clears the in-process layer and all counters (the persistent store is kept).
+    """
+    with _embedding_cache_lock:
+        embedding_cache.clear()
+    reset_embedding_cache_stats()
+
+def reset_embedding_cache_stats():
+    with _embedding_cache_lock:
+        for key in embedding_cache_stats:
+            embedding_cache_stats[key] = 0
+    reset_embedding_store_stats()
 
 def get_embedding_cache_stats():
-    return embedding_cache_stats.copy()
+    with _embedding_cache_lock:
+        return embedding_cache_stats.copy()
+
+def snapshot_embedding_cache_stats():
+    return {"cache": get_embedding_cache_stats(), "store": get_embedding_store_stats()}
+
+def merge_embedding_cache_stats(snapshot):
+    """
+    Adds counters from another process's snapshot_embedding_cache_stats() into this process.
+    """
+    with _embedding_cache_lock:
+        for key, value in snapshot.get("cache", {}).items():
+            embedding_cache_stats[key] = embedding_cache_stats.get(key, 0) + value
+    merge_embedding_store_stats(snapshot.get("store", {}))
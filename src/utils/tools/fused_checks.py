@@ -0,0 +1,123 @@
+# fused_checks.py – Dual-context review checks: shared tool wrapper + fused execution of several checks in one LLM call
+
+import functools
+import json
+import os
+from src.models.openai_interface import call_openai_with_tracking, call_openai_with_tools
+from src.server.prompt_builders import build_dual_context_prompt
+from src.utils.prompt_packer import TOOL_PROMPT_TOKEN_BUDGET
+from src.utils.logging_utils import log_phase
+
+# Run several auto-triggered checks for one criterion as a single call over the shared context
+FUSED_CHECKS_ENABLED = os.getenv("FUSED_CHECKS_ENABLED", "true").lower() not in ("0", "false", "no")
+FUSED_CHECKS_MAX_TOOLS = int(os.getenv("FUSED_CHECKS_MAX_TOOLS", "4"))
+FUSED_CHECK_TOKENS_PER_TOOL = 250
+
+# Instruction registry: tool name -> fn(agent, input_arg) returning the check's instructions
+DUAL_CONTEXT_CHECKS = {}
+
+
+def dual_context_check(build_instructions):
+    """
+    Decorator for review checks that read the section + proposal context and return a short critique.
+
+    The decorated function only returns its instructions; the wrapper builds the dual-context
+    prompt, calls the model and handles errors, so the tool keeps its (agent, input_arg) -> str
+    signature. The instructions are registered in DUAL_CONTEXT_CHECKS so run_fused_checks() can
+    answer several checks from one reading of the context.
+    """
+    @functools.wraps(build_instructions)
+    def run_check(agent, input_arg) -> str:
+        prompt = build_dual_context_prompt(build_instructions(agent, input_arg), agent)
+        messages = [{"role": "user", "content": prompt}]
+        try:
+            response = call_openai_with_tracking(messages)
+            return response.strip()
+        except Exception as e:
+            return f"An error occurred while processing the request: {str(e)}"
+
+    run_check.build_instructions = build_instructions
+    DUAL_CONTEXT_CHECKS[build_instructions.__name__] = build_instructions
+    return run_check
+
+
+def is_fusible_check(tool_fn):
+    return getattr(tool_fn, "build_instructions", None) is not None
+
+
+def _fused_result_schema(tool_names):
+    properties = {
+        name: {"type": "string", "description": f"Your answer to check `{name}`."}
+        for name in tool_names
+    }
+    return [{
+        "type": "function",
+        "function": {
+            "name": "report_check_results",
+            "description": "Report the answer to every check, one string per check.",
+            "parameters": {"type": "object", "properties": properties, "required": list(tool_names)},
+        },
+    }]
+
+
+def run_fused_checks(agent, checks, model="gpt-3.5-turbo"):
+    """
+    Answers several dual-context checks with one LLM call over the shared section/proposal context.
+
+    Parameters:
+    - agent: Provides section_text and full_proposal_text (as for a single check).
+    - checks (list): [(tool_name, tool_fn, input_arg)] where each tool_fn is a dual_context_check.
+    - model (str): OpenAI model.
+
+    Workflow:
+    1. Renders each check's own instructions under a numbered heading.
+    2. Builds one dual-context prompt; with retrieval, the context is the union of each check's top paragraphs.
+       The token budget is one tool budget per check, so each check's evidence fits as it would alone
+       (if the context still has to be cut, the packer logs it under "fused check prompt").
+    3. Forces a single function call whose arguments hold one answer string per check.
+
+    Returns:
+    - dict: {tool_name: answer} for checks that got a non-empty answer (missing ones are left out).
+
+    Raises:
+    - ValueError if the call failed or its arguments are not valid JSON.
+    """
+    names = [name for name, _, _ in checks]
+    check_instructions = [fn.build_instructions(agent, input_arg).strip() for _, fn, input_arg in checks]
+    instructions = (
+        f"You are running {len(checks)} independent review checks on the same vendor proposal. "
+        f"Read the context once, then answer every check on its own, as if it were asked alone. "
+        f"Report all answers in one call to `report_check_results`.\n\n"
+        + "\n\n".join(
+            f"### Check {i + 1}: {name}\n{text}" for i, (name, text) in enumerate(zip(names, check_instructions))
+        )
+    )
+    prompt = build_dual_context_prompt(
+        instructions, agent, retrieval_queries=check_instructions,
+        budget=TOOL_PROMPT_TOKEN_BUDGET * len(checks), label=f"fused check prompt ({len(checks)} checks)"
+    )
+    reply = call_openai_with_tools(
+        [{"role": "user", "content": prompt}],
+        _fused_result_schema(names),
+        model=model,
+        max_tokens=FUSED_CHECK_TOKENS_PER_TOOL * len(checks),
+        tool_choice={"type": "function", "function": {"name": "report_check_results"}},
+    )
+    if reply["error"] or not reply["tool_calls"]:
+        raise ValueError(reply["error"] or "Model did not report check results.")
+    try:
+        answers = json.loads(reply["tool_calls"][0]["arguments"])
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Fused check results are not valid JSON: {e}")
+    if not isinstance(answers, dict):
+        raise ValueError("Fused check results must be a JSON object.")
+
+    results = {}
+    for name in names:
+        answer = answers.get(name)
+        if isinstance(answer, str) and answer.strip():
+            results[name] = answer.strip()
+    missing = [name for name in names if name not in results]
+    if missing:
+        log_phase(f"⚠️ Fused call returned no answer for: {', '.join(missing)}")
+    return results
@@ -19,48 +19,38 @@ def get_relevant_tools(
     Parameters:
         criterion (str): Evaluation criterion (e.g., "Solution Fit").
         section_text (str): Section text from proposal.
-        tool_embeddings (Dict): Precomputed OpenAI embeddings for tools.
+        tool_embeddings (Dict): Precomputed tool embeddings (from the configured embedding backend).
         similarity_threshold (float): Cosine similarity threshold (0.0 to 1.0).
         query_embedding (List[float], optional): Pass this to avoid recomputing the query embedding.
+        filter_sections (List[str], optional): Only consider tools from these catalog sections.
         return_with_scores (bool): If True, return (tool_name, similarity) tuples.
         verbose (bool): If True, log matches and scores.
 
     Returns:
         List[str] or List[Tuple[str, float]]
     """
-    from src.models.openai_embeddings import get_openai_embedding
-    from sklearn.metrics.pairwise import cosine_similarity
+    from src.models.embedding_backends import get_embedding
+    from src.utils.tools.tool_embeddings import get_tool_embedding_index
     from src.utils.logging_utils import logger
 
     log_phase(f"🔍 Finding relevant tools for '{criterion}'...")
 
-    if not query_embedding:
+    if query_embedding is None:
         query = f"{criterion}: {section_text}"
-        query_embedding = get_openai_embedding(query)
+        query_embedding = get_embedding(query)
         log_phase(f"✅ Query embedding computed for '{criterion}'.")
         log_phase(f"Query: {query}")
 
-    matches = []
-
-    for tool_name, tool_emb in tool_embeddings.items():
-        # Optional section filtering
-        tool_meta = tool_catalog.get(tool_name, {})
-        if filter_sections and tool_meta.get("section") not in filter_sections:
-            continue
-        # Calculate cosine similarity
-        try:
-            score = round(cosine_similarity([query_embedding], [tool_emb])[0][0], 3)
-            log_phase(f"🔍 Tool: {tool_name} → score={score:.3f}")
-            if score >= similarity_threshold:
-                matches.append((tool_name, score))
-                if verbose:
-                    logger.debug(f"🔍 Relevant tool match: {tool_name} → score={score:.3f}")
-        except Exception as e:
-            if verbose:
-                logger.error(f"❌ Error calculating similarity for '{tool_name}': {e}")
-            continue  # Ensure failure of one tool doesn't interrupt rest
-
-    matches.sort(key=lambda x: x[1], reverse=True)
+    # Single matrix-vector product over all tools (section filter applied as a cached mask)
+    index = get_tool_embedding_index(tool_embeddings, tool_catalog)
+    matches = [
+        (tool_name, round(score, 3))
+        for tool_name, score in index.query(query_embedding, threshold=similarity_threshold, filter_sections=filter_sections)
+    ]
+    log_phase(f"🔍 {len(matches)} tool(s) above {similarity_threshold}: {matches[:5]}")
+    if verbose:
+        for tool_name, score in matches:
+            logger.debug(f"🔍 Relevant tool match: {tool_name} → score={score:.3f}")
 
     return matches if return_with_scores else [tool for tool, _ in matches]
 
@@ -1,46 +1,240 @@
 # Use embeddings to recommend tools that are most relevant to the proposal content.
 
-from openai import OpenAI
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from src.models.openai_embeddings import get_openai_embedding
+from src.models.embedding_backends import get_embedding, get_embeddings_batch, get_embedding_backend
 import os
-import pickle
+import json
+import hashlib
+import threading
+from pathlib import Path
 from src.utils.logging_utils import log_phase, log_result, print_tool_stats
+from src.utils.tools.tool_catalog_RFP import tool_catalog as rfp_tool_catalog
+
+TOOL_EMBEDDING_CACHE_VERSION = 3
+DEFAULT_TOOL_EMBEDDING_CACHE = "tool_embeddings_cache"
+
+# Embeddings already loaded in this process, keyed by cache location + catalog content
+_loaded_tool_embeddings = {}
+
+
+def _tool_embedding_text(meta):
+    # Safe fallback for missing 'examples'
+    description = meta.get("description", "")
+    examples = meta.get("examples", [])
+    return description + " " + " ".join(examples)
+
+
+def _content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_files(cache_path):
+    # Accept legacy "*.pkl" paths: the versioned cache lives next to it as <stem>.npy + <stem>.json
+    base = Path(cache_path)
+    if base.suffix in (".pkl", ".npy", ".json"):
+        base = base.with_suffix("")
+    return base.with_name(base.name + ".npy"), base.with_name(base.name + ".json")
+
+
+def _load_tool_embedding_cache(matrix_path, manifest_path, backend):
+    """
+    Returns (manifest, memmapped matrix) if a compatible cache exists, else (None, None).
+    """
+    if not (matrix_path.exists() and manifest_path.exists()):
+        return None, None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if (manifest.get("version") != TOOL_EMBEDDING_CACHE_VERSION
+                or manifest.get("backend") != backend.name or manifest.get("model") != backend.model):
+            log_phase("♻️ Tool embedding cache is from another version/backend/model. Rebuilding.")
+            return None, None
+        matrix = np.load(matrix_path, mmap_mode="r")
+        return manifest, matrix
+    except Exception as e:
+        log_phase(f"⚠️ Could not read tool embedding cache ({e}). Rebuilding.")
+        return None, None
+
+
+def _save_tool_embedding_cache(matrix_path, manifest_path, matrix, manifest):
+    # Write to temp files and swap in, so readers never see a half-written cache
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_matrix = matrix_path.with_name(matrix_path.name + ".tmp")
+    with open(tmp_matrix, "wb") as f:
+        np.save(f, matrix)
+    tmp_manifest = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_matrix, matrix_path)
+    os.replace(tmp_manifest, manifest_path)
+
 
 # Convert tool catalog into embeddings (one for each tool)
 # Cache for future use
-def build_tool_embeddings(tool_catalog, cache_path="tool_embeddings_cache.pkl"):
-    # If cached, load from file
-    if os.path.exists(cache_path):
-        with open(cache_path, "rb") as f:
-            log_phase("✅ Loaded cached tool embeddings.")
-            return pickle.load(f)
-
-    # Otherwise, generate and cache
-    log_phase("⚙️ Generating tool embeddings...")
-    tool_embeddings = {}
-    for name, meta in tool_catalog.items():
-        # Safe fallback for missing 'examples'
-        description = meta.get("description", "")
-        examples = meta.get("examples", [])
-        text = description + " " + " ".join(examples)
-        embedding = get_openai_embedding(text)
-        tool_embeddings[name] = embedding
-
-    with open(cache_path, "wb") as f:
-        pickle.dump(tool_embeddings, f)
-        log_phase(f"✅ Saved embeddings to: {cache_path}")
+def build_tool_embeddings(tool_catalog, cache_path=None, backend=None):
+    """
+    Returns {tool_name: embedding} for every tool in the catalog, backed by a versioned on-disk cache.
+
+    The cache is a float32 matrix (`<cache_path>.npy`) plus a JSON manifest (`<cache_path>.json`)
+    recording the embedding backend + model and, per tool, a hash of its description + examples and
+    its row in the matrix. Only tools that were added or whose text changed are re-embedded; removed
+    tools are dropped. The matrix is loaded memory-mapped, so returned vectors are zero-copy row views.
+
+    Each backend/model gets its own default cache file (e.g. tool_embeddings_cache_local-all-MiniLM-L6-v2),
+    so switching EMBEDDING_BACKEND never mixes vectors from different embedding spaces.
+    """
+    backend = backend or get_embedding_backend()
+    cache_path = cache_path or f"{DEFAULT_TOOL_EMBEDDING_CACHE}_{backend.cache_id}"
+    matrix_path, manifest_path = _cache_files(cache_path)
+    texts = {name: _tool_embedding_text(meta) for name, meta in tool_catalog.items()}
+    hashes = {name: _content_hash(text) for name, text in texts.items()}
 
+    memo_key = (str(matrix_path.resolve()), backend.cache_id, tuple(sorted(hashes.items())))
+    if memo_key in _loaded_tool_embeddings:
+        return _loaded_tool_embeddings[memo_key]
+
+    manifest, matrix = _load_tool_embedding_cache(matrix_path, manifest_path, backend)
+    cached_tools = manifest["tools"] if manifest else {}
+    stale = [name for name in texts if cached_tools.get(name, {}).get("hash") != hashes[name]]
+    removed = [name for name in cached_tools if name not in texts]
+
+    if manifest and not stale and not removed:
+        log_phase("✅ Loaded cached tool embeddings.")
+    else:
+        log_phase(f"⚙️ Generating tool embeddings for {len(stale)} new/changed tool(s) ({len(removed)} removed)...")
+        # One batched request for all new/changed tools instead of one round-trip per tool
+        fresh = dict(zip(stale, get_embeddings_batch([texts[name] for name in stale], backend=backend)))
+        rows = [
+            np.asarray(fresh[name], dtype=np.float32) if name in fresh else np.asarray(matrix[cached_tools[name]["row"]], dtype=np.float32)
+            for name in texts
+        ]
+        new_matrix = np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+        manifest = {
+            "version": TOOL_EMBEDDING_CACHE_VERSION,
+            "backend": backend.name,
+            "model": backend.model,
+            "dimensions": int(new_matrix.shape[1]) if rows else 0,
+            "tools": {name: {"hash": hashes[name], "row": i} for i, name in enumerate(texts)},
+        }
+        del matrix  # release the old memmap before replacing the file
+        _save_tool_embedding_cache(matrix_path, manifest_path, new_matrix, manifest)
+        log_phase(f"✅ Saved embeddings to: {matrix_path}")
+        matrix = np.load(matrix_path, mmap_mode="r")
+
+    tool_embeddings = {name: matrix[manifest["tools"][name]["row"]] for name in texts}
+    _loaded_tool_embeddings[memo_key] = tool_embeddings
     return tool_embeddings
 
 
+class ToolEmbeddingIndex:
+    """
+    Pre-normalized float32 matrix of all tool embeddings for fast relevance lookups.
+
+    Purpose:
+    Replaces per-tool cosine_similarity loops with a single matrix-vector product. Rows are
+    L2-normalized once at build time, so cosine similarity is just `matrix @ query`. Section
+    masks (from the tool catalog's "section" field) are cached for filter_sections queries.
+
+    Parameters:
+    - tool_embeddings (dict): {tool_name: embedding vector}.
+    - tool_catalog (dict): Optional catalog used to look up each tool's section.
+    """
+
+    def __init__(self, tool_embeddings, tool_catalog=None):
+        tool_catalog = tool_catalog or {}
+        self.tool_names = list(tool_embeddings.keys())
+        self.matrix = self._normalize(np.asarray([tool_embeddings[name] for name in self.tool_names], dtype=np.float32))
+        self.sections = np.array([tool_catalog.get(name, {}).get("section") for name in self.tool_names], dtype=object)
+        self._section_masks = {}
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def __len__(self):
+        return len(self.tool_names)
+
+    def section_mask(self, filter_sections=None):
+        if not filter_sections:
+            return None
+        key = tuple(sorted(filter_sections))
+        if key not in self._section_masks:
+            self._section_masks[key] = np.isin(self.sections, list(key))
+        return self._section_masks[key]
+
+    def scores_batch(self, query_embeddings):
+        """
+        Cosine similarity of each query against every tool. Shape: (n_queries, n_tools).
+        """
+        if not self.tool_names:
+            return np.zeros((len(query_embeddings), 0), dtype=np.float32)
+        return self._normalize(query_embeddings) @ self.matrix.T
+
+    def scores(self, query_embedding):
+        return self.scores_batch([query_embedding])[0]
+
+    def _rank(self, scores, top_k=None, threshold=None, filter_sections=None):
+        candidates = np.arange(len(scores))
+        mask = self.section_mask(filter_sections)
+        if mask is not None:
+            candidates = candidates[mask]
+        if threshold is not None:
+            candidates = candidates[scores[candidates] >= threshold]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        return [(self.tool_names[i], float(scores[i])) for i in ranked]
+
+    def query(self, query_embedding, top_k=None, threshold=None, filter_sections=None):
+        """
+        Returns [(tool_name, score), ...] sorted by descending similarity.
+        """
+        return self._rank(self.scores(query_embedding), top_k, threshold, filter_sections)
+
+    def query_batch(self, query_embeddings, top_k=None, threshold=None, filter_sections=None):
+        """
+        Scores many queries in one matrix product; returns one ranked list per query.
+        """
+        all_scores = self.scores_batch(query_embeddings)
+        return [self._rank(scores, top_k, threshold, filter_sections) for scores in all_scores]
+
+
+# Most recently built index and the (name, vector) entries it was built from. Holding the vectors
+# keeps their ids from being reused, so an identity check per entry spots added, removed or replaced tools.
+_index_cache = {"entries": None, "catalog": None, "index": None}
+_index_cache_lock = threading.Lock()  # criteria and ToT threads look up the index concurrently
+
+
+def _index_matches(tool_embeddings, tool_catalog):
+    entries = _index_cache["entries"]
+    if entries is None or _index_cache["catalog"] is not tool_catalog or len(entries) != len(tool_embeddings):
+        return False
+    return all(
+        name == cached_name and vector is cached_vector
+        for (name, vector), (cached_name, cached_vector) in zip(tool_embeddings.items(), entries)
+    )
+
+
+def get_tool_embedding_index(tool_embeddings, tool_catalog=None):
+    """
+    Returns a ToolEmbeddingIndex for `tool_embeddings`, rebuilding only when its tools or vectors changed
+    (also when the same dict was modified in place). Sections are read from the RFP tool catalog unless
+    another catalog is given.
+    """
+    tool_catalog = tool_catalog if tool_catalog is not None else rfp_tool_catalog
+    with _index_cache_lock:
+        if not _index_matches(tool_embeddings, tool_catalog):
+            _index_cache.update(
+                entries=list(tool_embeddings.items()),
+                catalog=tool_catalog,
+                index=ToolEmbeddingIndex(tool_embeddings, tool_catalog)
+            )
+        return _index_cache["index"]
+
+
 # Main function to get top-N matches
 def suggest_tools_by_embedding(query, tool_embeddings, top_n=5):
-    query_embedding = get_openai_embedding(query)
-    scores = {
-        tool: cosine_similarity([query_embedding], [embed])[0][0]
-        for tool, embed in tool_embeddings.items()
-    }
-    top_matches = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    return top_matches
+    query_embedding = get_embedding(query)
+    index = get_tool_embedding_index(tool_embeddings)
+    return index.query(query_embedding, top_k=top_n)
@@ -0,0 +1,125 @@
+# tool_schemas.py – OpenAI function-calling schemas for ReAct steps, built from tool_catalog + TOOL_FUNCTION_MAP
+
+import json
+from src.utils.tools.tool_catalog_RFP import tool_catalog
+from src.utils.tools.tool_dispatch import TOOL_FUNCTION_MAP
+
+# Control actions the ReAct loop understands besides the registered tools
+CONTROL_ACTIONS = {
+    "summarize": "Finish the evaluation of this criterion when enough evidence has been gathered.",
+}
+
+THOUGHT_PROPERTY = {
+    "type": "string",
+    "description": "Your reasoning for this step: what you want to verify and why this tool helps.",
+}
+
+
+def _tool_description(tool_name, tool_fn, catalog):
+    meta = catalog.get(tool_name, {})
+    description = meta.get("description") or (tool_fn.__doc__ or "").strip().split("\n")[0] or tool_name
+    examples = meta.get("examples") or []
+    if examples:
+        description += f" Example: {examples[0]}"
+    return description[:1024]
+
+
+def build_react_tool_schemas(catalog=None, tool_map=None):
+    """
+    Builds the `tools` list for a chat completion: one function per dispatchable tool plus the control actions.
+
+    Purpose:
+    In structured mode the model answers a ReAct step by calling one of these functions instead of
+    writing "Thought:/Action:" lines, so the step always arrives as JSON arguments that can be
+    validated (parse_react_tool_call) and dispatched without re-parsing an action string.
+
+    Parameters:
+    - catalog (dict): Tool metadata (descriptions, examples). Default: tool_catalog.
+    - tool_map (dict): {tool_name: {"fn", "args"}}. Default: TOOL_FUNCTION_MAP. Only these tools are offered.
+
+    Returns:
+    - list: OpenAI tool definitions ({"type": "function", "function": {...}}).
+    """
+    catalog = catalog if catalog is not None else tool_catalog
+    tool_map = tool_map if tool_map is not None else TOOL_FUNCTION_MAP
+
+    schemas = []
+    for tool_name, entry in tool_map.items():
+        properties = {"thought": THOUGHT_PROPERTY}
+        required = ["thought"]
+        if "input_arg" in entry.get("args", []):
+            properties["input"] = {
+                "type": "string",
+                "description": "Text to check: a claim, quote or focus from the proposal.",
+            }
+            required.append("input")
+        schemas.append({
+            "type": "function",
+            "function": {
+                "name": tool_name,
+                "description": _tool_description(tool_name, entry["fn"], catalog),
+                "parameters": {"type": "object", "properties": properties, "required": required},
+            },
+        })
+
+    for action, description in CONTROL_ACTIONS.items():
+        schemas.append({
+            "type": "function",
+            "function": {
+                "name": action,
+                "description": description,
+                "parameters": {"type": "object", "properties": {"thought": THOUGHT_PROPERTY}, "required": ["thought"]},
+            },
+        })
+    return schemas
+
+
+def parse_react_tool_call(tool_call, tool_map=None):
+    """
+    Validates a function call returned by the model and turns it into a ReAct step.
+
+    Parameters:
+    - tool_call (dict): {"name": str, "arguments": JSON string or dict}.
+    - tool_map (dict): Dispatchable tools. Default: TOOL_FUNCTION_MAP.
+
+    Returns:
+    - dict: {"thought": str, "tool": str, "args": {"input": str, ...}}
+
+    Raises:
+    - ValueError if the tool is unknown, the arguments are not a JSON object, or required fields are missing.
+    """
+    tool_map = tool_map if tool_map is not None else TOOL_FUNCTION_MAP
+    if not tool_call:
+        raise ValueError("Model did not call a tool.")
+
+    name = tool_call.get("name")
+    if name not in tool_map and name not in CONTROL_ACTIONS:
+        raise ValueError(f"Unknown tool '{name}'.")
+
+    arguments = tool_call.get("arguments") or {}
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Arguments for '{name}' are not valid JSON: {e}")
+    if not isinstance(arguments, dict):
+        raise ValueError(f"Arguments for '{name}' must be a JSON object.")
+
+    thought = arguments.pop("thought", None)
+    if not isinstance(thought, str) or not thought.strip():
+        raise ValueError(f"Call to '{name}' has no thought.")
+
+    needs_input = name in tool_map and "input_arg" in tool_map[name].get("args", [])
+    if needs_input and not isinstance(arguments.get("input"), str):
+        raise ValueError(f"Call to '{name}' is missing its 'input' argument.")
+
+    return {"thought": thought.strip(), "tool": name, "args": arguments}
+
+
+def format_action(step):
+    """
+    Renders a structured step as the classic action string (tool["input"]) used in history and reports.
+    """
+    if "input" in step["args"]:
+        return f'{step["tool"]}["{step["args"]["input"]}"]'
+    return step["tool"]
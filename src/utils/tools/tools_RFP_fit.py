@@ -1,6 +1,6 @@
-from src.models.openai_interface import call_openai_with_tracking
-from src.server.prompt_builders import build_dual_context_prompt
+from src.utils.tools.fused_checks import dual_context_check
 
+@dual_context_check
 def evaluate_product_fit(agent, input_arg) -> str:
     """
     Checks how well the product functionality aligns with the requirements.
@@ -12,14 +12,9 @@ def evaluate_product_fit(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
     
+@dual_context_check
 def evaluate_nfr_support(agent, input_arg) -> str:
     """
     Evaluates support for non-functional requirements (NFRs): privacy, security, accessibility, UX, etc.
@@ -31,14 +26,9 @@ def evaluate_nfr_support(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
+@dual_context_check
 def evaluate_modularity_and_scalability(agent, input_arg) -> str:
     """
     Evaluates if the solution is modular and scalable across business lines.
@@ -50,15 +40,10 @@ def evaluate_modularity_and_scalability(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_product_roadmap(agent, input_arg) -> str:
     """
     Checks if the proposal includes a product roadmap aligned with client needs and long-term evolution.
@@ -70,15 +55,10 @@ def check_product_roadmap(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def evaluate_demos_and_proofs(agent, input_arg) -> str:
     """
     Checks for demos, case studies, pilots, or outcomes that support product claims.
@@ -90,11 +70,5 @@ def evaluate_demos_and_proofs(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
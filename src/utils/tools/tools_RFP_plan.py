@@ -1,6 +1,6 @@
-from src.models.openai_interface import call_openai_with_tracking
-from src.server.prompt_builders import build_dual_context_prompt
+from src.utils.tools.fused_checks import dual_context_check
 
+@dual_context_check
 def check_implementation_milestones(agent, input_arg) -> str:
     """
     Checks if the proposal outlines clear implementation milestones or phases.
@@ -12,14 +12,9 @@ def check_implementation_milestones(agent, input_arg) -> str:
         "Query: "
         f"{input_arg}\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
+@dual_context_check
 def check_resource_plan_realism(agent, input_arg) -> str:
     """
     Evaluates whether the proposed staffing and resource plan appears realistic for the scope of work.
@@ -30,14 +25,9 @@ def check_resource_plan_realism(agent, input_arg) -> str:
         "Query: "
         f"{input_arg}\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
+@dual_context_check
 def check_assumption_reasonableness(agent, input_arg) -> str:
     """
     Evaluates whether the assumptions in the implementation plan are reasonable and realistic.
@@ -48,15 +38,10 @@ def check_assumption_reasonableness(agent, input_arg) -> str:
         "Query: "
         f"{input_arg}\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_timeline_feasibility(agent, input_arg) -> str:
     """
     Evaluates whether the assumptions in the implementation plan are reasonable and realistic.
@@ -67,14 +52,9 @@ def check_timeline_feasibility(agent, input_arg) -> str:
         "Query: "
         f"{input_arg}\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
+@dual_context_check
 def check_contingency_plans(agent, input_arg) -> str:
     """
     Evaluates if the proposal includes contingency plans or risk mitigation strategies.
@@ -86,10 +66,4 @@ def check_contingency_plans(agent, input_arg) -> str:
         "Query: "
         f"{input_arg}\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
@@ -1,6 +1,6 @@
-from src.models.openai_interface import call_openai_with_tracking
-from src.server.prompt_builders import build_dual_context_prompt
+from src.utils.tools.fused_checks import dual_context_check
 
+@dual_context_check
 def check_data_privacy_and_security_measures(agent, input_arg) -> str:
     """
     Checks whether the proposal includes clear and adequate data privacy and security protections.
@@ -12,15 +12,10 @@ def check_data_privacy_and_security_measures(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_risk_register_or_mitigation_plan(agent, input_arg) -> str:
     """
     Checks whether a formal risk register or mitigation plan is included and appropriate.
@@ -32,15 +27,10 @@ def check_risk_register_or_mitigation_plan(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_compliance_certifications(agent, input_arg) -> str:
     """
     Checks for the presence of relevant compliance certifications (ISO, SOC 2, HIPAA, etc.).
@@ -52,12 +42,6 @@ def check_compliance_certifications(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
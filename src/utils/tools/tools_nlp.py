@@ -3,10 +3,9 @@
 # Tool to check for jargon or technical terms in a section
 
 import re
-from textstat.textstat import textstat
-import spacy
 from src.models.openai_interface import call_openai_with_tracking
 from src.server.prompt_builders import build_dual_context_prompt
+from src.utils.proposal_artifacts import get_proposal_artifacts
 
 
 def check_for_jargon(agent) -> str:
@@ -30,11 +29,12 @@ def check_for_jargon(agent) -> str:
 # Flesch Reading Ease: higher score indicates easier readability
 # Reading Level Estimate: grade level of text
 # Difficult Words Count: number of difficult words in the text
+# (computed once per proposal, see proposal_artifacts.py)
 def check_readability(agent):
-    full_proposal_text = agent.full_proposal_text
-    score = textstat.flesch_reading_ease(full_proposal_text)
-    level = textstat.text_standard(full_proposal_text)
-    difficult = textstat.difficult_words(full_proposal_text)
+    readability = get_proposal_artifacts(agent.full_proposal_text).readability
+    score = readability["flesch_reading_ease"]
+    level = readability["text_standard"]
+    difficult = readability["difficult_words"]
 
     summary = (
         f"📖 **Flesch Reading Ease**: {score:.1f} (higher = easier)\n"
@@ -55,8 +55,8 @@ def analyze_tone_textblob(agent):
     section_text (str): The text of the section to be analyzed.
 
     Workflow:
-    1. Creates a TextBlob object from the section text.
-    2. Extracts the polarity and subjectivity scores from the TextBlob object.
+    1. Reads the TextBlob sentiment of the proposal from its shared ProposalArtifacts (computed once per proposal).
+    2. Extracts the polarity and subjectivity scores.
     3. Determines the tone based on the polarity score:
        - If polarity > 0.2, the tone is positive.
        - If polarity < -0.2, the tone is negative.
@@ -69,10 +69,9 @@ def analyze_tone_textblob(agent):
     Returns:
     str: A formatted string indicating the tone and clarity of the text, including the polarity and subjectivity scores.
     """
-    full_proposal_text = agent.full_proposal_text
-    blob = TextBlob(full_proposal_text)
-    polarity = blob.sentiment.polarity
-    subjectivity = blob.sentiment.subjectivity
+    sentiment = get_proposal_artifacts(agent.full_proposal_text).sentiment
+    polarity = sentiment["polarity"]
+    subjectivity = sentiment["subjectivity"]
 
     tone = "neutral"
     if polarity > 0.2:
@@ -87,9 +86,6 @@ def analyze_tone_textblob(agent):
         f"🧠 **Clarity**: {clarity} (subjectivity: {subjectivity:.2f})"
     )
 
-# Load the spaCy NLP model
-nlp = spacy.load("en_core_web_sm")
-
 def extract_named_entities(agent):
     """
     Extracts named entities from a given text section using a preloaded NLP model.
@@ -101,29 +97,22 @@ def extract_named_entities(agent):
     section_text (str): The text of the section to be analyzed for named entities.
 
     Workflow:
-    1. Processes the input text using the preloaded NLP model (`nlp`).
+    1. Reads the proposal's entities from its shared ProposalArtifacts (one spaCy pass per proposal).
     2. Checks if any named entities are detected in the text.
        - If no entities are found, returns a message indicating no named entities were detected.
-    3. Iterates through the detected entities and groups them by their labels (e.g., PERSON, ORG, DATE).
-    4. Removes duplicate entities within each label and limits the output to the first 5 unique entities per label.
+    3. Uses the entities grouped by their labels (e.g., PERSON, ORG, DATE), without duplicates.
+    4. Limits the output to the first 5 unique entities per label.
     5. Constructs a formatted summary of the detected entities, grouped by their labels.
 
     Returns:
     str: A formatted string summarizing the detected named entities, grouped by their labels. If no entities are found, returns a message indicating this.
     """
-    proposal_text = agent.full_proposal_text
-    doc = nlp(proposal_text)
-    if not doc.ents:
+    entity_summary = get_proposal_artifacts(agent.full_proposal_text).entities
+    if not entity_summary:
         return "No named entities found."
 
-    entity_summary = {}
-    for ent in doc.ents:
-        label = ent.label_
-        entity_summary.setdefault(label, []).append(ent.text)
-
     result = "🧾 **Named Entities Detected:**\n"
-    for label, values in entity_summary.items():
-        unique_vals = list(set(values))
+    for label, unique_vals in entity_summary.items():
         result += f"- **{label}**: {', '.join(unique_vals[:5])}\n"
 
     return result
@@ -1,6 +1,6 @@
-from src.models.openai_interface import call_openai_with_tracking
-from src.server.prompt_builders import build_dual_context_prompt
+from src.utils.tools.fused_checks import dual_context_check
 
+@dual_context_check
 def evaluate_collaboration_approach(agent, input_arg) -> str:
     instructions = f"""
 You are reviewing a proposal's section on team or collaboration.
@@ -16,15 +16,10 @@ Return a 2-3 sentence evaluation.
 Query: {input_arg}
 ------------------
 """
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_discovery_approach(agent, input_arg) -> str:
     """
     Evaluates whether the vendor has a clear and effective approach for the Discovery phase.
@@ -37,15 +32,10 @@ def check_discovery_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_requirements_approach(agent, input_arg) -> str:
     """
     Evaluates whether the vendor has a clear and effective approach for the Discovery phase.
@@ -58,15 +48,10 @@ def check_requirements_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_design_approach(agent, input_arg) -> str:
     """
     Evaluates whether the vendor has a clear and effective approach for the Discovery phase.
@@ -79,15 +64,10 @@ def check_design_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_build_approach(agent, input_arg) -> str:
     """
     Evaluates whether the vendor has a clear and effective approach for the Design phase.
@@ -100,14 +80,9 @@ def check_build_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
+@dual_context_check
 def check_test_approach(agent, input_arg) -> str:
     """
     Evaluates the vendor’s testing methodology and practices.
@@ -120,15 +95,10 @@ def check_test_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_deployment_approach(agent, input_arg) -> str:
     """
     Evaluates the vendor’s deployment approach and readiness strategy.
@@ -140,15 +110,10 @@ def check_deployment_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_operate_approach(agent, input_arg) -> str:
     """
     Evaluates the vendor’s approach to operations, sustainment, and continuous improvement.
@@ -160,21 +125,16 @@ def check_operate_approach(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_agile_compatibility(agent, input_arg) -> str:
     """
     Checks whether the vendor's use of agile is structured and compatible with client needs,
     including things like agile with fixed price or hybrid models.
     """
-    prompt = (
+    instructions = (
         "Evaluate the vendor's use of Agile in their delivery methodology. "
         "Is Agile used in a structured and disciplined way? Does it integrate with client governance models? "
         "Is it compatible with fixed-price contracts or evolving scope? "
@@ -183,15 +143,10 @@ def check_agile_compatibility(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(prompt, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
 
 
+@dual_context_check
 def check_accelerators_and_tools(agent, input_arg) -> str:
     """
     Evaluates whether the vendor includes accelerators, templates, or proprietary tools
@@ -205,10 +160,4 @@ def check_accelerators_and_tools(agent, input_arg) -> str:
         f"{input_arg}\n\n"
         "------------------\n"
     )
-    prompt = build_dual_context_prompt(instructions, agent)
-    messages = [{"role": "user", "content": prompt}]
-    try:
-        response = call_openai_with_tracking(messages)
-        return response.strip()
-    except Exception as e:
-        return f"An error occurred while processing the request: {str(e)}"
+    return instructions
@@ -2,13 +2,9 @@
 
 # Tool to search the web for relevant information
 
-from duckduckgo_search import DDGS
+# Search client libraries (duckduckgo_search, langchain_community, serpapi) are imported inside
+# each tool, so importing this module (via react_agent) stays cheap
 from src.models.openai_interface import call_openai_with_tracking
-from serpapi import GoogleSearch  # Import GoogleSearch from SerpAPI
-from dotenv import load_dotenv
-from langchain_community.utilities import SerpAPIWrapper
-from langchain_community.tools import ArxivQueryRun # for querying ArXiv
-from langchain_community.utilities.arxiv import ArxivAPIWrapper # for querying ArXiv
 import re
 import os
 
@@ -34,6 +30,7 @@ def search_web(query, max_results=1):
     str: The snippet of the first search result, or a message indicating no relevant results were found or the web search failed.
     """
     try:
+        from duckduckgo_search import DDGS
         with DDGS() as ddgs:
             results = ddgs.text(query, max_results=max_results)
             for r in results:
@@ -69,6 +66,7 @@ def search_serpapi(query, agent):
     serpapi_key = os.getenv("SERPAPI_KEY", None)
     if not serpapi_key:
         raise ValueError("Missing SerpAPI key.")
+    from langchain_community.utilities import SerpAPIWrapper
     serp_tool = SerpAPIWrapper(serpapi_api_key=serpapi_key)
         
     try:
@@ -145,6 +143,8 @@ def search_arxiv(query, agent):
     Returns:
     str: The search results from arXiv if successful, or an error message if the search fails.
     """
+    from langchain_community.tools import ArxivQueryRun # for querying ArXiv
+    from langchain_community.utilities.arxiv import ArxivAPIWrapper # for querying ArXiv
     arxiv_tool = ArxivQueryRun(api_wrapper=ArxivAPIWrapper(load_max_docs=3))
 
     try:
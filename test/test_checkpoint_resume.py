@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.server import multi_agent_rfpevalrunner as runner
+from src.utils.checkpoint_store import CheckpointStore
+
+
+def test_checkpoint_store_round_trip(tmp_path):
+    store = CheckpointStore(tmp_path / "checkpoint.sqlite")
+    store.save_run_inputs({"proposals": {"Vendor A": "a"}, "rfp_criteria": [{"name": "Cost"}], "model": "m"})
+    store.save_criterion_result("Vendor A", "Cost", {"proposal_score": 7, "reasoning_trace": {"missing_tools": [("check_cost", 0.8)]}})
+    store.save_vendor_summary("Vendor A", 7.0, "SWOT")
+    store.close()
+
+    reopened = CheckpointStore(tmp_path / "checkpoint.sqlite")
+    assert reopened.load_run_inputs()["model"] == "m"
+    assert reopened.get_criterion_result("Vendor A", "Cost")["reasoning_trace"]["missing_tools"] == [["check_cost", 0.8]]
+    assert reopened.get_criterion_result("Vendor A", "Team") is None
+    assert reopened.completed_criteria() == {("Vendor A", "Cost")}
+    assert reopened.get_vendor_summary("Vendor A") == (7.0, "SWOT")
+    reopened.close()
+
+
+@patch("src.server.multi_agent_rfpevalrunner.finalize_evaluation_run", return_value="log.md")
+@patch("src.server.multi_agent_rfpevalrunner.save_markdown_and_pdf", return_value={})
+@patch("src.server.multi_agent_rfpevalrunner.generate_final_comparison_summary", return_value=("## Final", "| table |"))
+@patch("src.server.multi_agent_rfpevalrunner.export_proposal_report", return_value={"md": "report.md"})
+@patch("src.server.proposal_eval.call_openai_with_tracking", return_value="SWOT")
+@patch("src.server.proposal_eval.build_tool_embeddings", return_value={})
+@patch("src.server.proposal_eval.preprocess_proposal_for_criteria_with_threshold", return_value={})
+@patch("src.server.proposal_eval.evaluate_single_criterion")
+def test_resume_run_skips_completed_vendor_criterion_pairs(mock_single, mock_preprocess, mock_build, mock_swot,
+                                                           mock_export, mock_summary, mock_save, mock_finalize,
+                                                           tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    evaluated = []
+    fail_once = {"Vendor B text:Team"}
+
+    def fake_single_criterion(criterion, proposal_text, **kwargs):
+        key = f"{proposal_text}:{criterion}"
+        if key in fail_once:
+            fail_once.discard(key)
+            raise RuntimeError("OpenAI timeout")
+        evaluated.append(key)
+        return {"criterion": criterion, "proposal_score": 8, "proposal_explanation": "ok", "reasoning_trace": {"score": 8}}
+
+    mock_single.side_effect = fake_single_criterion
+    proposals = {"Vendor A": "Vendor A text", "Vendor B": "Vendor B text"}
+    criteria = [{"name": "Cost"}, {"name": "Team"}]
+
+    with pytest.raises(RuntimeError):
+        runner.run_multi_proposal_evaluation(proposals, rfp_criteria=criteria, run_id="run-1")
+    assert evaluated == ["Vendor A text:Cost", "Vendor A text:Team", "Vendor B text:Cost"]
+    assert mock_swot.call_count == 1  # Vendor A's SWOT
+    failed_store = CheckpointStore(tmp_path / "proposal_eval_reports" / "run-1" / "checkpoint.sqlite")
+    assert failed_store.get_status() == "failed"  # Vendor B's failure is recorded, not left "running"
+    failed_store.close()
+
+    evaluated.clear()
+    output = runner.resume_run("run-1")
+
+    assert evaluated == ["Vendor B text:Team"]  # only the missing pair is re-evaluated
+    assert mock_swot.call_count == 2  # Vendor A's SWOT is reused from the checkpoint
+    assert [e["vendor_name"] for e in output["evaluations"]] == ["Vendor A", "Vendor B"]
+    assert [r["reasoning_trace"] for r in output["evaluations"][0]["results"]] == [{"score": 8}, {"score": 8}]
+    assert CheckpointStore(tmp_path / "proposal_eval_reports" / "run-1" / "checkpoint.sqlite").get_status() == "completed"
+
+    with pytest.raises(ValueError):
+        runner.resume_run("unknown-run")
+    assert not (tmp_path / "proposal_eval_reports" / "unknown-run").exists()
+
+    # A fresh run never reads checkpoints: an existing run id is refused instead of silently reused
+    with pytest.raises(ValueError):
+        runner.run_multi_proposal_evaluation(proposals, rfp_criteria=criteria, run_id="run-1")
+    assert evaluated == ["Vendor B text:Team"]
+
+
+@patch("src.server.multi_agent_rfpevalrunner.parse_rfp_from_file", return_value={"criteria": [{"name": "Cost"}, {"name": "Team"}]})
+@patch("src.server.multi_agent_rfpevalrunner.finalize_evaluation_run", return_value="log.md")
+@patch("src.server.multi_agent_rfpevalrunner.save_markdown_and_pdf", return_value={})
+@patch("src.server.multi_agent_rfpevalrunner.generate_final_comparison_summary", return_value=("## Final", "| table |"))
+@patch("src.server.multi_agent_rfpevalrunner.export_proposal_report", return_value={"md": "report.md"})
+@patch("src.server.proposal_eval.call_openai_with_tracking", return_value="SWOT")
+@patch("src.server.proposal_eval.build_tool_embeddings", return_value={})
+@patch("src.server.proposal_eval.preprocess_proposal_for_criteria_with_threshold", return_value={})
+@patch("src.server.proposal_eval.evaluate_single_criterion")
+def test_requeued_job_continues_its_interrupted_run(mock_single, mock_preprocess, mock_build, mock_swot, mock_export,
+                                                    mock_summary, mock_save, mock_finalize, mock_parse_rfp, tmp_path, monkeypatch):
+    from src.server.rfp_app import run_evaluation_job
+
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    evaluated = []
+    fail_once = {"Team"}  # the first attempt dies after one criterion
+
+    def fake_single_criterion(criterion, proposal_text, **kwargs):
+        if criterion in fail_once:
+            fail_once.discard(criterion)
+            raise RuntimeError("server restarted")
+        evaluated.append(criterion)
+        return {"criterion": criterion, "proposal_score": 8, "proposal_explanation": "ok", "reasoning_trace": {}}
+
+    mock_single.side_effect = fake_single_criterion
+    payload = {"proposals": {"Vendor A": "a"}, "rfp_text": "RFP", "run_id": "job-run"}
+    with pytest.raises(RuntimeError):
+        run_evaluation_job(payload, lambda p, m: None, lambda e: None)
+
+    result = run_evaluation_job(payload, lambda p, m: None, lambda e: None)
+
+    assert result["run_id"] == "job-run"
+    assert evaluated == ["Cost", "Team"]  # Cost came from the checkpoint, only Team was re-evaluated
+    assert mock_parse_rfp.call_count == 1  # criteria are read from the checkpoint too
+
+
+@patch("src.server.proposal_eval.call_openai_with_tracking", return_value="SWOT")
+@patch("src.server.proposal_eval.build_tool_embeddings", return_value={})
+@patch("src.server.proposal_eval.preprocess_proposal_for_criteria_with_threshold", return_value={})
+@patch("src.server.proposal_eval.evaluate_single_criterion")
+def test_checkpoints_are_only_read_when_resuming(mock_single, mock_preprocess, mock_build, mock_swot, tmp_path):
+    from src.server.proposal_eval import evaluate_proposal
+
+    mock_single.return_value = {"criterion": "Cost", "proposal_score": 4, "proposal_explanation": "new", "reasoning_trace": {}}
+    store = CheckpointStore(tmp_path / "checkpoint.sqlite")
+    store.save_criterion_result("Vendor A", "Cost", {"criterion": "Cost", "proposal_score": 9, "proposal_explanation": "old", "reasoning_trace": {}})
+    store.save_vendor_summary("Vendor A", 9.0, "old SWOT")
+
+    results, _, swot = evaluate_proposal("text", [{"name": "Cost"}], checkpoint=store.for_vendor("Vendor A"))
+    assert (results[0]["proposal_score"], swot) == (4, "SWOT")
+    assert (mock_single.call_count, mock_swot.call_count) == (1, 1)
+
+    results, _, swot = evaluate_proposal("text", [{"name": "Cost"}], checkpoint=store.for_vendor("Vendor A"), resume=True)
+    assert (results[0]["proposal_score"], swot) == (4, "SWOT")  # saved by the fresh run above
+    assert (mock_single.call_count, mock_swot.call_count) == (1, 1)  # both read from the checkpoint
+    store.close()
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.models import embedding_backends
+from src.models.embedding_backends import (
+    LocalEmbeddingBackend,
+    OpenAIEmbeddingBackend,
+    get_embeddings_batch,
+    set_embedding_backend,
+)
+
+
+@patch("src.models.embedding_backends.get_sentence_transformer")
+def test_local_backend_encodes_in_one_batch(mock_get_model):
+    fake_model = MagicMock()
+    fake_model.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 4))
+    mock_get_model.return_value = fake_model
+
+    backend = LocalEmbeddingBackend(batch_size=16)
+    vectors = backend.embed_batch(["a", "b", "c"])
+
+    assert len(vectors) == 3
+    assert vectors[0].dtype == np.float32
+    fake_model.encode.assert_called_once()
+    assert fake_model.encode.call_args.kwargs["batch_size"] == 16
+    assert fake_model.encode.call_args.kwargs["normalize_embeddings"] is True
+    assert backend.embed_batch([]) == []
+    assert backend.cache_id == "local-all-MiniLM-L6-v2"
+
+
+def test_set_embedding_backend_selects_configured_backend():
+    previous = embedding_backends._active_backend
+    try:
+        backend = set_embedding_backend("openai", model="text-embedding-3-small")
+        assert isinstance(backend, OpenAIEmbeddingBackend)
+        assert backend.cache_id == "openai-text-embedding-3-small"
+
+        with patch.object(OpenAIEmbeddingBackend, "embed_batch", return_value=[[0.1], [0.2]]) as mock_batch:
+            assert get_embeddings_batch(["x", "y"]) == [[0.1], [0.2]]
+            mock_batch.assert_called_once()
+
+        with pytest.raises(ValueError):
+            set_embedding_backend("unknown")
+    finally:
+        embedding_backends._active_backend = previous
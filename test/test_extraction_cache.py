@@ -0,0 +1,69 @@
+import fitz
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.utils import extraction_cache, file_loader
+
+
+@pytest.fixture
+def temp_extraction_cache(tmp_path):
+    extraction_cache.configure_extraction_cache(enabled=True, path=tmp_path / "extracted.sqlite")
+    extraction_cache.reset_extraction_cache_stats()
+    yield extraction_cache
+    extraction_cache.extraction_cache.close()
+
+
+def write_pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_same_pdf_is_extracted_once(temp_extraction_cache, tmp_path):
+    write_pdf(tmp_path / "rfp.pdf", "Evaluation Criteria")
+    # A renamed copy has the same bytes, so it hits the cache too
+    (tmp_path / "rfp_copy.pdf").write_bytes((tmp_path / "rfp.pdf").read_bytes())
+
+    with patch("src.utils.file_loader._extract_pdf_pages", wraps=file_loader._extract_pdf_pages) as extract:
+        first = file_loader.load_report_text_from_file(str(tmp_path / "rfp.pdf"))
+        second = file_loader.load_report_text_from_file(str(tmp_path / "rfp_copy.pdf"))
+
+    assert "Evaluation Criteria" in first
+    assert second == first
+    assert extract.call_count == 1
+    stats = extraction_cache.get_extraction_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_uploaded_file_and_folder_loader_use_cache(temp_extraction_cache, tmp_path):
+    write_pdf(tmp_path / "Vendor A.pdf", "Our team is certified.")
+    upload = SimpleNamespace(filename="Vendor A.pdf", file=open(tmp_path / "Vendor A.pdf", "rb"))
+    with upload.file:
+        uploaded = file_loader.load_report_text_from_file(file=upload)
+
+    with patch("src.utils.file_loader._extract_pdf_pages", wraps=file_loader._extract_pdf_pages) as extract:
+        proposals = file_loader.load_proposals_from_folder(tmp_path)
+
+    assert "certified" in uploaded
+    assert proposals["Vendor A"] == uploaded
+    assert extract.call_count == 0  # same loader and bytes as the upload → cache hit
+
+
+def test_extractor_version_is_part_of_key(temp_extraction_cache):
+    key = extraction_cache.make_extraction_key(b"%PDF", "pymupdf")
+    with patch("src.utils.extraction_cache.extractor_version", return_value="99.0"):
+        assert extraction_cache.make_extraction_key(b"%PDF", "pymupdf") != key
+    assert extraction_cache.make_extraction_key(b"%PDF", "docx") != key
+
+
+def test_disabled_cache_always_extracts(temp_extraction_cache):
+    extraction_cache.configure_extraction_cache(enabled=False)
+    try:
+        calls = []
+        for _ in range(2):
+            extraction_cache.extract_text_cached(b"data", "docx", lambda data: calls.append(data) or "text")
+        assert len(calls) == 2
+    finally:
+        extraction_cache.configure_extraction_cache(enabled=True)
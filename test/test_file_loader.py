@@ -4,9 +4,12 @@ from src.utils.file_loader import (
     load_proposals_from_folder,
     load_rfp_criteria,
     parse_rfp_from_file,
-    preprocess_proposal_for_criteria_with_threshold
+    preprocess_proposal_for_criteria_with_threshold,
+    chunk_proposal_paragraphs
 )
 from pathlib import Path
+from unittest.mock import patch
+import numpy as np
 
 # --------- Mocks + Fixtures ---------
 @pytest.fixture
@@ -88,3 +91,61 @@ def test_preprocess_fallback_to_top_match_if_none_above_threshold():
     assert result["Quantum Computing"] != ""
     assert isinstance(result["Quantum Computing"], str)
 
+
+
+# --------- Chunking + batched matching (no model download) ---------
+class KeywordModel:
+    # Stands in for SentenceTransformer: one dimension per keyword, L2-normalized
+    keywords = ["cost", "team", "security"]
+
+    def __init__(self):
+        self.encode_calls = []
+
+    def encode(self, texts, **kwargs):
+        self.encode_calls.append(list(texts))
+        vectors = np.array([[float(k in t.lower()) for k in self.keywords] + [0.1] for t in texts])
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_chunk_proposal_paragraphs_merges_pdf_line_fragments():
+    pdf_text = (
+        "Our delivery team has worked on\n"
+        "twelve provincial health programs\n"
+        "over the last decade.\n"
+        "\n"
+        "Pricing is fixed per\n"
+        "milestone.\n"
+    )
+    chunks = chunk_proposal_paragraphs(pdf_text, max_tokens=100, min_tokens=5)
+    assert chunks == [
+        "Our delivery team has worked on twelve provincial health programs over the last decade.",
+        "Pricing is fixed per milestone.",
+    ]
+
+
+def test_chunk_proposal_paragraphs_respects_max_tokens():
+    long_line = " ".join(["word"] * 100)
+    chunks = chunk_proposal_paragraphs(long_line, max_tokens=30, min_tokens=5, count_tokens=lambda t: len(t.split()))
+    assert all(len(c.split()) <= 30 for c in chunks)
+    assert " ".join(chunks) == long_line
+
+
+def test_preprocess_batches_criteria_and_falls_back_to_top_match():
+    model = KeywordModel()
+    proposal = (
+        "The team includes two certified architects.\n\n"
+        "Total cost is fixed at $1.2M.\n\n"
+        "Security reviews run every quarter."
+    )
+    criteria = [{"name": "Team"}, {"name": "Cost"}, "Security", "Innovation"]
+
+    with patch("src.utils.file_loader.get_sentence_transformer", return_value=model), \
+         patch("src.utils.file_loader.PARAGRAPH_CHUNK_MIN_TOKENS", 1):
+        result = preprocess_proposal_for_criteria_with_threshold(proposal, criteria, score_threshold=0.5)
+
+    assert len(model.encode_calls) == 2  # paragraphs once, all criterion queries once
+    assert model.encode_calls[1] == ["Team", "Cost", "Security", "Innovation"]
+    assert result["Team"] == "The team includes two certified architects."
+    assert result["Cost"] == "Total cost is fixed at $1.2M."
+    assert result["Security"] == "Security reviews run every quarter."
+    assert result["Innovation"] != ""  # nothing above threshold → best paragraph
@@ -0,0 +1,101 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.server.react_agent import run_missing_relevant_tools
+from src.utils.tools.fused_checks import is_fusible_check
+from src.utils.tools.tools_RFP_risk import check_compliance_certifications, check_risk_register_or_mitigation_plan
+from src.utils.tools.tools_RFP_plan import check_contingency_plans
+
+
+def plain_tool(agent, input_arg):
+    return "plain result"
+
+
+TOOL_MAP = {
+    "check_compliance_certifications": {"fn": check_compliance_certifications, "args": ["agent", "input_arg"]},
+    "check_risk_register_or_mitigation_plan": {"fn": check_risk_register_or_mitigation_plan, "args": ["agent", "input_arg"]},
+    "check_contingency_plans": {"fn": check_contingency_plans, "args": ["agent", "input_arg"]},
+    "plain_tool": {"fn": plain_tool, "args": ["agent", "input_arg"]},
+}
+
+
+@pytest.fixture
+def agent():
+    with patch("src.server.prompt_builders.TOOL_CONTEXT_TOP_K", 0):
+        yield SimpleNamespace(section_name="Risk", section_text="Risk section.", full_proposal_text="Full proposal.")
+
+
+@patch("src.utils.tools.fused_checks.call_openai_with_tracking", return_value="  Certified.  ")
+def test_decorated_check_still_runs_alone(mock_call, agent):
+    assert is_fusible_check(check_compliance_certifications)
+    assert not is_fusible_check(plain_tool)
+    assert check_compliance_certifications.__name__ == "check_compliance_certifications"
+
+    assert check_compliance_certifications(agent, "ISO 27001") == "Certified."
+    prompt = mock_call.call_args.args[0][0]["content"]
+    assert "compliance certifications" in prompt and "ISO 27001" in prompt and "Full proposal." in prompt
+
+
+@patch("src.utils.tools.fused_checks.call_openai_with_tracking", return_value="contingency answer")
+@patch("src.utils.tools.fused_checks.call_openai_with_tools")
+def test_missing_tools_share_one_fused_call(mock_tools_call, mock_single_call, agent):
+    # The fused reply misses one check, which then runs on its own
+    mock_tools_call.return_value = {"content": None, "error": None, "tool_calls": [{
+        "name": "report_check_results",
+        "arguments": json.dumps({
+            "check_compliance_certifications": "Holds ISO 27001.",
+            "check_risk_register_or_mitigation_plan": "Has a risk register.",
+        }),
+    }]}
+    relevant = [(name, 0.9) for name in TOOL_MAP]
+    executed = set()
+
+    auto_triggered, meta = run_missing_relevant_tools(
+        agent, "Risk", "Risk section.", relevant, None, [], TOOL_MAP, executed_tools_global=executed
+    )
+
+    assert mock_tools_call.call_count == 1
+    fused_prompt = mock_tools_call.call_args.args[0][0]["content"]
+    assert fused_prompt.count("Full proposal.") == 1  # context sent once for all checks
+    assert "### Check 3: check_contingency_plans" in fused_prompt
+    assert [(t["tool"], t["result"]) for t in auto_triggered] == [
+        ("check_compliance_certifications", "Holds ISO 27001."),
+        ("check_risk_register_or_mitigation_plan", "Has a risk register."),
+        ("check_contingency_plans", "contingency answer"),
+        ("plain_tool", "plain result"),
+    ]
+    assert mock_single_call.call_count == 1
+    assert executed == set(TOOL_MAP)
+    assert [m["tool"] for m in meta] == list(TOOL_MAP)
+
+
+@patch("src.utils.tools.fused_checks.call_openai_with_tracking", return_value="single answer")
+@patch("src.utils.tools.fused_checks.call_openai_with_tools",
+       return_value={"content": None, "tool_calls": [], "error": "⚠️ Tool execution error: timeout"})
+def test_failed_fused_call_falls_back_to_individual_checks(mock_tools_call, mock_single_call, agent):
+    relevant = [("check_compliance_certifications", 0.9), ("check_contingency_plans", 0.8)]
+    auto_triggered, _ = run_missing_relevant_tools(agent, "Risk", "Risk section.", relevant, None, [], TOOL_MAP)
+
+    assert [t["result"] for t in auto_triggered] == ["single answer", "single answer"]
+    assert mock_single_call.call_count == 2
+
+
+@patch("src.utils.tools.fused_checks.call_openai_with_tools")
+def test_fused_prompt_budget_scales_with_checks(mock_tools_call, agent):
+    from src.utils.prompt_packer import TOOL_PROMPT_TOKEN_BUDGET, count_tokens
+    from src.utils.tools.fused_checks import run_fused_checks
+
+    # Larger than one tool budget, smaller than three: a single-tool budget would cut the late evidence
+    agent.full_proposal_text = "Filler about the vendor. " * int(TOOL_PROMPT_TOKEN_BUDGET / 4) + "LATE EVIDENCE: ISO 27001 certificate."
+    assert TOOL_PROMPT_TOKEN_BUDGET < count_tokens(agent.full_proposal_text) < 2 * TOOL_PROMPT_TOKEN_BUDGET
+    mock_tools_call.return_value = {"content": None, "error": None, "tool_calls": [
+        {"name": "report_check_results", "arguments": "{}"}
+    ]}
+    checks = [(name, TOOL_MAP[name]["fn"], "") for name in list(TOOL_MAP)[:3]]
+
+    run_fused_checks(agent, checks)
+
+    assert "LATE EVIDENCE" in mock_tools_call.call_args.args[0][0]["content"]
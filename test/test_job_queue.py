@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from src.server.job_queue import JobQueue
+
+
+def evaluate_handler(payload, report_progress, emit_event):
+    report_progress(0.5, "Halfway")
+    emit_event({"type": "criterion_scored", "criterion": "Cost", "score": 8})
+    return {"vendors": sorted(payload["proposals"])}
+
+
+def failing_handler(payload, report_progress, emit_event):
+    raise RuntimeError("OpenAI unavailable")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(tmp_path / "jobs.sqlite", handlers={"evaluate": evaluate_handler, "fail": failing_handler}, max_workers=2, poll_interval=0.05)
+    yield q
+    q.stop(timeout=5)
+
+
+def test_submit_returns_immediately_and_worker_records_result(queue):
+    job_id = queue.submit("evaluate", {"proposals": {"Vendor B": "...", "Vendor A": "..."}})
+    assert queue.get(job_id)["status"] == "queued"
+    assert queue.get_result(job_id) is None
+
+    assert queue.run_next() == job_id
+    job = queue.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["attempts"] == 1
+    assert queue.get_result(job_id) == {"vendors": ["Vendor A", "Vendor B"]}
+    assert queue.run_next() is None
+
+
+def test_failed_job_records_error(queue):
+    job_id = queue.submit("fail", {})
+    queue.run_next()
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert "OpenAI unavailable" in job["error"]
+    assert queue.get("missing") is None
+    with pytest.raises(ValueError):
+        queue.submit("unknown", {})
+
+
+def test_jobs_survive_restart_and_interrupted_jobs_are_requeued(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    first = JobQueue(path, handlers={"evaluate": evaluate_handler})
+    queued_id = first.submit("evaluate", {"proposals": {"A": "..."}})
+    interrupted_id = first.submit("evaluate", {"proposals": {"B": "..."}})
+    first._claim_next()  # server dies while running the first job
+    first.stop()
+
+    restarted = JobQueue(path, handlers={"evaluate": evaluate_handler}, poll_interval=0.05)
+    restarted.start()
+    deadline = time.time() + 5
+    while time.time() < deadline and restarted.counts()["succeeded"] < 2:
+        time.sleep(0.05)
+    restarted.stop(timeout=5)
+
+    reopened = JobQueue(path, handlers={"evaluate": evaluate_handler})
+    assert reopened.get(queued_id)["status"] == "succeeded"
+    assert reopened.get(queued_id)["attempts"] == 2
+    assert reopened.get_result(interrupted_id) == {"vendors": ["B"]}
+    reopened.stop()
+
+
+def test_events_are_logged_in_order_and_resumable(queue):
+    job_id = queue.submit("evaluate", {"proposals": {"A": "..."}})
+    queue.run_next()
+
+    events = queue.get_events(job_id)
+    assert [e["type"] for _, e in events] == ["job_status", "job_status", "criterion_scored", "job_status"]
+    assert [e.get("status") for _, e in events if e["type"] == "job_status"] == ["queued", "running", "succeeded"]
+    assert events[2][1]["score"] == 8
+
+    # Resuming after the second event returns only the rest
+    assert [seq for seq, _ in queue.get_events(job_id, after_seq=events[1][0])] == [seq for seq, _ in events[2:]]
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from src.utils import lazy_resources
+from src.utils.lazy_resources import LazyResource, parse_warmup_list, register_resource, warm_up
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_lazy_resource_loads_once_across_threads():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    resource = LazyResource("test_model", loader)
+    assert not resource.loaded
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(resource.get())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert resource.loaded and resource.load_seconds is not None
+
+    resource.reset()
+    assert not resource.loaded
+    resource.get()
+    assert len(calls) == 2
+
+
+def test_warm_up_skips_failing_resources():
+    def broken():
+        raise OSError("model not downloaded")
+
+    register_resource("test_ok", lambda: "ok")
+    register_resource("test_broken", broken)
+
+    timings = warm_up(["test_ok", "test_broken", "test_unknown"])
+
+    assert timings["test_ok"] is not None
+    assert timings["test_broken"] is None
+    assert "test_unknown" not in timings
+    assert "| test_ok | ✅ |" in lazy_resources.get_resource_report()
+
+
+def test_parse_warmup_list():
+    assert parse_warmup_list("") == []
+    assert parse_warmup_list("ALL") is None
+    assert parse_warmup_list(" spacy_nlp, openai_client ,") == ["spacy_nlp", "openai_client"]
+
+
+def test_openai_interface_imports_without_api_key(monkeypatch):
+    # Importing must not create the client (or need the key); the first call does
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    code = (
+        "from src.models import openai_interface as oi\n"
+        "from src.utils.lazy_resources import _resources\n"
+        "assert not _resources['openai_client'].loaded\n"
+        "try:\n"
+        "    oi.get_openai_client()\n"
+        "except oi.OpenAIError:\n"
+        "    print('missing key')\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert "missing key" in result.stdout
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    from src.models import openai_interface
+    assert openai_interface.client is openai_interface.get_openai_client()
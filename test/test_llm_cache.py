@@ -0,0 +1,82 @@
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.models import llm_cache, openai_interface
+from src.utils.sqlite_cache import SQLiteLRUCache
+
+
+@pytest.fixture
+def temp_llm_cache(tmp_path):
+    llm_cache.configure_llm_cache(enabled=True, path=tmp_path / "llm.sqlite")
+    llm_cache.reset_llm_cache_stats()
+    yield llm_cache
+    llm_cache.llm_response_cache.close()
+
+
+def make_response(content):
+    usage = SimpleNamespace(prompt_tokens=12, completion_tokens=3, total_tokens=15)
+    return SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "c.sqlite", max_entries=2)
+    cache.set("a", b"1")
+    time.sleep(0.01)
+    cache.set("b", b"2")
+    time.sleep(0.01)
+    assert cache.get("a") == b"1"  # touch "a" so "b" becomes the LRU entry
+    time.sleep(0.01)
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_expires_entries(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "c.sqlite", ttl_seconds=0.01)
+    cache.set("a", b"1")
+    time.sleep(0.05)
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_cache_key_depends_on_all_inputs():
+    messages = [{"role": "user", "content": "Score this"}]
+    key = llm_cache.make_llm_cache_key("gpt-3.5-turbo", messages, 0, 500)
+    assert key == llm_cache.make_llm_cache_key("gpt-3.5-turbo", [dict(m) for m in messages], 0, 500)
+    assert key != llm_cache.make_llm_cache_key("gpt-4", messages, 0, 500)
+    assert key != llm_cache.make_llm_cache_key("gpt-3.5-turbo", messages, 0, 10)
+    assert key == llm_cache.make_llm_cache_key("gpt-3.5-turbo", messages, 0, 500, stop=None)
+    assert key != llm_cache.make_llm_cache_key("gpt-3.5-turbo", messages, 0, 500, stop=["\n"])
+    assert key != llm_cache.make_llm_cache_key("gpt-3.5-turbo", messages, 0, 500, stream_until="tot_agent.score_complete")
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_deterministic_calls_are_served_from_cache(mock_log_call, mock_log_time, temp_llm_cache):
+    messages = [{"role": "user", "content": "Respond with a single number."}]
+    with patch.object(openai_interface.client.chat.completions, "create", return_value=make_response(" 8 ")) as mock_create:
+        first = openai_interface.call_openai_with_tracking(messages, temperature=0)
+        second = openai_interface.call_openai_with_tracking(messages, temperature=0)
+
+    assert first == second == "8"
+    assert mock_create.call_count == 1
+    stats = temp_llm_cache.get_llm_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["prompt_tokens_saved"] == 12
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_sampled_calls_bypass_cache(mock_log_call, mock_log_time, temp_llm_cache):
+    messages = [{"role": "user", "content": "Brainstorm thoughts."}]
+    with patch.object(openai_interface.client.chat.completions, "create", return_value=make_response("idea")) as mock_create:
+        openai_interface.call_openai_with_tracking(messages, temperature=0.7)
+        openai_interface.call_openai_with_tracking(messages, temperature=0.7)
+
+    assert mock_create.call_count == 2
+    assert temp_llm_cache.get_llm_cache_stats()["entries"] == 0
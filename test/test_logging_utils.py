@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import MagicMock
 from src.utils import logging_utils
 
 
@@ -56,3 +57,74 @@ def test_log_tool_execution_details(caplog):
 
     assert "Executing tool: dummy_tool" in caplog.text
     assert "Input: some input string" in caplog.text
+
+
+def test_snapshot_and_merge_stats_combine_worker_trackers():
+    logging_utils.reset_stats()
+    logging_utils.log_tool_used("check_cost")
+    logging_utils.log_deduplication(["a", "b"], ["a"])
+    worker_snapshot = logging_utils.snapshot_stats()
+
+    logging_utils.reset_stats()
+    logging_utils.log_tool_used("check_cost")
+    logging_utils.merge_stats(worker_snapshot)
+    logging_utils.merge_stats(worker_snapshot)
+
+    assert logging_utils.tool_stats["check_cost"] == 3
+    assert logging_utils.thought_dedup_stats["total_generated"] == 4
+    assert logging_utils.thought_dedup_stats["filtered_examples"] == ["b", "b"]
+    logging_utils.reset_stats()
+    assert not logging_utils.tool_stats and logging_utils.openai_call_counter == 0
+
+
+def test_run_contexts_isolate_concurrent_runs():
+    import threading
+
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def run(run_id, tool, calls):
+        with logging_utils.run_context(run_id) as ctx:
+            barrier.wait()  # both runs are active at the same time
+            for _ in range(calls):
+                logging_utils.log_tool_used(tool)
+            seen[run_id] = ctx.snapshot()["tool_stats"]
+
+    threads = [threading.Thread(target=run, args=("a", "tool_a", 5)), threading.Thread(target=run, args=("b", "tool_b", 3))]
+    default_before = dict(logging_utils.tool_stats)
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == {"a": {"tool_a": 5}, "b": {"tool_b": 3}}
+    assert dict(logging_utils.tool_stats) == default_before  # default context untouched
+
+
+def test_copied_context_reports_into_same_run_from_worker_threads():
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    with logging_utils.run_context("parallel") as ctx:
+        contexts = [contextvars.copy_context() for _ in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda c: c.run(logging_utils.log_tool_used, "shared_tool"), contexts))
+
+    assert ctx.tool_stats["shared_tool"] == 8
+
+
+def test_emit_event_reaches_run_sink_with_scope_fields_and_tokens():
+    events = []
+    logging_utils.emit_event("phase_start", phase="ignored")  # no sink outside a listening run: no-op
+
+    with logging_utils.run_context("outer", event_sink=events.append):
+        with logging_utils.run_context("inner") as inner:  # nested runs inherit the sink
+            logging_utils.log_openai_call("p", MagicMock(), source="test", prompt_tokens=10, completion_tokens=5, embedding=False)
+            with logging_utils.event_scope(vendor="Vendor A"), logging_utils.event_scope(criterion="Cost"):
+                logging_utils.emit_event("criterion_scored", score=7)
+
+    assert inner.event_sink == events.append
+    assert len(events) == 1
+    event = events[0]
+    assert (event["type"], event["run_id"], event["vendor"], event["criterion"], event["score"]) == ("criterion_scored", "inner", "Vendor A", "Cost", 7)
+    assert event["tokens_used"] == 15
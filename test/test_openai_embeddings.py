@@ -0,0 +1,49 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.models import openai_embeddings
+from src.models.openai_embeddings import EmbeddingCoalescer, get_openai_embeddings_batch
+
+
+def fake_embeddings_response(texts):
+    # Return items out of order to check that results are re-sorted by index
+    data = [SimpleNamespace(index=i, embedding=[float(len(t)), float(i)]) for i, t in enumerate(texts)]
+    return SimpleNamespace(data=list(reversed(data)))
+
+
+@patch("src.models.openai_embeddings.log_openai_call")
+def test_batch_embeddings_preserve_order_and_respect_input_limit(mock_log):
+    texts = [f"text {'x' * i}" for i in range(5)]
+    with patch.dict(openai_embeddings.EMBEDDING_MODEL_LIMITS, {"tiny-model": {"max_inputs": 2, "max_tokens": 1000}}), \
+         patch.object(openai_embeddings.client.embeddings, "create",
+                      side_effect=lambda model, input: fake_embeddings_response(input)) as mock_create:
+        embeddings = get_openai_embeddings_batch(texts, model="tiny-model", source="test")
+
+    assert [e[0] for e in embeddings] == [float(len(t)) for t in texts]
+    assert mock_create.call_count == 3  # 2 + 2 + 1 inputs
+    assert mock_log.call_count == 3
+
+
+@patch("src.models.openai_embeddings.log_openai_call")
+def test_coalescer_merges_concurrent_requests_into_one_call(mock_log):
+    coalescer = EmbeddingCoalescer("text-embedding-ada-002", window_ms=200)
+    texts = ["alpha", "beta", "gamma", "delta"]
+    results = {}
+    start = threading.Barrier(len(texts))
+
+    def worker(text):
+        start.wait()
+        results[text] = coalescer.embed(text, source="test")
+
+    with patch.object(openai_embeddings.client.embeddings, "create",
+                      side_effect=lambda model, input: fake_embeddings_response(input)) as mock_create:
+        threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert mock_create.call_count == 1
+    assert sorted(mock_create.call_args.kwargs["input"]) == sorted(texts)
+    assert all(results[t][0] == float(len(t)) for t in texts)
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.models import openai_interface
+from src.models.openai_interface import (
+    OpenAIConcurrencyLimiter,
+    call_openai_with_tracking_async,
+    run_openai_calls_concurrently,
+)
+
+
+def make_response(content, prompt_tokens=10, completion_tokens=5):
+    usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                            total_tokens=prompt_tokens + completion_tokens)
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=message)])
+
+
+def fake_async_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_async_call_tracks_usage_like_sync(mock_log_call, mock_log_time):
+    async def fake_create(**kwargs):
+        return make_response("  Score: 7  ")
+
+    with patch("src.models.openai_interface.get_async_openai_client", return_value=fake_async_client(fake_create)):
+        result = asyncio.run(call_openai_with_tracking_async(
+            [{"role": "user", "content": "hi"}], temperature=0.2, source="test_source"
+        ))
+
+    assert result == "Score: 7"
+    kwargs = mock_log_call.call_args.kwargs
+    assert kwargs["source"] == "test_source"
+    assert kwargs["prompt_tokens"] == 10
+    assert kwargs["completion_tokens"] == 5
+    assert kwargs["embedding"] is False
+    mock_log_time.assert_called_once()
+
+
+def test_limiter_bounds_global_and_per_model_concurrency():
+    limiter = OpenAIConcurrencyLimiter(max_concurrency=3, per_model_limits={"gpt-4": 1})
+    in_flight = {"gpt-4": 0, "gpt-3.5-turbo": 0, "total": 0}
+    peak = {"gpt-4": 0, "gpt-3.5-turbo": 0, "total": 0}
+
+    async def worker(model):
+        async with limiter.slot(model):
+            for key in (model, "total"):
+                in_flight[key] += 1
+                peak[key] = max(peak[key], in_flight[key])
+            await asyncio.sleep(0.01)
+            for key in (model, "total"):
+                in_flight[key] -= 1
+
+    async def main():
+        await asyncio.gather(*(worker(m) for m in ["gpt-4"] * 4 + ["gpt-3.5-turbo"] * 6))
+
+    asyncio.run(main())
+    asyncio.run(main())  # limiter must be reusable across event loops
+
+    assert peak["gpt-4"] == 1
+    assert peak["total"] <= 3
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_run_openai_calls_concurrently_preserves_order(mock_log_call, mock_log_time):
+    async def fake_create(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        await asyncio.sleep(0.02 if content == "first" else 0)
+        return make_response(content.upper())
+
+    calls = [{"messages": [{"role": "user", "content": c}], "source": "test"} for c in ["first", "second", "third"]]
+    with patch("src.models.openai_interface.get_async_openai_client", return_value=fake_async_client(fake_create)):
+        results = run_openai_calls_concurrently(calls)
+
+    assert results == ["FIRST", "SECOND", "THIRD"]
+    assert mock_log_call.call_count == 3
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_each_batch_gets_its_own_async_client(mock_log_call, mock_log_time):
+    created = []
+
+    class FakeAsyncOpenAI:
+        def __init__(self, api_key):
+            self.loop = None
+            self.closed = False
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+            created.append(self)
+
+        async def create(self, **kwargs):
+            # A pooled connection bound to another (closed) loop would fail here
+            self.loop = self.loop or asyncio.get_running_loop()
+            assert self.loop is asyncio.get_running_loop()
+            return make_response("ok")
+
+        async def close(self):
+            self.closed = True
+
+    calls = [{"messages": [{"role": "user", "content": c}], "source": "test"} for c in ["a", "b"]]
+    with patch("src.models.openai_interface.AsyncOpenAI", FakeAsyncOpenAI):
+        assert run_openai_calls_concurrently(calls) == ["ok", "ok"]
+        assert run_openai_calls_concurrently(calls) == ["ok", "ok"]
+
+    assert len(created) == 2  # one client per batch (event loop), shared by that batch's calls
+    assert all(client.closed for client in created)
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_threaded_sync_calls_respect_concurrency_limits(mock_log_call, mock_log_time):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from src.models.openai_interface import call_openai_with_tools, call_openai_with_tracking
+
+    lock = threading.Lock()
+    in_flight = {"gpt-4": 0, "gpt-3.5-turbo": 0, "total": 0}
+    peak = dict(in_flight)
+
+    def fake_create(**kwargs):
+        with lock:
+            for key in (kwargs["model"], "total"):
+                in_flight[key] += 1
+                peak[key] = max(peak[key], in_flight[key])
+        time.sleep(0.02)
+        with lock:
+            for key in (kwargs["model"], "total"):
+                in_flight[key] -= 1
+        response = make_response("ok")
+        response.choices[0].message.tool_calls = None
+        return response
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create)))
+    models = ["gpt-4"] * 4 + ["gpt-3.5-turbo"] * 8
+    with patch("src.models.openai_interface.get_openai_client", return_value=client), \
+         patch("src.models.openai_interface.openai_limiter", OpenAIConcurrencyLimiter(3, {"gpt-4": 1})):
+        with ThreadPoolExecutor(max_workers=12) as executor:
+            results = list(executor.map(
+                lambda i: call_openai_with_tracking([{"role": "user", "content": str(i)}], model=models[i], source="test")
+                if i % 2 else call_openai_with_tools([{"role": "user", "content": str(i)}], [], model=models[i], source="test"),
+                range(len(models))
+            ))
+
+    assert [r if isinstance(r, str) else r["content"] for r in results] == ["ok"] * len(models)
+    assert peak["gpt-4"] == 1
+    assert peak["total"] == 3
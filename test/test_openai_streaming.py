@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.models import llm_cache, openai_interface
+from src.models.tot_agent import parse_leading_score, score_complete
+from src.server.react_agent import react_step_complete
+
+
+def fake_async_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for c in self.chunks:
+            self.consumed += 1
+            yield c
+
+    def close(self):
+        self.closed = True
+
+
+REACT_CHUNKS = ["Thought: Check the ", "team.\nAction: check_team", '["senior PM"]', "\nObservation: made up", " text"]
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_stream_until_closes_request_once_action_is_complete(mock_log_call, mock_log_time):
+    stream = FakeStream([chunk(t) for t in REACT_CHUNKS])
+    with patch.object(openai_interface.client.chat.completions, "create", return_value=stream) as create:
+        reply = openai_interface.call_openai_with_tracking(
+            [{"role": "user", "content": "x" * 40}], temperature=0.3,
+            stop=["\nObservation:"], stream_until=react_step_complete
+        )
+
+    assert reply == 'Thought: Check the team.\nAction: check_team["senior PM"]'
+    assert stream.consumed == 3 and stream.closed
+    kwargs = create.call_args.kwargs
+    assert kwargs["stream"] is True and kwargs["stop"] == ["\nObservation:"]
+    # Usage is estimated when the usage chunk never arrives
+    assert mock_log_call.call_args.kwargs["completion_tokens"] == 3
+    assert mock_log_call.call_args.kwargs["prompt_tokens"] == 10
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_stream_read_to_the_end_uses_reported_usage(mock_log_call, mock_log_time):
+    usage = SimpleNamespace(prompt_tokens=30, completion_tokens=1, total_tokens=31)
+    stream = FakeStream([chunk("7"), chunk(usage=usage)])
+    with patch.object(openai_interface.client.chat.completions, "create", return_value=stream):
+        reply = openai_interface.call_openai_with_tracking(
+            [{"role": "user", "content": "score"}], temperature=0.3, stream_until=score_complete
+        )
+
+    assert reply == "7"
+    assert not stream.closed
+    assert mock_log_call.call_args.kwargs["prompt_tokens"] == 30
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_streamed_deterministic_calls_are_cached_by_predicate(mock_log_call, mock_log_time, tmp_path):
+    llm_cache.configure_llm_cache(enabled=True, path=tmp_path / "llm.sqlite")
+    messages = [{"role": "user", "content": "Respond with a single number."}]
+    try:
+        with patch.object(openai_interface.client.chat.completions, "create",
+                          side_effect=lambda **kw: FakeStream([chunk("8"), chunk(" - clear")])) as create:
+            first = openai_interface.call_openai_with_tracking(messages, temperature=0, stream_until=score_complete)
+            second = openai_interface.call_openai_with_tracking(messages, temperature=0, stream_until=score_complete)
+            openai_interface.call_openai_with_tracking(messages, temperature=0, stream_until=lambda text: True)
+            openai_interface.call_openai_with_tracking(messages, temperature=0, stream_until=lambda text: True)
+    finally:
+        llm_cache.llm_response_cache.close()
+
+    assert first == second == "8 - clear"
+    assert create.call_count == 3  # lambdas have no stable cache name, so both of those calls hit the API
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_async_call_supports_stream_until(mock_log_call, mock_log_time):
+    class FakeAsyncStream:
+        def __init__(self):
+            self.closed = False
+
+        async def __aiter__(self):
+            for text in ["9", "\n", "Because..."]:
+                yield chunk(text)
+
+        async def close(self):
+            self.closed = True
+
+    stream = FakeAsyncStream()
+
+    async def fake_create(**kwargs):
+        return stream
+
+    with patch("src.models.openai_interface.get_async_openai_client", return_value=fake_async_client(fake_create)):
+        reply = asyncio.run(openai_interface.call_openai_with_tracking_async(
+            [{"role": "user", "content": "score"}], temperature=0.3, stream_until=score_complete
+        ))
+
+    assert reply == "9"
+    assert stream.closed
+
+
+def test_predicates_and_score_parsing():
+    assert not react_step_complete("Thought: Check the team.\nAction: check_team")
+    assert react_step_complete('Thought: Check the team.\nAction: check_team["PM"]')
+    assert not react_step_complete('Thought: Check the refs.\nAction: check_refs["see [1]')
+    assert react_step_complete('Thought: Check the refs.\nAction: check_refs["see [1]"]')
+    assert react_step_complete("Thought: Done.\nAction: summarize\n")
+    assert not react_step_complete("Action: summarize\n")
+
+    assert not score_complete("1")
+    assert score_complete("10\n")
+    assert parse_leading_score(" 8/10") == 8
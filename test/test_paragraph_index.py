@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.server.prompt_builders import build_dual_context_prompt
+from src.utils import paragraph_index
+from src.utils.file_loader import get_proposal_paragraph_index, preprocess_proposal_for_criteria_with_threshold
+
+
+class KeywordModel:
+    # Stands in for SentenceTransformer: one dimension per keyword, L2-normalized
+    keywords = ["cost", "team", "security", "schedule"]
+
+    def __init__(self):
+        self.encode_calls = []
+
+    def encode(self, texts, **kwargs):
+        self.encode_calls.append(list(texts))
+        vectors = np.array([[float(k in t.lower()) for k in self.keywords] + [0.1] for t in texts])
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+PROPOSAL = "\n\n".join([
+    "Our team has delivered twelve similar programs.",
+    "The total cost is fixed at $1.2M.",
+    "Security testing runs every sprint.",
+    "The schedule has four milestones.",
+    "Company history and awards.",
+    "Cost breakdown by phase is in Appendix B.",
+])
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    paragraph_index.clear_proposal_indexes()
+    yield
+    paragraph_index.clear_proposal_indexes()
+
+
+def test_preprocess_registers_index_reused_by_tools():
+    model = KeywordModel()
+    with patch("src.utils.file_loader.get_sentence_transformer", return_value=model), \
+         patch("src.utils.file_loader.PARAGRAPH_CHUNK_MIN_TOKENS", 1):
+        preprocess_proposal_for_criteria_with_threshold(PROPOSAL, ["Team"], score_threshold=0.5)
+        index = get_proposal_paragraph_index(PROPOSAL)
+
+    assert len(model.encode_calls) == 2  # paragraphs + criteria; the lookup did not re-encode
+    assert len(index) == 6
+    assert [index.paragraphs[i] for i, _ in index.search("What does it cost?", k=2)] == [
+        "The total cost is fixed at $1.2M.", "Cost breakdown by phase is in Appendix B."
+    ]
+
+
+def test_tool_prompt_gets_relevant_excerpts_instead_of_full_proposal():
+    model = KeywordModel()
+    agent = SimpleNamespace(section_text="Security testing runs every sprint.", full_proposal_text=PROPOSAL)
+    with patch("src.utils.file_loader.get_sentence_transformer", return_value=model), \
+         patch("src.utils.file_loader.PARAGRAPH_CHUNK_MIN_TOKENS", 1), \
+         patch("src.server.prompt_builders.TOOL_CONTEXT_TOP_K", 2):
+        prompt = build_dual_context_prompt("Check the cost realism.\nQuery: security budget", agent)
+
+    assert "--- Full Proposal (Context) ---" not in prompt
+    excerpts = prompt.split("--- Relevant Proposal Excerpts (Context) ---\n")[1]
+    # Cost paragraphs in document order; the security paragraph is already in the section
+    assert excerpts.startswith("The total cost is fixed at $1.2M.\n\nCost breakdown by phase is in Appendix B.")
+    assert "Company history" not in prompt
+
+
+def test_short_proposals_and_failures_fall_back_to_full_proposal():
+    agent = SimpleNamespace(section_text="", full_proposal_text=PROPOSAL)
+    with patch("src.utils.file_loader.get_sentence_transformer", return_value=KeywordModel()), \
+         patch("src.utils.file_loader.PARAGRAPH_CHUNK_MIN_TOKENS", 1), \
+         patch("src.server.prompt_builders.TOOL_CONTEXT_TOP_K", 10):
+        assert PROPOSAL in build_dual_context_prompt("Check the team.", agent)
+
+    paragraph_index.clear_proposal_indexes()
+    with patch("src.utils.file_loader.get_sentence_transformer", side_effect=OSError("model not available")):
+        assert "--- Full Proposal (Context) ---\n" + PROPOSAL in build_dual_context_prompt("Check the team.", agent)
+
+
+def test_registry_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(paragraph_index, "PARAGRAPH_INDEX_MAX_PROPOSALS", 2)
+    for text in ("a", "b"):
+        paragraph_index.register_proposal_index(text, text)
+    paragraph_index.lookup_proposal_index("a")
+    paragraph_index.register_proposal_index("c", "c")
+
+    assert paragraph_index.lookup_proposal_index("b") is None
+    assert paragraph_index.lookup_proposal_index("a") == "a"
@@ -0,0 +1,55 @@
+import fitz
+
+from src.utils import extraction_cache, file_loader
+from src.utils.pdf_pages import iter_pdf_pages
+
+
+def make_pdf(page_count):
+    doc = fitz.open()
+    for number in range(1, page_count + 1):
+        doc.new_page().insert_text((72, 72), f"Content of page {number}")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_parallel_extraction_keeps_page_order_and_numbers():
+    data = make_pdf(7)
+    serial = list(iter_pdf_pages(data, max_workers=1))
+    parallel = list(iter_pdf_pages(data, max_workers=2, pages_per_task=2, min_parallel_pages=1))
+
+    assert [number for number, _ in parallel] == list(range(1, 8))
+    assert parallel == serial
+    assert "Content of page 5" in dict(parallel)[5]
+
+
+def test_pages_stream_as_a_generator():
+    pages = iter_pdf_pages(make_pdf(3), max_workers=1)
+    assert next(pages)[0] == 1
+    pages.close()
+
+
+def test_load_document_pages_for_pdf_and_text(tmp_path):
+    extraction_cache.configure_extraction_cache(enabled=True, path=tmp_path / "extracted.sqlite")
+    try:
+        (tmp_path / "proposal.pdf").write_bytes(make_pdf(3))
+        (tmp_path / "notes.txt").write_text("Plain text")
+
+        pages = file_loader.load_document_pages(tmp_path / "proposal.pdf")
+        cached_pages = file_loader.load_document_pages(tmp_path / "proposal.pdf")
+
+        assert [number for number, _ in pages] == [1, 2, 3]
+        assert cached_pages == pages  # tuples again after the JSON round trip
+        assert file_loader.load_document_pages(tmp_path / "notes.txt") == [(1, "Plain text")]
+        assert file_loader.load_report_text_from_file(tmp_path / "proposal.pdf") == "\n".join(text for _, text in pages)
+    finally:
+        extraction_cache.extraction_cache.close()
+
+
+def test_importing_the_loader_does_not_load_pymupdf():
+    import subprocess
+    import sys
+
+    check = "import sys, src.utils.file_loader; print('fitz' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "False"
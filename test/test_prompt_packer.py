@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import prompt_packer
+from src.utils.prompt_packer import KEEP, SUMMARIZE, TAIL, count_tokens, pack_prompt, segment
+
+
+@pytest.fixture(autouse=True)
+def char_estimate_tokenizer():
+    # Deterministic counts (~4 chars/token) without downloading a tiktoken encoding
+    caches = [prompt_packer.count_tokens, prompt_packer.truncate_to_tokens, prompt_packer.compress_to_tokens]
+    for fn in caches:
+        fn.cache_clear()
+    with patch.object(prompt_packer._encoding, "get", return_value=None):
+        yield
+    for fn in caches:
+        fn.cache_clear()
+
+
+def test_under_budget_prompt_is_unchanged():
+    segments = [
+        segment("intro", "Evaluate this.\n\n", shrink=KEEP),
+        segment("section", "Short section.", prefix="--- Section ---\n", suffix="\n\n"),
+    ]
+    assert pack_prompt(segments, budget=1000) == "Evaluate this.\n\n--- Section ---\nShort section.\n\n"
+
+
+def test_lowest_priority_segments_shrink_first():
+    proposal = "\n\n".join(f"Paragraph {i} lead sentence. " + "Supporting detail. " * 30 for i in range(20))
+    history = "".join(f"Thought: step {i}\nAction: tool\nObservation: " + "ok " * 40 + "\n\n" for i in range(10))
+    segments = [
+        segment("intro", "Evaluate the proposal.\n\n", shrink=KEEP),
+        segment("section", "The section text that matters most.", priority=5, suffix="\n\n"),
+        segment("full_proposal", proposal, priority=0, shrink=SUMMARIZE, suffix="\n\n"),
+        segment("history", history, priority=4, shrink=TAIL),
+    ]
+    budget = 700
+    prompt = pack_prompt(segments, budget=budget)
+
+    assert count_tokens(prompt) <= budget + 5
+    assert "The section text that matters most." in prompt
+    # Compression keeps every paragraph's lead sentence before touching the history
+    assert "Paragraph 0 lead sentence." in prompt and "Paragraph 19 lead sentence." in prompt
+    assert "Supporting detail." not in prompt
+    assert history in prompt
+
+
+def test_tail_truncation_keeps_most_recent_history():
+    history = "".join(f"Thought: step {i}\n" + "x" * 200 + "\n" for i in range(30))
+    prompt = pack_prompt([segment("question", "Next?\n", shrink=KEEP), segment("history", history, shrink=TAIL)], budget=300)
+    assert "step 29" in prompt and "step 0\n" not in prompt
+    assert "[...truncated...]" in prompt
+
+
+def test_dual_context_prompt_is_bounded_as_proposal_grows():
+    from src.server.prompt_builders import build_dual_context_prompt
+
+    sizes = []
+    for paragraphs in (50, 500):
+        proposal = "\n\n".join("Vendor claim. " + "More text here. " * 40 for _ in range(paragraphs))
+        agent = SimpleNamespace(section_text="We use agile delivery.", full_proposal_text=proposal)
+        with patch("src.server.prompt_builders.TOOL_CONTEXT_TOP_K", 0):  # full-proposal path
+            prompt = build_dual_context_prompt("Check the delivery approach.", agent)
+        assert prompt.startswith("Check the delivery approach.\n\n--- Section (Vendor Response) ---\nWe use agile delivery.")
+        assert prompt.endswith("Explain your reasoning based on best practices.\n")
+        sizes.append(count_tokens(prompt))
+
+    assert max(sizes) <= prompt_packer.TOOL_PROMPT_TOKEN_BUDGET
+
+
+def test_static_segments_render_once():
+    calls = []
+    render = lambda: calls.append(1) or "catalog text"
+    assert prompt_packer.cached_static_segment("test_catalog", render) == "catalog text"
+    assert prompt_packer.cached_static_segment("test_catalog", render) == "catalog text"
+    assert len(calls) == 1
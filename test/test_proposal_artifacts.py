@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import proposal_artifacts
+from src.utils.tools import tools_nlp
+
+
+class FakeNLP:
+    # Minimal stand-in for the spaCy pipeline: sentences split on ". ", capitalised words as ORG entities
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        sents = [SimpleNamespace(text=s) for s in text.split(". ")]
+        ents = [SimpleNamespace(text=w.strip("."), label_="ORG") for w in text.split() if w[0].isupper()]
+        return SimpleNamespace(sents=sents, ents=ents)
+
+
+@pytest.fixture
+def fake_nlp():
+    proposal_artifacts.clear_proposal_artifacts()
+    nlp = FakeNLP()
+    with patch("src.utils.proposal_artifacts.get_nlp", return_value=nlp):
+        yield nlp
+    proposal_artifacts.clear_proposal_artifacts()
+
+
+def test_artifacts_are_memoized_by_text_hash(fake_nlp):
+    text = "Acme delivers in Q3. Acme partners with Globex."
+    artifacts = proposal_artifacts.get_proposal_artifacts(text)
+
+    assert proposal_artifacts.get_proposal_artifacts(str(text)) is artifacts
+    assert artifacts.sentences == ["Acme delivers in Q3", "Acme partners with Globex."]
+    assert artifacts.entities == {"ORG": ["Acme", "Q3", "Globex"]}
+    assert fake_nlp.calls == 1  # one pipeline pass shared by sentences and entities
+    assert proposal_artifacts.get_proposal_artifacts("Another proposal.") is not artifacts
+
+
+def test_nlp_tools_share_one_analysis_per_proposal(fake_nlp):
+    agent = SimpleNamespace(full_proposal_text="Acme will migrate the ERP. The plan is clear and well staffed.")
+
+    with patch("textstat.textstat.textstat.flesch_reading_ease", return_value=55.0) as mock_flesch, \
+            patch("textstat.textstat.textstat.text_standard", return_value="10th and 11th grade"), \
+            patch("textstat.textstat.textstat.difficult_words", return_value=4):
+        for _ in range(3):  # e.g. three criteria calling the same tools
+            entities = tools_nlp.extract_named_entities(agent)
+            readability = tools_nlp.check_readability(agent)
+
+    assert "**ORG**: Acme, ERP, The" in entities
+    assert "55.0" in readability
+    assert fake_nlp.calls == 1
+    assert mock_flesch.call_count == 1
+    assert "**Tone**" in tools_nlp.analyze_tone_textblob(agent)
+
+
+def test_section_upgrades_do_not_evict_cached_proposals(fake_nlp):
+    from src.models import section_tools_llm
+
+    proposal = proposal_artifacts.get_proposal_artifacts("Acme delivers in Q3. Acme partners with Globex.")
+    with patch("src.models.section_tools_llm.should_cite", return_value=(False, "")):
+        for i in range(proposal_artifacts.PROPOSAL_ARTIFACTS_CACHE_SIZE + 1):
+            section_tools_llm.upgrade_section_with_research(f"Section {i} text. More detail")
+
+    assert proposal_artifacts.get_proposal_artifacts("Acme delivers in Q3. Acme partners with Globex.") is proposal
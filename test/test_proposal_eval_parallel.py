@@ -0,0 +1,33 @@
+import threading
+import time
+from unittest.mock import patch
+
+from src.server import proposal_eval
+
+
+def fake_single_criterion(criterion, section_text, proposal_text, model, seen_thoughts, seen_embeddings,
+                          executed_tools_global, tool_embeddings=None):
+    time.sleep(0.05 if criterion == "Cost" else 0.01)  # first criterion finishes last
+    return {
+        "criterion": criterion,
+        "proposal_score": 6,
+        "proposal_explanation": "ok",
+        "thread": threading.get_ident(),
+        "tool_embeddings": tool_embeddings,
+    }
+
+
+@patch("src.server.proposal_eval.call_openai_with_tracking", return_value="SWOT")
+@patch("src.server.proposal_eval.build_tool_embeddings", return_value={"tool_a": [0.1, 0.2]})
+@patch("src.server.proposal_eval.preprocess_proposal_for_criteria_with_threshold", return_value={})
+@patch("src.server.proposal_eval.evaluate_single_criterion", side_effect=fake_single_criterion)
+def test_parallel_evaluation_keeps_criterion_order(mock_single, mock_preprocess, mock_build, mock_openai):
+    criteria = [{"name": name} for name in ["Cost", "Team", "Risk", "Fit"]]
+
+    results, overall_score, swot = proposal_eval.evaluate_proposal("text", criteria, max_workers=4)
+
+    assert [r["criterion"] for r in results] == ["Cost", "Team", "Risk", "Fit"]
+    assert len({r["thread"] for r in results}) > 1
+    assert overall_score == 6.0
+    mock_build.assert_called_once()  # tool embeddings built once and shared
+    assert all(r["tool_embeddings"] is mock_build.return_value for r in results)
@@ -0,0 +1,116 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models import openai_interface
+from src.server.react_agent import parse_structured_react_reply, run_react_loop_for_rfp_eval
+from src.utils.tools.tool_schemas import build_react_tool_schemas, format_action, parse_react_tool_call
+
+
+def fake_tool(agent, input_arg):
+    return f"checked: {input_arg}"
+
+
+TOOL_MAP = {"check_team_experience_alignment": {"fn": fake_tool, "args": ["agent", "input_arg"]}}
+CATALOG = {"check_team_experience_alignment": {"description": "Evaluates team experience.", "examples": []}}
+
+
+def tool_reply(name, **arguments):
+    return {"content": None, "tool_calls": [{"name": name, "arguments": json.dumps(arguments)}], "error": None}
+
+
+def test_schemas_cover_tools_and_summarize():
+    schemas = build_react_tool_schemas(CATALOG, TOOL_MAP)
+    by_name = {s["function"]["name"]: s["function"] for s in schemas}
+
+    assert set(by_name) == {"check_team_experience_alignment", "summarize"}
+    assert by_name["check_team_experience_alignment"]["description"] == "Evaluates team experience."
+    assert by_name["check_team_experience_alignment"]["parameters"]["required"] == ["thought", "input"]
+    assert by_name["summarize"]["parameters"]["required"] == ["thought"]
+
+
+def test_parse_react_tool_call_validates_arguments():
+    step = parse_react_tool_call(
+        {"name": "check_team_experience_alignment", "arguments": '{"thought": "Is the PM senior?", "input": "PM has 20 years"}'},
+        TOOL_MAP
+    )
+    assert step == {"thought": "Is the PM senior?", "tool": "check_team_experience_alignment", "args": {"input": "PM has 20 years"}}
+    assert format_action(step) == 'check_team_experience_alignment["PM has 20 years"]'
+
+    with pytest.raises(ValueError):
+        parse_react_tool_call({"name": "made_up_tool", "arguments": '{"thought": "x"}'}, TOOL_MAP)
+    with pytest.raises(ValueError):
+        parse_react_tool_call({"name": "check_team_experience_alignment", "arguments": '{"thought": "x"}'}, TOOL_MAP)
+    with pytest.raises(ValueError):
+        parse_react_tool_call({"name": "summarize", "arguments": "not json"}, TOOL_MAP)
+
+
+def test_text_reply_is_accepted_in_structured_mode():
+    reply = {"content": 'Thought: Check the team.\nAction: check_team_experience_alignment["senior PM"]', "tool_calls": [], "error": None}
+    step = parse_structured_react_reply(reply, TOOL_MAP)
+    assert (step["tool"], step["args"]["input"]) == ("check_team_experience_alignment", "senior PM")
+
+
+@patch("src.server.react_agent.filter_and_record_thoughts", side_effect=lambda thoughts, seen, embs: (thoughts, [[1.0]] * len(thoughts)))
+@patch("src.server.react_agent.call_openai_with_tracking")
+@patch("src.server.react_agent.call_openai_with_tools")
+def test_structured_loop_dispatches_validated_calls(mock_tools_call, mock_text_call, mock_filter):
+    mock_tools_call.side_effect = [
+        tool_reply("check_team_experience_alignment", thought="Is the team experienced?", input="PM has 20 years"),
+        tool_reply("summarize", thought="Enough evidence."),
+    ]
+    agent = MagicMock(model="gpt-4", temperature=0.3, history=[], section_text="Team section")
+    agent.build_react_prompt_forRFPeval.return_value = [{"role": "user", "content": "prompt"}]
+
+    with patch("src.server.react_agent.TOOL_FUNCTION_MAP", TOOL_MAP), \
+         patch("src.utils.tools.tool_schemas.TOOL_FUNCTION_MAP", TOOL_MAP):
+        history = run_react_loop_for_rfp_eval(
+            agent, "Team", "Team section", "Full text", max_steps=4, structured=True
+        )
+
+    mock_text_call.assert_not_called()
+    assert agent.build_react_prompt_forRFPeval.call_args.kwargs["structured"] is True
+    assert [s["action"] for s in history] == ['check_team_experience_alignment["PM has 20 years"]', "summarize"]
+    assert history[0]["observation"] == "checked: PM has 20 years"
+
+
+@patch("src.server.react_agent.filter_and_record_thoughts", side_effect=lambda thoughts, seen, embs: (thoughts, [[1.0]] * len(thoughts)))
+@patch("src.server.react_agent.call_openai_with_tools")
+def test_structured_loop_reasks_invalid_steps_instead_of_stopping(mock_tools_call, mock_filter):
+    mock_tools_call.side_effect = [
+        tool_reply("made_up_tool", thought="?"),  # invalid, then fixed on the re-ask
+        tool_reply("check_team_experience_alignment", thought="Is the team experienced?", input="PM"),
+        tool_reply("check_team_experience_alignment", thought="Missing input"),  # invalid twice: step skipped
+        tool_reply("check_team_experience_alignment", thought="Still missing"),
+        tool_reply("summarize", thought="Enough evidence."),
+    ]
+    agent = MagicMock(model="gpt-4", temperature=0.3, history=[], section_text="Team section")
+    agent.build_react_prompt_forRFPeval.return_value = [{"role": "user", "content": "prompt"}]
+
+    with patch("src.server.react_agent.TOOL_FUNCTION_MAP", TOOL_MAP), \
+         patch("src.utils.tools.tool_schemas.TOOL_FUNCTION_MAP", TOOL_MAP):
+        history = run_react_loop_for_rfp_eval(
+            agent, "Team", "Team section", "Full text", max_steps=3, structured=True
+        )
+
+    assert [s["action"] for s in history] == ['check_team_experience_alignment["PM"]', "summarize"]
+    reask = mock_tools_call.call_args_list[1].args[0]
+    assert len(reask) == 2 and "made_up_tool" in reask[-1]["content"]
+
+
+@patch("src.models.openai_interface.log_openai_call_time")
+@patch("src.models.openai_interface.log_openai_call")
+def test_call_openai_with_tools_returns_tool_calls_and_tracks_usage(mock_log_call, mock_log_time):
+    call = SimpleNamespace(function=SimpleNamespace(name="summarize", arguments='{"thought": "done"}'))
+    response = SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=40, completion_tokens=8, total_tokens=48),
+        choices=[SimpleNamespace(message=SimpleNamespace(content=None, tool_calls=[call]))]
+    )
+    with patch.object(openai_interface.client.chat.completions, "create", return_value=response) as create:
+        reply = openai_interface.call_openai_with_tools([{"role": "user", "content": "hi"}], tools=[], source="test")
+
+    assert reply == {"content": None, "tool_calls": [{"name": "summarize", "arguments": '{"thought": "done"}'}], "error": None}
+    assert create.call_args.kwargs["tool_choice"] == "required"
+    assert mock_log_call.call_args.kwargs["prompt_tokens"] == 40
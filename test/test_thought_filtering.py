@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from src.models import embedding_store
+from src.utils.thought_filtering import (
+    ThoughtIndex,
+    filter_redundant_thoughts,
+    get_cached_embeddings,
+    get_embedding_cache_stats,
+    reset_embedding_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def temp_embedding_store(tmp_path):
+    embedding_store.configure_embedding_store(enabled=True, path=tmp_path / "embeddings.sqlite")
+    reset_embedding_cache()
+    yield embedding_store
+    embedding_store.embedding_store.close()
+
+
+def test_thought_index_grows_and_matches_pairwise_cosine():
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(10, 6))
+    index = ThoughtIndex(initial_capacity=2)
+    index.extend(vectors[:3])
+    for v in vectors[3:]:
+        index.append(v)
+
+    assert len(index) == 10
+    assert index.dimensions == 6
+
+    queries = rng.normal(size=(4, 6))
+    expected = cosine_similarity(queries, vectors).max(axis=1)
+    assert np.allclose(index.max_similarity_batch(queries), expected, atol=1e-5)
+    assert np.isclose(index.max_similarity(queries[0]), expected[0], atol=1e-5)
+    assert ThoughtIndex().max_similarity(queries[0]) == 0.0
+
+
+@patch("src.utils.thought_filtering.get_embeddings_batch")
+def test_filter_redundant_thoughts_uses_shared_index(mock_batch):
+    vectors = {
+        "cost is clear": [1.0, 0.0, 0.0],
+        "pricing is clear": [0.99, 0.05, 0.0],
+        "timeline is risky": [0.0, 1.0, 0.0],
+    }
+    mock_batch.side_effect = lambda texts: [vectors[t] for t in texts]
+
+    seen_thoughts, seen_index = [], ThoughtIndex()
+    novel, embs = filter_redundant_thoughts(["cost is clear"], seen_thoughts, seen_index)
+    assert novel == ["cost is clear"]
+    seen_thoughts.extend(novel)
+    seen_index.extend(embs)
+
+    novel, embs = filter_redundant_thoughts(["pricing is clear", "timeline is risky"], seen_thoughts, seen_index)
+    assert novel == ["timeline is risky"]
+    assert embs == [vectors["timeline is risky"]]
+
+    # Plain lists are still accepted
+    novel, _ = filter_redundant_thoughts(["pricing is clear"], seen_thoughts, [vectors["cost is clear"]])
+    assert novel == []
+
+
+def test_embeddings_persist_across_runs_as_float16():
+    fetch = lambda texts: [np.array([0.1, 0.2, 0.3 + i]) for i, _ in enumerate(texts)]
+    first = get_cached_embeddings(["rollback plan?", "sla?", "rollback plan?"], fetch, namespace="test-model")
+    assert get_embedding_cache_stats()["misses"] == 2
+
+    reset_embedding_cache()  # new run: memory layer cleared, persistent store kept
+    calls = []
+    second = get_cached_embeddings(["rollback plan?", "sla?"], lambda texts: calls.append(texts), namespace="test-model")
+
+    assert calls == []
+    assert get_embedding_cache_stats()["store_hits"] == 2
+    assert second[0].dtype == np.float32
+    assert np.allclose(second[0], first[0], atol=1e-3)
+
+    # Another backend/model namespace never sees these vectors
+    get_cached_embeddings(["sla?"], fetch, namespace="other-model")
+    assert get_embedding_cache_stats()["misses"] == 1
+    assert embedding_store.embedding_store.stats()["entries"] == 3
+
+
+@patch("src.utils.thought_filtering.get_embeddings_batch")
+def test_filter_and_record_thoughts_is_atomic_across_threads(mock_batch):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.thought_filtering import filter_and_record_thoughts
+
+    mock_batch.side_effect = lambda texts: [[1.0, 0.0] for _ in texts]  # every thought is a duplicate
+    seen_thoughts, seen_index = [], ThoughtIndex()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda i: filter_and_record_thoughts([f"same idea #{i}"], seen_thoughts, seen_index),
+            range(16)
+        ))
+
+    accepted = [novel for novel, _ in results if novel]
+    assert len(accepted) == 1  # exactly one thread wins; the rest see it as redundant
+    assert len(seen_thoughts) == len(seen_index) == 1
+
+
+@patch("src.utils.thought_filtering.get_embeddings_batch")
+def test_filter_and_record_thoughts_counts_one_lookup_per_thought(mock_batch):
+    from src.utils.thought_filtering import filter_and_record_thoughts
+
+    mock_batch.side_effect = lambda texts: [[float(i), 1.0] for i, _ in enumerate(texts)]
+    seen_thoughts, seen_index = [], ThoughtIndex()
+    filter_and_record_thoughts(["a", "b", "c"], seen_thoughts, seen_index)
+
+    assert mock_batch.call_count == 1
+    assert get_embedding_cache_stats() == {"hits": 0, "store_hits": 0, "misses": 3}
+
+
+def test_cache_counters_are_exact_under_threads():
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    class SlowCounters(dict):
+        def __getitem__(self, key):
+            value = super().__getitem__(key)
+            time.sleep(0.001)  # widen the read-modify-write window of `+=`
+            return value
+
+    fetch = lambda texts: [np.array([1.0, float(len(t))]) for t in texts]
+    get_cached_embeddings(["warm"], fetch, namespace="test-model")
+    with patch("src.utils.thought_filtering.embedding_cache_stats", SlowCounters(hits=0, store_hits=0, misses=0)):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: get_cached_embeddings(["warm"] * 5, fetch, namespace="test-model"), range(40)))
+
+        assert get_embedding_cache_stats() == {"hits": 40 * 5, "store_hits": 0, "misses": 0}
@@ -1,5 +1,4 @@
 import os
-import pickle
 import numpy as np
 import tempfile
 import pytest
@@ -26,16 +25,18 @@ dummy_embeddings = {
 }
 
 
-@patch("src.utils.tools.tool_embeddings.get_openai_embedding")
+@patch("src.utils.tools.tool_embeddings.get_embeddings_batch")
 def test_build_tool_embeddings_creates_and_caches(mock_get_embedding):
-    mock_get_embedding.return_value = np.array([0.1, 0.2, 0.3])
+    mock_get_embedding.side_effect = lambda texts, **kwargs: [np.array([0.1, 0.2, 0.3]) for _ in texts]
 
     with tempfile.TemporaryDirectory() as temp_dir:
         cache_path = os.path.join(temp_dir, "embeddings.pkl")
         embeddings = build_tool_embeddings(dummy_tool_catalog, cache_path=cache_path)
 
         assert "tool_a" in embeddings
-        assert os.path.exists(cache_path)
+        assert os.path.exists(os.path.join(temp_dir, "embeddings.npy"))
+        assert os.path.exists(os.path.join(temp_dir, "embeddings.json"))
+        mock_get_embedding.assert_called_once()  # whole catalog embedded in one batch
 
         # Confirm it loaded from cache on second call
         mock_get_embedding.reset_mock()
@@ -43,9 +44,48 @@ def test_build_tool_embeddings_creates_and_caches(mock_get_embedding):
         mock_get_embedding.assert_not_called()
 
 
-@patch("src.utils.tools.tool_embeddings.get_openai_embedding")
+@patch("src.utils.tools.tool_embeddings.get_embeddings_batch")
+def test_build_tool_embeddings_only_reembeds_changed_tools(mock_get_embedding):
+    from src.utils.tools import tool_embeddings as tool_embeddings_module
+
+    mock_get_embedding.side_effect = lambda texts, **kwargs: [np.full(3, float(len(t))) for t in texts]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, "tool_cache")
+        build_tool_embeddings(dummy_tool_catalog, cache_path=cache_path)
+        tool_embeddings_module._loaded_tool_embeddings.clear()  # simulate a fresh process
+
+        changed_catalog = {
+            "tool_a": dummy_tool_catalog["tool_a"],
+            "tool_b": {**dummy_tool_catalog["tool_b"], "description": "Analyzes total cost of ownership."},
+            "tool_c": {"description": "Flags missing risk registers.", "examples": []},
+        }
+        mock_get_embedding.reset_mock()
+        embeddings = build_tool_embeddings(changed_catalog, cache_path=cache_path)
+
+        embedded_texts = mock_get_embedding.call_args.args[0]
+        assert len(embedded_texts) == 2  # tool_b (changed) + tool_c (new); tool_a reused
+        assert list(embeddings) == ["tool_a", "tool_b", "tool_c"]
+        assert isinstance(embeddings["tool_a"], np.memmap)  # zero-copy view of the cached matrix
+
+        tool_embeddings_module._loaded_tool_embeddings.clear()
+        mock_get_embedding.reset_mock()
+        build_tool_embeddings(changed_catalog, cache_path=cache_path)
+        mock_get_embedding.assert_not_called()
+
+        # A different backend/model invalidates the cache
+        from src.models.embedding_backends import OpenAIEmbeddingBackend, LocalEmbeddingBackend
+        for backend in (OpenAIEmbeddingBackend("text-embedding-3-small"), LocalEmbeddingBackend()):
+            tool_embeddings_module._loaded_tool_embeddings.clear()
+            mock_get_embedding.reset_mock()
+            build_tool_embeddings(changed_catalog, cache_path=cache_path, backend=backend)
+            assert len(mock_get_embedding.call_args.args[0]) == 3
+            assert mock_get_embedding.call_args.kwargs["backend"] is backend
+
+
+@patch("src.utils.tools.tool_embeddings.get_embedding")
 def test_suggest_tools_by_embedding_returns_sorted_matches(mock_get_embedding):
-    # Mock embedding for query: similar to tool_b; x is the query passed to get_openai_embedding (or mock_get_embedding for this stub)
+    # Mock embedding for query: similar to tool_b; x is the query passed to get_embedding (or mock_get_embedding for this stub)
     mock_get_embedding.side_effect = lambda x: np.array([0.4, 0.5, 0.6]) if "price" in x else np.array([0.1, 0.2, 0.3])
 
     query = "Does the price include training?"
@@ -54,3 +94,71 @@ def test_suggest_tools_by_embedding_returns_sorted_matches(mock_get_embedding):
     assert len(result) == 2
     assert result[0][0] == "tool_b"  # Highest similarity
     assert isinstance(result[0][1], float)
+
+
+def test_tool_embedding_index_matches_pairwise_cosine():
+    from sklearn.metrics.pairwise import cosine_similarity
+    from src.utils.tools.tool_embeddings import ToolEmbeddingIndex
+
+    rng = np.random.default_rng(0)
+    embeddings = {f"tool_{i}": rng.normal(size=8) for i in range(6)}
+    catalog = {name: {"section": "Cost" if i % 2 else "Risk"} for i, name in enumerate(embeddings)}
+    index = ToolEmbeddingIndex(embeddings, catalog)
+    query = rng.normal(size=8)
+
+    expected = sorted(
+        ((name, cosine_similarity([query], [emb])[0][0]) for name, emb in embeddings.items()),
+        key=lambda x: x[1], reverse=True
+    )
+    result = index.query(query)
+    assert [name for name, _ in result] == [name for name, _ in expected]
+    assert np.allclose([s for _, s in result], [s for _, s in expected], atol=1e-5)
+
+    # Section filter + threshold + top_k
+    cost_only = index.query(query, filter_sections=["Cost"])
+    assert {name for name, _ in cost_only} == {n for n, meta in catalog.items() if meta["section"] == "Cost"}
+    assert all(score >= 0.1 for _, score in index.query(query, threshold=0.1))
+    assert len(index.query(query, top_k=2)) == 2
+
+    # Batch mode returns the same ranking as single queries
+    batch = index.query_batch([query, -query], top_k=3)
+    for ranked, q in zip(batch, [query, -query]):
+        single = index.query(q, top_k=3)
+        assert [name for name, _ in ranked] == [name for name, _ in single]
+        assert np.allclose([s for _, s in ranked], [s for _, s in single], atol=1e-6)
+
+
+def test_tool_embedding_index_is_rebuilt_when_the_dict_changes_in_place():
+    from src.utils.tools.tool_embeddings import get_tool_embedding_index
+
+    embeddings = {"tool_a": np.array([1.0, 0.0]), "tool_b": np.array([0.0, 1.0])}
+    catalog = {}
+    index = get_tool_embedding_index(embeddings, catalog)
+    assert get_tool_embedding_index(embeddings, catalog) is index
+    assert get_tool_embedding_index(dict(embeddings), catalog) is index  # same tools and vectors
+
+    embeddings["tool_c"] = np.array([1.0, 1.0])
+    assert get_tool_embedding_index(embeddings, catalog).tool_names == ["tool_a", "tool_b", "tool_c"]
+
+    embeddings["tool_a"] = np.array([0.0, -1.0])
+    assert get_tool_embedding_index(embeddings, catalog).query(np.array([0.0, -1.0]), top_k=1)[0][0] == "tool_a"
+
+
+def test_concurrent_index_lookups_get_their_own_tools():
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.tools import tool_embeddings as te
+
+    dicts = [{f"tool_{i}": np.array([1.0, float(i)])} for i in range(2)]
+    catalog = {}
+
+    class SlowCache(dict):
+        def update(self, *args, **kwargs):
+            super().update(*args, **kwargs)
+            time.sleep(0.01)  # widen the window between storing an index and returning it
+
+    with patch("src.utils.tools.tool_embeddings._index_cache", SlowCache(entries=None, catalog=None, index=None)):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            names = list(executor.map(lambda i: te.get_tool_embedding_index(dicts[i % 2], catalog).tool_names, range(32)))
+
+    assert names == [[f"tool_{i % 2}"] for i in range(32)]
@@ -1,3 +1,8 @@
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 from src.models.tot_agent import TreeNode, SimpleToTAgent
 
@@ -47,3 +52,77 @@ def test_simple_tot_agent_handles_empty_thoughts_gracefully():
 
     assert result["score"] == 0
     assert "No valid thoughts" in result["reasoning_path"][0]
+
+
+class FakeLLM:
+    # Thoughts depend on the parent; both depth-1 nodes propose "Shared follow-up"
+    children = {
+        "(start)": "1. Thought A\n2. Thought B\n3. Thought C",
+        "Thought A": "1. Shared follow-up\n2. A detail",
+        "Thought B": "1. Shared follow-up\n2. B detail",
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def __call__(self, prompt):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        path = prompt.split("Current reasoning path: ")[1].split("\n")[0].strip()
+        return self.children[path.split(" -> ")[-1]]
+
+
+SCORES = {"Thought A": 7, "Thought B": 9, "Thought C": 5, "Shared follow-up": 8, "A detail": 6, "B detail": 4}
+
+
+def fake_embeddings(texts, get_embeddings_batch_fn=None, namespace=None):
+    # One dimension per distinct thought: identical thoughts are duplicates, all others are novel
+    vocabulary = list(SCORES)
+    return [np.eye(len(vocabulary))[vocabulary.index(t)] for t in texts]
+
+
+def run_agent(max_workers):
+    llm = FakeLLM()
+    seen = []
+    with patch("src.utils.thought_filtering.get_cached_embeddings", side_effect=fake_embeddings), \
+         patch("src.models.tot_agent.score_thoughts_with_openai_batch", side_effect=lambda thoughts, c, s: [SCORES[t] for t in thoughts]):
+        agent = SimpleToTAgent(llm=llm, scorer=None, beam_width=2, max_depth=2, max_workers=max_workers)
+        result = agent.run("Section", "Delivery", seen_thoughts=seen)
+    return result, seen, llm
+
+
+def test_parallel_expansion_matches_serial_dedup_order():
+    serial_result, serial_seen, serial_llm = run_agent(max_workers=1)
+    parallel_result, parallel_seen, parallel_llm = run_agent(max_workers=4)
+
+    assert parallel_result == serial_result
+    assert parallel_seen == serial_seen
+    # Thought B scores highest, so it is first in the frontier and keeps the shared follow-up
+    assert parallel_result["reasoning_path"] == ["Thought B", "Shared follow-up"]
+    assert parallel_seen.count("Shared follow-up") == 1
+    assert serial_llm.max_active == 1
+    assert parallel_llm.max_active == 2  # both depth-2 nodes were expanded at once
+
+
+def test_each_thought_is_embedded_once_per_depth():
+    lookups = []
+
+    def recording_embeddings(texts, get_embeddings_batch_fn=None, namespace=None):
+        lookups.append(list(texts))
+        return fake_embeddings(texts)
+
+    with patch("src.utils.thought_filtering.get_cached_embeddings", side_effect=recording_embeddings), \
+         patch("src.models.tot_agent.score_thoughts_with_openai_batch", side_effect=lambda thoughts, c, s: [SCORES[t] for t in thoughts]):
+        SimpleToTAgent(llm=FakeLLM(), scorer=None, beam_width=2, max_depth=2).run("Section", "Delivery")
+
+    # One batched lookup per frontier; filtering reuses the vectors instead of looking them up again
+    assert lookups == [
+        ["Thought A", "Thought B", "Thought C"],
+        ["Shared follow-up", "B detail", "Shared follow-up", "A detail"],
+    ]
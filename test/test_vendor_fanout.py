@@ -0,0 +1,67 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.server import multi_agent_rfpevalrunner as runner
+from src.utils import logging_utils
+
+
+class InlineProcessPool(ThreadPoolExecutor):
+    # Stands in for ProcessPoolExecutor so patched functions are visible to the "workers"
+    def __init__(self, max_workers=None, mp_context=None):
+        super().__init__(max_workers=max_workers)
+
+
+class InlineManager:
+    # Stands in for a multiprocessing Manager (its queue relays worker events to the parent)
+    Queue = queue.Queue
+
+    def shutdown(self):
+        pass
+
+
+class InlineContext:
+    def Manager(self):
+        return InlineManager()
+
+
+def fake_evaluate_vendor(vendor_name, proposal_text, rfp_criteria, model, outputs_dir, resume=False):
+    time.sleep(0.05 if vendor_name == "Vendor A" else 0.0)  # first vendor finishes last
+    logging_utils.emit_event("criterion_scored", criterion="Cost", score=7.0)
+    return {"vendor_name": vendor_name, "results": [], "overall_score": 7.0, "swot_summary": ""}, {"md": f"{vendor_name}.md"}
+
+
+@patch("src.server.multi_agent_rfpevalrunner.finalize_evaluation_run")
+@patch("src.server.multi_agent_rfpevalrunner.save_markdown_and_pdf", return_value={})
+@patch("src.server.multi_agent_rfpevalrunner.generate_final_comparison_summary", return_value=("## Final", "| table |"))
+@patch("src.server.multi_agent_rfpevalrunner._evaluate_vendor", side_effect=fake_evaluate_vendor)
+@patch("src.server.multi_agent_rfpevalrunner.ProcessPoolExecutor", InlineProcessPool)
+@patch("src.server.multi_agent_rfpevalrunner.multiprocessing.get_context", return_value=InlineContext())
+@patch("src.server.multi_agent_rfpevalrunner.snapshot_stats", return_value={"tool_stats": {"check_cost": 1}, "openai_call_counter": 2})
+def test_vendor_fanout_keeps_order_and_merges_stats(mock_snapshot, mock_context, mock_eval, mock_summary, mock_save, mock_finalize, tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    # Capture the run's metrics at the point the analytics report is generated
+    reported = {}
+    mock_finalize.side_effect = lambda **kwargs: reported.update(logging_utils.snapshot_stats()) or "log.md"
+    proposals = {"Vendor B": "b", "Vendor A": "a", "Vendor C": "c"}
+
+    progress, events = [], []
+    output = runner.run_multi_proposal_evaluation(
+        proposals, rfp_criteria=[{"name": "Cost"}], max_workers=3,
+        progress_callback=lambda p, m: progress.append(p), event_sink=events.append
+    )
+
+    assert [e["vendor_name"] for e in output["evaluations"]] == ["Vendor A", "Vendor B", "Vendor C"]
+    assert list(output["file_paths"]["proposal_reports"]) == ["Vendor A", "Vendor B", "Vendor C"]
+    assert progress == [0.0, 0.25, 0.5, 0.75]  # one step per vendor; the report step completes the job
+    assert (events[0]["type"], events[0]["phase"]) == ("phase_start", "run")
+    assert (events[-1]["type"], events[-1]["phase"]) == ("phase_end", "run")
+    assert [e["completed"] for e in events if e["type"] == "progress"] == [0, 1, 2, 3]
+    # Worker events are relayed to the parent's sink, tagged with the worker's run (the vendor)
+    assert sorted(e["run_id"] for e in events if e["type"] == "criterion_scored") == ["Vendor A", "Vendor B", "Vendor C"]
+    # Each worker's stats snapshot is merged into the run's context before the report
+    assert reported["tool_stats"]["check_cost"] == 3
+    assert reported["openai_call_counter"] == 6
+    assert (tmp_path / "proposal_eval_reports" / output["run_id"] / "vendor_logs" / "Vendor_A.log").exists()
+    assert mock_finalize.call_args.kwargs["output_dir"] == tmp_path / "proposal_eval_reports" / output["run_id"]